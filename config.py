@@ -35,12 +35,80 @@ EAR_THRESHOLD = 0.25
 # Number of consecutive frames the EAR must be below threshold to trigger alert
 EAR_CONSECUTIVE_FRAMES = 20  # At ~30 FPS, this is about 0.67 seconds
 
+# Faces detected per frame. Above 1, faces get stable track IDs, the face in
+# DRIVER_SEAT_REGION is monitored for alerts and every other occupant gets
+# its own detector. In "process" and "server" modes the workers return every
+# face and the driver is picked in the monitoring process
+MAX_NUM_FACES = 1
+DRIVER_SEAT_REGION = (0.0, 0.0, 1.0, 1.0)  # Normalized (x0, y0, x1, y1), e.g. (0.5, 0.0, 1.0, 1.0) for the right half
+FACE_TRACK_MAX_DISTANCE = 0.75  # Largest frame-to-frame nose movement (in face widths) that keeps a track
+FACE_TRACK_MAX_MISSED = 10  # Frames a track survives without a matching face
+
+# ==================== EAR SIGNAL CONDITIONING ====================
+# Smoothing, hysteresis and dropout bridging between EAR calculation and the
+# drowsiness state machine. Helps at reduced frame rates or resolutions
+ENABLE_SIGNAL_CONDITIONING = False
+EAR_FILTER = "one_euro"  # "none", "ema" or "one_euro"
+EAR_EMA_ALPHA = 0.5  # Weight of the newest sample for "ema"
+EAR_ONE_EURO_MIN_CUTOFF = 1.5  # Hz
+EAR_ONE_EURO_BETA = 5.0  # Higher = less lag on fast eyelid movement
+EAR_ONE_EURO_D_CUTOFF = 1.0  # Hz
+EAR_HYSTERESIS = 0.02  # Eyes count as open again only above EAR_THRESHOLD + this
+EAR_GAP_TOLERANCE = 0.3  # Seconds of landmark dropout bridged with the last value
+
+# ==================== YAWN / HEAD NOD DETECTION ====================
+ENABLE_YAWN_DETECTION = False  # Off until the thresholds are tuned on real drives
+YAWN_MAR_THRESHOLD = 0.6  # Mouth aspect ratio above this counts as mouth open wide
+YAWN_CONSECUTIVE_FRAMES = 15  # Frames the mouth must stay open to count as a yawn
+YAWN_ALERT_COUNT = 3  # Yawns within the window that raise an alert
+YAWN_ALERT_WINDOW = 300.0  # Seconds
+
+ENABLE_NOD_DETECTION = False  # Off until the thresholds are tuned on real drives
+NOD_PITCH_THRESHOLD = 0.15  # Downward head pitch change from baseline (fraction of eye-to-chin height)
+NOD_CONSECUTIVE_FRAMES = 15  # Frames the head must stay dropped to alert
+NOD_MAX_FRAMES = 90  # A drop held longer than this becomes the new baseline posture
+NOD_BASELINE_ALPHA = 0.02  # How quickly the baseline follows normal posture changes
+
+# ==================== SHADOW POLICIES ====================
+# Candidate thresholds evaluated on the live EAR stream without driving alerts;
+# divergences from the active policy are logged one JSON line per episode
+ENABLE_SHADOW_POLICIES = False
+SHADOW_POLICIES = [
+    {'name': 'strict', 'ear_threshold': 0.22, 'consecutive_frames': 20},
+    {'name': 'fast', 'ear_threshold': 0.25, 'consecutive_frames': 12},
+]
+SHADOW_LOG_PATH = os.path.join(os.path.expanduser('~'), '.driver_drowsiness', 'shadow_divergences.jsonl')
+
 # ==================== CAMERA SETTINGS ====================
 CAMERA_INDEX = 0  # Default webcam
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 CAMERA_FPS = 30
 
+# ==================== VIDEO SOURCE SETTINGS ====================
+# None uses the webcam at CAMERA_INDEX. Otherwise a camera index, a video file
+# path, a directory of images, a stream URL (rtsp://, http://, udp://, ...),
+# or "synthetic://?seed=1" for the built-in synthetic driver face
+VIDEO_SOURCE = None
+VIDEO_PREFETCH_FRAMES = 4  # Decoded frames buffered ahead of processing
+VIDEO_REALTIME_PLAYBACK = True  # False = recorded media as fast as possible
+VIDEO_LOOP = False  # Restart recorded media when it ends
+IMAGE_SEQUENCE_FPS = 30.0  # Frame rate assumed for image directories
+
+# Decode video files once into memory-mapped raw frames and reuse them on
+# later runs (python -m src.capture.frame_cache list / clear)
+ENABLE_FRAME_CACHE = False
+FRAME_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.driver_drowsiness', 'frame_cache')
+FRAME_CACHE_MAX_GB = 8.0  # Least recently used clips are deleted beyond this size
+FRAME_CACHE_SCALE = 1.0  # Resolution factor applied while decoding (e.g. 0.5 for inference-only runs)
+
+# Live-source watchdog: reopen cameras/streams that stall or freeze
+ENABLE_CAPTURE_WATCHDOG = True
+CAPTURE_STALL_TIMEOUT = 2.0  # Seconds without frames before the source is reopened
+CAPTURE_FROZEN_TIMEOUT = 3.0  # Seconds of identical frames before the feed counts as frozen
+CAPTURE_RECOVERY_INITIAL_BACKOFF = 0.25  # First delay between reopen attempts (seconds)
+CAPTURE_RECOVERY_MAX_BACKOFF = 2.0  # Upper bound on the delay between reopen attempts
+
 # ==================== UI SETTINGS ====================
 WINDOW_TITLE = "Driver Drowsiness Detection System"
 UI_UPDATE_INTERVAL = 10  # milliseconds
@@ -49,6 +117,22 @@ FONT_SIZE_LARGE = 16
 FONT_SIZE_MEDIUM = 12
 FONT_SIZE_SMALL = 10
 
+# Video overlays: "none", "minimal" (text and warning) or "full" (plus face
+# box and eye landmarks). Drawn only for frames that are actually displayed
+OVERLAY_LEVEL = "full"
+
+# Scrolling EAR chart with threshold line, closure intervals and PERCLOS
+ENABLE_EAR_CHART = True
+EAR_CHART_SECONDS = 60.0  # Time span shown
+EAR_CHART_SIZE = (300, 110)  # (width, height) in pixels; one column per pixel
+EAR_CHART_RANGE = (0.0, 0.45)  # EAR shown from bottom to top
+
+# Multi-stream grid view (python src/main.py mosaic SOURCE [SOURCE ...]).
+# Tiles shrink as streams are added so the mosaic size stays fixed
+MOSAIC_SIZE = (1280, 720)  # (width, height) of the whole grid
+MOSAIC_COLUMNS = 0  # 0 = as close to square as possible
+MOSAIC_BORDER = 3  # Status border thickness (pixels)
+
 # Color scheme (BGR format for OpenCV)
 COLOR_GREEN = (0, 255, 0)
 COLOR_RED = (0, 0, 255)
@@ -64,6 +148,98 @@ ALERT_VOLUME = 1.0  # 0.0 to 1.0
 LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
 ENABLE_PERFORMANCE_LOGGING = False
 
+# ==================== MONITORING SETTINGS ====================
+# Embedded HTTP endpoint: /status (JSON), /metrics (Prometheus), /health
+ENABLE_STATUS_SERVER = False
+STATUS_SERVER_HOST = "127.0.0.1"  # Use "0.0.0.0" to allow scraping from other hosts
+STATUS_SERVER_PORT = 8765
+
+# Fleet reporting: events, alerts and PERCLOS status records are sent to a
+# fleet aggregator (python -m src.monitoring.fleet_aggregator)
+ENABLE_FLEET_REPORTING = False
+VEHICLE_ID = "vehicle-1"
+FLEET_AGGREGATOR_HOST = "127.0.0.1"
+FLEET_INGEST_PORT = 8766  # TCP port for newline-delimited JSON records
+FLEET_QUERY_PORT = 8767  # HTTP port for rollup queries
+FLEET_STATUS_INTERVAL = 10.0  # Seconds between PERCLOS status records
+FLEET_CLIENT_QUEUE_SIZE = 1000  # Unsent records kept before records are dropped
+FLEET_WINDOW = 3600.0  # Aggregator rollup window (seconds)
+FLEET_BUCKET_SECONDS = 60.0  # Aggregator bucket size; expired buckets are evicted whole
+FLEET_ACTIVE_SECONDS = 60.0  # A vehicle counts as active if seen this recently
+
+# Remote viewing: MJPEG stream of the annotated feed at http://host:port/
+# (/stream.mjpg, /snapshot.jpg). Frames are encoded once, only while watched
+ENABLE_VIDEO_STREAM = False
+STREAM_HOST = "127.0.0.1"  # Use "0.0.0.0" to allow viewers on other hosts
+STREAM_PORT = 8768
+STREAM_MAX_WIDTH = 640  # Wider frames are downscaled before encoding
+STREAM_JPEG_QUALITY = 70  # JPEG quality (0-100)
+STREAM_MAX_FPS = 15  # Encoded frames per second cap
+
+# ==================== TRIP ANALYTICS ====================
+# Sessions, drowsiness events, alerts and per-minute EAR/PERCLOS rollups are
+# stored in a local SQLite database written by a background thread
+ENABLE_TRIP_ANALYTICS = False
+ANALYTICS_DB_PATH = os.path.join(os.path.expanduser('~'), '.driver_drowsiness', 'trips.db')
+DRIVER_ID = "default"
+ANALYTICS_BATCH_SIZE = 200  # Statements per transaction
+ANALYTICS_FLUSH_INTERVAL = 1.0  # Seconds the writer waits for new rows
+ANALYTICS_QUEUE_SIZE = 10000  # Pending statements before rows are dropped
+
+# ==================== EVENT CLIPS ====================
+# Video evidence around each drowsiness event, buffered in memory as JPEGs
+ENABLE_EVENT_CLIPS = False
+CLIP_OUTPUT_DIR = os.path.join(os.path.expanduser('~'), '.driver_drowsiness', 'clips')
+CLIP_PRE_SECONDS = 10.0  # Seconds of video kept before an event
+CLIP_POST_SECONDS = 5.0  # Seconds of video recorded after an event
+CLIP_JPEG_QUALITY = 80  # JPEG quality (0-100) of buffered frames
+CLIP_MAX_BUFFER_MB = 48  # Cap on compressed frame memory
+CLIP_ENCODE_QUEUE_SIZE = 8  # Raw frames waiting for the encoder before frames are dropped
+
 # ==================== PERFORMANCE SETTINGS ====================
 ENABLE_THREADING = True  # Use threading for video processing
 FRAME_SKIP = 0  # Skip frames for better performance (0 = process all frames)
+
+# Where face mesh inference runs: "thread" (inside the GUI process),
+# "process" (separate worker process fed through shared memory, avoids the GIL)
+# or "server" (shared inference server: python -m src.pipeline.inference_server)
+INFERENCE_MODE = "thread"
+INFERENCE_RING_SLOTS = 4  # Shared-memory frame slots (frames in flight)
+INFERENCE_WORKERS = 1  # FaceMesh worker processes for a single stream ("process" mode)
+# Frames a missing result may hold back later ones before it is skipped.
+# Results for skipped frames arrive late and are dropped, never applied out of order
+INFERENCE_REORDER_WINDOW = 8
+
+# Shared inference server ("server" mode): one FaceMesh pool for all camera
+# processes on the machine, frames passed through shared memory
+INFERENCE_SERVER_SOCKET = os.path.join(os.path.expanduser('~'), '.driver_drowsiness', 'facemesh.sock')
+INFERENCE_SERVER_POOL_SIZE = 2  # FaceMesh instances held by the server
+INFERENCE_SERVER_CLIENT_QUEUE = 2  # Requests one client may have waiting
+INFERENCE_SERVER_MAX_WAIT_MS = 100.0  # Requests expected to wait longer are refused as overloaded
+INFERENCE_SERVER_STATIC_MODE = True  # Shared instances cannot track one stream's face between frames
+INFERENCE_SERVER_TIMEOUT = 0.5  # Seconds a client waits for a reply
+
+# Skip face mesh inference while the eye regions are unchanged ("thread" mode).
+# Eyelid movement always triggers inference, so blinks are never missed
+ENABLE_MOTION_GATE = False
+MOTION_GATE_THRESHOLD = 3.0  # Mean absolute gray-level change (0-255) that counts as motion
+MOTION_GATE_MAX_REUSE = 3  # Maximum consecutive frames a result may be reused
+MOTION_GATE_ROI_SIZE = (32, 16)  # (width, height) each eye region is downscaled to
+
+# Brighten the face region before inference when the image is too dark
+ENABLE_LOW_LIGHT_ENHANCEMENT = False
+LOW_LIGHT_METHOD = "gamma"  # "gamma" (cached lookup tables) or "clahe"
+LOW_LIGHT_THRESHOLD = 70  # Mean gray level (0-255) of the face region below which to enhance
+LOW_LIGHT_TARGET = 110  # Mean gray level the gamma tables map dark regions towards
+LOW_LIGHT_ROI_PADDING = 0.25  # Fraction of the face size added around the face box
+LOW_LIGHT_ROI_HOLD_FRAMES = 15  # Frames the last face box is kept after the face is lost
+
+# Risk-adaptive duty cycling: lower the inference rate while the driver is
+# clearly alert, back to full rate on the next frame when risk appears
+ENABLE_DUTY_CYCLE = False
+DUTY_CYCLE_LOW_FPS = 10  # Inference rate while risk is low (bounds the extra detection delay)
+DUTY_CYCLE_CALM_SECONDS = 5.0  # Seconds of low risk before dropping to the low rate
+DUTY_CYCLE_EAR_MARGIN = 0.05  # EAR this close to EAR_THRESHOLD counts as risky
+DUTY_CYCLE_TREND_WINDOW = 10  # Recent EAR samples used to project the trend
+DUTY_CYCLE_MAX_BLINK_RATE = 25  # Blinks per minute above which full rate is kept
+DUTY_CYCLE_INFERENCE_POWER_W = 2.5  # Extra power drawn while running inference (energy estimate)
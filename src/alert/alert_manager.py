@@ -24,21 +24,24 @@ class AlertManager:
     Uses pygame for cross-platform audio playback.
     """
     
-    def __init__(self, alarm_sound_path=None):
+    def __init__(self, alarm_sound_path=None, enable_audio=True):
         """
         Initialize the alert manager.
         
         Args:
             alarm_sound_path: Path to the alarm sound file
+            enable_audio: False to run without sound (console alerts only),
+                          e.g. in test harnesses
         """
         self.alarm_sound_path = alarm_sound_path or config.ALARM_SOUND_PATH
         self.is_playing = False
         self.last_alert_time = 0
         self.alert_count = 0
         self.pygame_initialized = False
+        self.sound_thread = None
         
         # Initialize pygame mixer if available
-        if PYGAME_AVAILABLE:
+        if PYGAME_AVAILABLE and enable_audio:
             self._initialize_pygame()
         else:
             print("[WARNING] Alert manager running without audio support")
@@ -79,9 +82,11 @@ class AlertManager:
         
         # Play sound in a separate thread to avoid blocking
         if self.pygame_initialized and os.path.exists(self.alarm_sound_path):
-            thread = threading.Thread(target=self._play_sound_thread)
-            thread.daemon = True
-            thread.start()
+            # At most one playback thread - the alarm is already sounding otherwise
+            if self.sound_thread is None or not self.sound_thread.is_alive():
+                self.sound_thread = threading.Thread(target=self._play_sound_thread)
+                self.sound_thread.daemon = True
+                self.sound_thread.start()
         else:
             # Fallback: just print alert
             self._console_alert()
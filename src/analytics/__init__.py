@@ -0,0 +1,8 @@
+"""
+__init__.py for analytics module
+Makes the analytics package importable
+"""
+
+from .trip_store import TripStore
+
+__all__ = ['TripStore']
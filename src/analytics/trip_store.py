@@ -0,0 +1,421 @@
+"""
+Trip Analytics Store Module
+Records sessions, drowsiness events, alerts and per-minute EAR/PERCLOS
+rollups to a local SQLite database through a background batched writer
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+import config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    driver_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    frames INTEGER DEFAULT 0,
+    events INTEGER DEFAULT 0,
+    alerts INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS drowsiness_events (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    reasons TEXT,
+    min_ear REAL
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    event_latency REAL
+);
+CREATE TABLE IF NOT EXISTS minute_rollups (
+    session_id INTEGER NOT NULL,
+    driver_id TEXT NOT NULL,
+    minute_start REAL NOT NULL,
+    frames INTEGER NOT NULL,
+    face_frames INTEGER NOT NULL,
+    mean_ear REAL,
+    min_ear REAL,
+    perclos REAL,
+    PRIMARY KEY (session_id, minute_start)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_driver_time ON sessions (driver_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_events_driver_time ON drowsiness_events (driver_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_alerts_driver_time ON alerts (driver_id, played_at);
+CREATE INDEX IF NOT EXISTS idx_rollups_driver_time ON minute_rollups (driver_id, minute_start);
+"""
+
+
+class _MinuteAccumulator:
+    """In-memory totals for the current minute (no allocation per frame)."""
+
+    __slots__ = ('minute_start', 'frames', 'face_frames', 'closed_frames', 'ear_sum', 'min_ear')
+
+    def __init__(self, minute_start):
+        self.minute_start = minute_start
+        self.frames = 0
+        self.face_frames = 0
+        self.closed_frames = 0
+        self.ear_sum = 0.0
+        self.min_ear = None
+
+
+class TripStore:
+    """
+    Local trip analytics backed by SQLite.
+
+    The frame loop only updates in-memory counters; rows are produced at
+    minute boundaries, event transitions and alerts, and handed to a
+    background writer thread through a bounded queue. The writer commits in
+    batches with WAL journaling, so the frame loop never waits on disk. If the
+    queue is ever full the row is dropped and counted rather than blocking.
+    """
+
+    def __init__(self, db_path=None, driver_id=None):
+        """
+        Initialize the store and start the writer thread.
+
+        Args:
+            db_path: SQLite database file (default config.ANALYTICS_DB_PATH)
+            driver_id: Driver identifier for recorded rows
+        """
+        self.db_path = db_path or config.ANALYTICS_DB_PATH
+        self.driver_id = driver_id or config.DRIVER_ID
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Schema and WAL mode are set up synchronously, once
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self.write_queue = queue.Queue(maxsize=config.ANALYTICS_QUEUE_SIZE)
+        self.rows_dropped = 0
+        self.is_running = True
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+        # Session state (frame-loop side)
+        self.session_id = None
+        self.session_frames = 0
+        self.session_events = 0
+        self.session_alerts = 0
+        self.minute = None
+        self.event_start = None
+        self.event_reasons = set()
+        self.event_min_ear = None
+
+        # Onset of the current eye closure, and the start the next alert's
+        # latency is measured from (cleared once the event's first alert is stored)
+        self.closure_start = None
+        self.latency_start = None
+
+        print(f"[INFO] Trip analytics store: {self.db_path}")
+
+    def _connect(self):
+        """Open a connection with WAL journaling."""
+        connection = sqlite3.connect(self.db_path, timeout=5.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # ==================== FRAME LOOP SIDE ====================
+
+    def start_session(self, start_time=None):
+        """
+        Begin a new driving session.
+
+        The session id is allocated from the clock so the frame loop never
+        has to wait for the database to assign one.
+
+        Args:
+            start_time: Session start (default now)
+        """
+        start_time = start_time or time.time()
+        self.session_id = int(start_time * 1000)
+        self.session_frames = 0
+        self.session_events = 0
+        self.session_alerts = 0
+        self.minute = _MinuteAccumulator(self._minute_of(start_time))
+
+        self._enqueue(
+            "INSERT INTO sessions (id, driver_id, started_at) VALUES (?, ?, ?)",
+            (self.session_id, self.driver_id, start_time)
+        )
+
+    def record_frame(self, ear_value, eyes_closed, is_drowsy, reasons=None, now=None):
+        """
+        Record one processed frame.
+
+        Args:
+            ear_value: EAR fed to the detector, or None if no face
+            eyes_closed: Whether the eyes counted as closed this frame
+            is_drowsy: Detector state after this frame
+            reasons: Alert reasons while drowsy
+            now: Frame wall-clock time (default now)
+        """
+        if self.session_id is None:
+            return
+
+        now = now or time.time()
+        minute_start = self._minute_of(now)
+
+        if minute_start != self.minute.minute_start:
+            self._flush_minute()
+            self.minute = _MinuteAccumulator(minute_start)
+
+        minute = self.minute
+        minute.frames += 1
+        self.session_frames += 1
+
+        if ear_value is not None:
+            minute.face_frames += 1
+            minute.ear_sum += ear_value
+            if minute.min_ear is None or ear_value < minute.min_ear:
+                minute.min_ear = ear_value
+            if eyes_closed:
+                minute.closed_frames += 1
+
+        if not eyes_closed:
+            self.closure_start = None
+        elif self.closure_start is None:
+            self.closure_start = now
+
+        # Drowsiness event transitions
+        if is_drowsy:
+            if self.event_start is None:
+                self.event_start = now
+                self.latency_start = self.closure_start or now
+                self.event_reasons = set()
+                self.event_min_ear = ear_value
+                self.session_events += 1
+            if reasons:
+                self.event_reasons.update(reasons)
+            if ear_value is not None and (self.event_min_ear is None or ear_value < self.event_min_ear):
+                self.event_min_ear = ear_value
+        elif self.event_start is not None:
+            self._flush_event(now)
+
+    def record_alert(self, now=None):
+        """
+        Record that an alert was played.
+
+        Call after record_frame() for the same frame. The first alert of an
+        event stores its latency from the onset of the eye closure (or of the
+        event); cooldown repeats store NULL so they do not skew the average.
+
+        Args:
+            now: Alert time (default now)
+        """
+        if self.session_id is None:
+            return
+
+        now = now or time.time()
+        latency = now - self.latency_start if self.latency_start is not None else None
+        self.latency_start = None
+        self.session_alerts += 1
+
+        self._enqueue(
+            "INSERT INTO alerts (session_id, driver_id, played_at, event_latency) VALUES (?, ?, ?, ?)",
+            (self.session_id, self.driver_id, now, latency)
+        )
+
+    def end_session(self, end_time=None):
+        """
+        Finish the current session, flushing open minute and event rows.
+
+        Args:
+            end_time: Session end (default now)
+        """
+        if self.session_id is None:
+            return
+
+        end_time = end_time or time.time()
+
+        if self.event_start is not None:
+            self._flush_event(end_time)
+        self._flush_minute()
+
+        self._enqueue(
+            "UPDATE sessions SET ended_at = ?, frames = ?, events = ?, alerts = ? WHERE id = ?",
+            (end_time, self.session_frames, self.session_events, self.session_alerts, self.session_id)
+        )
+        self.session_id = None
+
+    @staticmethod
+    def _minute_of(timestamp):
+        """Start of the minute containing a timestamp."""
+        return float(int(timestamp // 60) * 60)
+
+    def _flush_minute(self):
+        """Queue the rollup row for the current minute."""
+        minute = self.minute
+        if minute is None or minute.frames == 0:
+            return
+
+        mean_ear = minute.ear_sum / minute.face_frames if minute.face_frames else None
+        perclos = minute.closed_frames / minute.face_frames if minute.face_frames else None
+
+        self._enqueue(
+            "INSERT OR REPLACE INTO minute_rollups "
+            "(session_id, driver_id, minute_start, frames, face_frames, mean_ear, min_ear, perclos) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.session_id, self.driver_id, minute.minute_start, minute.frames,
+             minute.face_frames, mean_ear, minute.min_ear, perclos)
+        )
+
+    def _flush_event(self, end_time):
+        """Queue the row for the drowsiness event that just ended."""
+        self._enqueue(
+            "INSERT INTO drowsiness_events (session_id, driver_id, started_at, ended_at, reasons, min_ear) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (self.session_id, self.driver_id, self.event_start, end_time,
+             ",".join(sorted(self.event_reasons)), self.event_min_ear)
+        )
+        self.event_start = None
+
+    def _enqueue(self, sql, params):
+        """Hand a statement to the writer without ever blocking."""
+        try:
+            self.write_queue.put_nowait((sql, params))
+        except queue.Full:
+            self.rows_dropped += 1
+
+    # ==================== WRITER THREAD ====================
+
+    def _writer_loop(self):
+        """Drain the queue and commit statements in batches."""
+        connection = self._connect()
+
+        try:
+            while self.is_running or not self.write_queue.empty():
+                try:
+                    batch = [self.write_queue.get(timeout=config.ANALYTICS_FLUSH_INTERVAL)]
+                except queue.Empty:
+                    continue
+
+                while len(batch) < config.ANALYTICS_BATCH_SIZE:
+                    try:
+                        batch.append(self.write_queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    with connection:
+                        for sql, params in batch:
+                            connection.execute(sql, params)
+                except sqlite3.Error as e:
+                    print(f"[ERROR] Trip analytics write failed ({len(batch)} rows): {e}")
+        finally:
+            connection.close()
+
+    # ==================== QUERIES ====================
+
+    def get_trip_summary(self, driver_id=None, start_time=None, end_time=None):
+        """
+        Summarize recorded driving for a driver and time range.
+
+        Runs on its own read connection (WAL allows reading while the
+        writer commits) and only touches indexed rollup and event rows.
+
+        Args:
+            driver_id: Driver to summarize (default this store's driver)
+            start_time: Range start (default: beginning of records)
+            end_time: Range end (default: now)
+
+        Returns:
+            dict: Sessions, driving minutes, frames, mean EAR, mean PERCLOS,
+                  drowsiness events, alerts and average alert latency
+        """
+        driver_id = driver_id or self.driver_id
+        start_time = start_time or 0.0
+        end_time = end_time or time.time()
+        range_params = (driver_id, start_time, end_time)
+
+        connection = sqlite3.connect(self.db_path, timeout=5.0)
+        try:
+            minutes, frames, face_frames, mean_ear, mean_perclos, sessions = connection.execute(
+                "SELECT COUNT(*), SUM(frames), SUM(face_frames), "
+                "SUM(mean_ear * face_frames) / NULLIF(SUM(face_frames), 0), "
+                "SUM(perclos * face_frames) / NULLIF(SUM(face_frames), 0), "
+                "COUNT(DISTINCT session_id) "
+                "FROM minute_rollups WHERE driver_id = ? AND minute_start BETWEEN ? AND ?",
+                range_params
+            ).fetchone()
+
+            events, event_seconds = connection.execute(
+                "SELECT COUNT(*), SUM(ended_at - started_at) "
+                "FROM drowsiness_events WHERE driver_id = ? AND started_at BETWEEN ? AND ?",
+                range_params
+            ).fetchone()
+
+            alerts, mean_latency = connection.execute(
+                "SELECT COUNT(*), AVG(event_latency) "
+                "FROM alerts WHERE driver_id = ? AND played_at BETWEEN ? AND ?",
+                range_params
+            ).fetchone()
+        finally:
+            connection.close()
+
+        return {
+            'driver_id': driver_id,
+            'sessions': sessions or 0,
+            'minutes': minutes or 0,
+            'frames': frames or 0,
+            'face_frames': face_frames or 0,
+            'mean_ear': mean_ear,
+            'mean_perclos': mean_perclos,
+            'events': events or 0,
+            'drowsy_seconds': event_seconds or 0.0,
+            'alerts': alerts or 0,
+            'mean_alert_latency': mean_latency
+        }
+
+    def get_sessions(self, driver_id=None, start_time=None, end_time=None):
+        """
+        List recorded sessions for a driver and time range.
+
+        Args:
+            driver_id: Driver to list (default this store's driver)
+            start_time: Range start
+            end_time: Range end
+
+        Returns:
+            list: Session dicts, newest first
+        """
+        driver_id = driver_id or self.driver_id
+
+        connection = sqlite3.connect(self.db_path, timeout=5.0)
+        connection.row_factory = sqlite3.Row
+        try:
+            rows = connection.execute(
+                "SELECT * FROM sessions WHERE driver_id = ? AND started_at BETWEEN ? AND ? "
+                "ORDER BY started_at DESC",
+                (driver_id, start_time or 0.0, end_time or time.time())
+            ).fetchall()
+        finally:
+            connection.close()
+
+        return [dict(row) for row in rows]
+
+    def close(self):
+        """End the session and flush all pending rows to disk."""
+        self.end_session()
+        self.is_running = False
+        self.writer_thread.join(timeout=5.0)
+
+        if self.rows_dropped:
+            print(f"[WARNING] Trip analytics dropped {self.rows_dropped} rows (writer queue full)")
+        print("[INFO] Trip analytics store closed")
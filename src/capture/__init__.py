@@ -0,0 +1,11 @@
+"""
+__init__.py for capture module
+Makes the capture package importable
+"""
+
+from .video_source import VideoSource, open_video_source
+from .synthetic_face import SyntheticFaceGenerator
+from .watchdog import CaptureWatchdog
+from .frame_cache import FrameCache
+
+__all__ = ['VideoSource', 'open_video_source', 'SyntheticFaceGenerator', 'CaptureWatchdog', 'FrameCache']
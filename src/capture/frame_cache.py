@@ -0,0 +1,352 @@
+"""
+Frame Cache Module
+Decodes recorded clips once into memory-mapped raw frame stores, keyed by
+file content hash and bounded in size with least-recently-used eviction
+
+Usage (from the project root):
+    python -m src.capture.frame_cache build recordings/drive.mp4 --scale 0.5
+    python -m src.capture.frame_cache list
+    python -m src.capture.frame_cache clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import cv2
+import numpy as np
+import config
+
+
+# Files inside one cache entry
+FRAMES_FILE = 'frames.raw'
+TIMESTAMPS_FILE = 'timestamps.npy'
+INDEX_FILE = 'index.json'
+
+# Maps "path|size|mtime" to content hashes so unchanged files are not rehashed
+HASH_INDEX_FILE = 'hashes.json'
+
+
+class CachedClip:
+    """
+    A decoded clip backed by a read-only memory map.
+
+    frame(i) returns a view into the map, so frames go to inference without
+    being copied or decoded; the OS page cache keeps hot clips in memory.
+    """
+
+    def __init__(self, entry_dir):
+        """
+        Open a cache entry.
+
+        Args:
+            entry_dir: Directory holding frames.raw, timestamps.npy and index.json
+        """
+        with open(os.path.join(entry_dir, INDEX_FILE)) as index_file:
+            self.index = json.load(index_file)
+
+        shape = (self.index['frames'], self.index['height'], self.index['width'], 3)
+        self.frames = np.memmap(os.path.join(entry_dir, FRAMES_FILE), dtype=np.uint8, mode='r', shape=shape)
+        self.timestamps = np.load(os.path.join(entry_dir, TIMESTAMPS_FILE))
+        self.fps = self.index['fps']
+
+    def __len__(self):
+        return self.index['frames']
+
+    def frame(self, index):
+        """
+        Get a frame without copying it.
+
+        Args:
+            index: Frame number
+
+        Returns:
+            tuple: (frame view, timestamp in seconds)
+        """
+        return self.frames[index], float(self.timestamps[index])
+
+    def close(self):
+        """
+        Drop the memory map. It is unmapped once no frame views remain, so
+        frames still queued or in use stay valid.
+        """
+        self.frames = None
+
+
+class FrameCache:
+    """
+    Content-addressed store of decoded clips.
+
+    Each entry is a directory named after the SHA-256 of the source file and
+    the decode scale. The most recent use of an entry is its index file's
+    modification time; when the cache grows past its size bound the least
+    recently used entries are deleted.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory (default config.FRAME_CACHE_DIR)
+            max_bytes: Size bound (default config.FRAME_CACHE_MAX_GB)
+        """
+        self.cache_dir = cache_dir or config.FRAME_CACHE_DIR
+        self.max_bytes = max_bytes or int(config.FRAME_CACHE_MAX_GB * 1024 ** 3)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def content_hash(self, path):
+        """
+        Hash a file's contents, reusing the last hash if size and mtime match.
+
+        Args:
+            path: Source file
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        stat = os.stat(path)
+        file_key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        hash_index_path = os.path.join(self.cache_dir, HASH_INDEX_FILE)
+
+        try:
+            with open(hash_index_path) as hash_file:
+                hashes = json.load(hash_file)
+        except (OSError, ValueError):
+            hashes = {}
+
+        if file_key in hashes:
+            return hashes[file_key]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as source:
+            for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                digest.update(chunk)
+
+        hashes[file_key] = digest.hexdigest()
+        with open(hash_index_path, 'w') as hash_file:
+            json.dump(hashes, hash_file)
+
+        return hashes[file_key]
+
+    def entry_dir(self, path, scale):
+        """Cache directory for a source file decoded at a scale."""
+        key = f"{self.content_hash(path)[:32]}_{int(round(scale * 100)):03d}"
+        return os.path.join(self.cache_dir, key)
+
+    def open(self, path, scale=None):
+        """
+        Open the cached frames of a clip, decoding it first if needed.
+
+        Args:
+            path: Video file
+            scale: Resolution factor applied while decoding (default config.FRAME_CACHE_SCALE)
+
+        Returns:
+            CachedClip: Memory-mapped frames and timestamps, or None if the
+                        decoded clip would not fit in the cache
+
+        Raises:
+            IOError: If the clip cannot be decoded
+        """
+        scale = config.FRAME_CACHE_SCALE if scale is None else scale
+        entry_dir = self.entry_dir(path, scale)
+
+        if os.path.exists(os.path.join(entry_dir, INDEX_FILE)):
+            print(f"[INFO] Frame cache hit: {path} -> {entry_dir}")
+        elif self._build(path, scale, entry_dir):
+            self._evict(keep=entry_dir)
+        else:
+            return None
+
+        # Mark as most recently used
+        os.utime(os.path.join(entry_dir, INDEX_FILE))
+        return CachedClip(entry_dir)
+
+    def _build(self, path, scale, entry_dir):
+        """
+        Decode a clip into a new cache entry.
+
+        The entry is written to a temporary directory and renamed into place,
+        so an interrupted build never leaves a half-written entry. A clip
+        larger than the whole cache is not decoded into it: the size is
+        estimated from the container first and checked again while writing,
+        since some containers do not report a frame count.
+
+        Returns:
+            bool: False if the clip does not fit in the cache
+        """
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise IOError(f"Could not open video file: {path}")
+
+        fps = capture.get(cv2.CAP_PROP_FPS) or config.CAMERA_FPS
+        estimated_bytes = (
+            int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            * int(round(capture.get(cv2.CAP_PROP_FRAME_HEIGHT) * scale))
+            * int(round(capture.get(cv2.CAP_PROP_FRAME_WIDTH) * scale)) * 3
+        )
+        if estimated_bytes > self.max_bytes:
+            capture.release()
+            self._report_too_large(path, estimated_bytes)
+            return False
+
+        temp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        os.makedirs(temp_dir, exist_ok=True)
+
+        timestamps = []
+        height = width = None
+        written_bytes = 0
+        start_time = time.perf_counter()
+        print(f"[INFO] Frame cache: decoding {path} (scale {scale})...")
+
+        try:
+            with open(os.path.join(temp_dir, FRAMES_FILE), 'wb') as frames_file:
+                while True:
+                    ret, frame = capture.read()
+                    if not ret:
+                        break
+
+                    if scale != 1.0:
+                        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+                    if height is None:
+                        height, width = frame.shape[:2]
+
+                    position_ms = capture.get(cv2.CAP_PROP_POS_MSEC)
+                    timestamps.append(position_ms / 1000.0 if position_ms > 0 else len(timestamps) / fps)
+                    frames_file.write(np.ascontiguousarray(frame).data)
+
+                    written_bytes += frame.nbytes
+                    if written_bytes > self.max_bytes:
+                        break
+        finally:
+            capture.release()
+
+        if written_bytes > self.max_bytes:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            self._report_too_large(path, written_bytes)
+            return False
+
+        if not timestamps:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise IOError(f"No frames decoded from: {path}")
+
+        np.save(os.path.join(temp_dir, TIMESTAMPS_FILE), np.asarray(timestamps, dtype=np.float64))
+        with open(os.path.join(temp_dir, INDEX_FILE), 'w') as index_file:
+            json.dump({
+                'source': os.path.abspath(path),
+                'scale': scale,
+                'frames': len(timestamps),
+                'height': height,
+                'width': width,
+                'fps': fps
+            }, index_file, indent=2)
+
+        try:
+            os.replace(temp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if not os.path.exists(os.path.join(entry_dir, INDEX_FILE)):
+                raise
+            # Another process built the same entry first; use theirs
+            print(f"[INFO] Frame cache hit: {path} -> {entry_dir} (built concurrently)")
+            return True
+
+        size_mb = len(timestamps) * height * width * 3 / (1024 * 1024)
+        print(f"[INFO] Frame cache: {len(timestamps)} frames ({width}x{height}, {size_mb:.0f} MB) "
+              f"in {time.perf_counter() - start_time:.1f}s")
+        return True
+
+    def _report_too_large(self, path, size_bytes):
+        """Warn that a clip is decoded directly because it exceeds the cache bound."""
+        print(f"[WARNING] Frame cache: {path} needs over {size_bytes / (1024 * 1024):.0f} MB, "
+              f"more than the {self.max_bytes / (1024 * 1024):.0f} MB cache; decoding directly")
+
+    def entries(self):
+        """
+        List cache entries, least recently used first.
+
+        Returns:
+            list: (entry_dir, last_used, size_bytes, index) tuples
+        """
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            index_path = os.path.join(entry_dir, INDEX_FILE)
+            if not os.path.isfile(index_path):
+                continue
+
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, file_name))
+                for file_name in os.listdir(entry_dir)
+            )
+            entries.append((entry_dir, os.path.getmtime(index_path), size, index))
+
+        entries.sort(key=lambda entry: entry[1])
+        return entries
+
+    def _evict(self, keep=None):
+        """Delete least recently used entries until the cache fits its bound."""
+        entries = self.entries()
+        total = sum(entry[2] for entry in entries)
+
+        for entry_dir, _, size, index in entries:
+            if total <= self.max_bytes:
+                break
+            if entry_dir == keep:
+                continue
+
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            print(f"[INFO] Frame cache: evicted {index['source']} ({size / (1024 * 1024):.0f} MB)")
+
+    def clear(self):
+        """Delete every cache entry."""
+        for entry_dir, _, _, _ in self.entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Decoded-frame cache for recorded clips")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Decode clips into the cache")
+    build_parser.add_argument('paths', nargs='+', help="Video files")
+    build_parser.add_argument('--scale', type=float, help="Resolution factor (default config.FRAME_CACHE_SCALE)")
+    subparsers.add_parser('list', help="List cached clips")
+    subparsers.add_parser('clear', help="Delete all cached clips")
+    args = parser.parse_args(argv)
+
+    cache = FrameCache()
+
+    if args.command == 'build':
+        for path in args.paths:
+            try:
+                clip = cache.open(path, args.scale)
+            except IOError as e:
+                print(f"[ERROR] {e}")
+                return 1
+            if clip is not None:
+                clip.close()
+    elif args.command == 'list':
+        for entry_dir, last_used, size, index in reversed(cache.entries()):
+            print(f"{os.path.basename(entry_dir)}  {size / (1024 * 1024):8.0f} MB  "
+                  f"{index['frames']:7d} frames  {index['width']}x{index['height']}  "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(last_used))}  {index['source']}")
+    elif args.command == 'clear':
+        cache.clear()
+        print(f"[INFO] Frame cache cleared: {cache.cache_dir}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
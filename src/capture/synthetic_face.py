@@ -0,0 +1,497 @@
+"""
+Synthetic Driver Face Module
+Renders a parametric driver face with controllable eyelid aperture, blinks,
+long closures, yawns, head motion, lighting and sensor noise, together with
+ground-truth EAR and closure labels for every frame
+
+Usage (from the project root):
+    python -m src.capture.synthetic_face --output fixtures/drive.mp4 --duration 120 --seed 7
+    python -m src.capture.synthetic_face --output fixtures/drive.mp4 --duration 30 --check
+"""
+
+import argparse
+import bisect
+import csv
+import math
+import random
+import sys
+import cv2
+import numpy as np
+import config
+
+
+# Eye half-height / half-width when fully open; equals the ground-truth EAR
+# of the drawn eye (EAR = (v1 + v2) / (2h) = 2b / 2a for an ellipse)
+OPEN_EYE_RATIO = 0.32
+
+# Aperture at or below which the eye counts as closed (PERCLOS 80% criterion)
+CLOSED_APERTURE = 0.2
+
+# Event kinds
+EVENT_BLINK = 'blink'
+EVENT_CLOSURE = 'closure'
+EVENT_YAWN = 'yawn'
+EVENT_NOD = 'nod'
+
+
+class SyntheticFaceGenerator:
+    """
+    Deterministic renderer for a synthetic driver face.
+
+    The event schedule (blinks, long closures, yawns, nods) is generated from
+    the seed and extended lazily, so the state at any timestamp - and thus
+    every frame and its label - is a pure function of (seed, timestamp).
+    """
+
+    def __init__(self, width=None, height=None, fps=None, seed=0,
+                 blink_interval=(2.0, 6.0), closure_interval=(30.0, 90.0),
+                 closure_duration=(1.5, 4.0), yawn_interval=(45.0, 120.0),
+                 nod_interval=(60.0, 150.0), head_motion=1.0, lighting_variation=0.15,
+                 noise_sigma=4.0):
+        """
+        Initialize the generator.
+
+        Args:
+            width: Frame width (default config.CAMERA_WIDTH)
+            height: Frame height (default config.CAMERA_HEIGHT)
+            fps: Frame rate (default config.CAMERA_FPS)
+            seed: Random seed for the event schedule and noise
+            blink_interval: (min, max) seconds between blinks
+            closure_interval: (min, max) seconds between long closures (None disables)
+            closure_duration: (min, max) seconds a long closure lasts
+            yawn_interval: (min, max) seconds between yawns (None disables)
+            nod_interval: (min, max) seconds between head nods (None disables)
+            head_motion: Scale of head sway (0 = still)
+            lighting_variation: Relative amplitude of slow brightness changes
+            noise_sigma: Standard deviation of per-frame sensor noise
+        """
+        self.width = width or config.CAMERA_WIDTH
+        self.height = height or config.CAMERA_HEIGHT
+        self.fps = fps or config.CAMERA_FPS
+        self.seed = seed
+        self.head_motion = head_motion
+        self.lighting_variation = lighting_variation
+        self.noise_sigma = noise_sigma
+
+        self.intervals = {
+            EVENT_BLINK: blink_interval,
+            EVENT_CLOSURE: closure_interval,
+            EVENT_YAWN: yawn_interval,
+            EVENT_NOD: nod_interval
+        }
+        self.closure_duration = closure_duration
+
+        # Lazily extended schedule: sorted (start, end, kind)
+        self.schedule_random = random.Random(seed)
+        self.event_starts = []
+        self.events = []
+        self.next_event_time = {
+            kind: self._draw_interval(kind) for kind, interval in self.intervals.items() if interval
+        }
+        self.scheduled_until = 0.0
+
+        # Geometry (scaled from a 640x480 layout)
+        scale = min(self.width / 640.0, self.height / 480.0)
+        self.scale = scale
+        self.face_axes = (int(105 * scale), int(140 * scale))
+        self.eye_half_width = int(24 * scale)
+        self.eye_offset = (int(45 * scale), int(-28 * scale))
+        self.mouth_offset = int(68 * scale)
+        self.mouth_half_width = int(30 * scale)
+
+        # Cached static layers
+        self.background = self._render_background()
+        self.noise_buffer = np.empty((self.height, self.width, 3), dtype=np.int16)
+
+    # ==================== SCHEDULE ====================
+
+    def _draw_interval(self, kind):
+        """Random time until the next event of a kind."""
+        low, high = self.intervals[kind]
+        return self.schedule_random.uniform(low, high)
+
+    def _event_duration(self, kind):
+        """Random duration of one event of a kind."""
+        if kind == EVENT_BLINK:
+            return self.schedule_random.uniform(0.15, 0.3)
+        if kind == EVENT_CLOSURE:
+            return self.schedule_random.uniform(*self.closure_duration)
+        if kind == EVENT_YAWN:
+            return self.schedule_random.uniform(3.0, 5.0)
+        return self.schedule_random.uniform(1.5, 3.0)
+
+    def _extend_schedule(self, until):
+        """Generate events until the schedule covers a timestamp."""
+        if not self.next_event_time:
+            # Every event kind disabled - only added events ever happen
+            self.scheduled_until = math.inf
+            return
+
+        while self.scheduled_until < until + 10.0:
+            kind = min(self.next_event_time, key=self.next_event_time.get)
+            start = self.next_event_time[kind]
+            duration = self._event_duration(kind)
+
+            self._insert_event(start, start + duration, kind)
+            self.next_event_time[kind] = start + duration + self._draw_interval(kind)
+            self.scheduled_until = start
+
+    def _insert_event(self, start, end, kind):
+        """Insert an event keeping the schedule sorted by start time."""
+        index = bisect.bisect_right(self.event_starts, start)
+        self.event_starts.insert(index, start)
+        self.events.insert(index, (start, end, kind))
+
+    def add_event(self, kind, start, duration):
+        """
+        Inject an event at a known time (e.g. a closure of known onset).
+
+        Args:
+            kind: 'blink', 'closure', 'yawn' or 'nod'
+            start: Start time in seconds
+            duration: Duration in seconds
+        """
+        self._insert_event(start, start + duration, kind)
+
+    def active_events(self, timestamp):
+        """
+        Get the events active at a timestamp.
+
+        Args:
+            timestamp: Time in seconds
+
+        Returns:
+            list: (start, end, kind) tuples
+        """
+        self._extend_schedule(timestamp)
+        index = bisect.bisect_right(self.event_starts, timestamp)
+
+        # Events are short, so only a few recent starts can still be active
+        return [event for event in self.events[max(0, index - 8):index] if event[1] > timestamp]
+
+    # ==================== STATE / LABELS ====================
+
+    def state_at(self, timestamp):
+        """
+        Compute the face state at a timestamp.
+
+        Args:
+            timestamp: Time in seconds
+
+        Returns:
+            dict: aperture, mouth_open, pitch, sway_x, sway_y, roll, brightness, event
+        """
+        aperture = 1.0
+        mouth_open = 0.05
+        pitch = 0.0
+        event_kind = None
+
+        for start, end, kind in self.active_events(timestamp):
+            progress = (timestamp - start) / (end - start)
+            event_kind = kind
+
+            if kind == EVENT_BLINK:
+                # Close and reopen symmetrically
+                aperture = min(aperture, abs(1.0 - 2.0 * progress))
+            elif kind == EVENT_CLOSURE:
+                ramp = min(0.15, (end - start) / 4.0)
+                edge = min(timestamp - start, end - timestamp) / ramp
+                aperture = min(aperture, max(0.0, 1.0 - min(1.0, edge)))
+            elif kind == EVENT_YAWN:
+                mouth_open = max(mouth_open, math.sin(math.pi * progress))
+                aperture = min(aperture, 1.0 - 0.4 * math.sin(math.pi * progress))
+            elif kind == EVENT_NOD:
+                pitch = max(pitch, math.sin(math.pi * progress))
+
+        motion = self.head_motion
+        return {
+            'aperture': aperture,
+            'mouth_open': mouth_open,
+            'pitch': pitch,
+            'sway_x': motion * 12.0 * math.sin(0.7 * timestamp) * self.scale,
+            'sway_y': motion * 5.0 * math.sin(0.45 * timestamp + 1.0) * self.scale,
+            'roll': motion * 4.0 * math.sin(0.3 * timestamp),
+            'brightness': 1.0 + self.lighting_variation * math.sin(0.1 * timestamp),
+            'event': event_kind
+        }
+
+    def label_at(self, timestamp):
+        """
+        Ground truth for the frame at a timestamp.
+
+        Args:
+            timestamp: Time in seconds
+
+        Returns:
+            dict: timestamp, ear, mar, aperture, eyes_closed, event
+        """
+        return self._label(timestamp, self.state_at(timestamp))
+
+    @staticmethod
+    def _label(timestamp, state):
+        """Build the ground-truth label for a face state."""
+        return {
+            'timestamp': timestamp,
+            'ear': OPEN_EYE_RATIO * state['aperture'],
+            'mar': 0.1 + 0.9 * state['mouth_open'],
+            'aperture': state['aperture'],
+            'eyes_closed': state['aperture'] <= CLOSED_APERTURE,
+            'event': state['event']
+        }
+
+    # ==================== RENDERING ====================
+
+    def _render_background(self):
+        """Static cabin-like background: vertical gradient with a headrest."""
+        gradient = np.linspace(70, 30, self.height, dtype=np.float32)[:, None]
+        background = np.repeat(np.repeat(gradient, self.width, axis=1)[:, :, None], 3, axis=2)
+        background[:, :, 0] *= 1.1
+        background = background.clip(0, 255).astype(np.uint8)
+
+        center = (self.width // 2, self.height // 2 - int(20 * self.scale))
+        cv2.ellipse(background, center, (int(150 * self.scale), int(190 * self.scale)),
+                    0, 0, 360, (45, 45, 50), -1)
+        return background
+
+    def render(self, timestamp):
+        """
+        Render the frame at a timestamp.
+
+        Args:
+            timestamp: Time in seconds
+
+        Returns:
+            tuple: (BGR frame, label dict)
+        """
+        state = self.state_at(timestamp)
+        frame = self.background.copy()
+
+        cx = self.width // 2 + state['sway_x']
+        cy = self.height // 2 + int(10 * self.scale) + state['sway_y']
+        roll = state['roll']
+        pitch = state['pitch']
+        angle = math.radians(roll)
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+
+        def place(dx, dy):
+            """Face-relative offset -> image point (roll and nod applied)."""
+            dy = dy + pitch * 18.0 * self.scale * (1.0 if dy > 0 else 0.5)
+            return (int(cx + dx * cos_a - dy * sin_a), int(cy + dx * sin_a + dy * cos_a))
+
+        skin = (125, 160, 205)
+        skin_dark = (95, 125, 170)
+        face_axes = (self.face_axes[0], int(self.face_axes[1] * (1.0 - 0.12 * pitch)))
+
+        # Neck, hair, face with side shading
+        neck_top = place(0, face_axes[1] - 20 * self.scale)
+        cv2.rectangle(frame, (neck_top[0] - int(45 * self.scale), neck_top[1]),
+                      (neck_top[0] + int(45 * self.scale), self.height), skin_dark, -1)
+        cv2.ellipse(frame, place(0, -25 * self.scale), (face_axes[0] + int(12 * self.scale), face_axes[1]),
+                    roll, 180, 360, (30, 30, 35), -1)
+        cv2.ellipse(frame, place(0, 0), face_axes, roll, 0, 360, skin_dark, -1)
+        cv2.ellipse(frame, place(0, -5 * self.scale),
+                    (int(face_axes[0] * 0.88), int(face_axes[1] * 0.95)), roll, 0, 360, skin, -1)
+
+        # Eyebrows
+        for side in (-1, 1):
+            brow = place(side * self.eye_offset[0], self.eye_offset[1] - 22 * self.scale)
+            cv2.ellipse(frame, brow, (int(28 * self.scale), int(7 * self.scale)), roll,
+                        200, 340, (40, 45, 60), max(2, int(4 * self.scale)))
+
+        # Eyes
+        for side in (-1, 1):
+            self._draw_eye(frame, place(side * self.eye_offset[0], self.eye_offset[1]),
+                           state['aperture'], skin, roll)
+
+        # Nose: bridge shadow, tip and nostrils
+        nose_tip = place(0, 28 * self.scale)
+        cv2.line(frame, place(-6 * self.scale, -15 * self.scale), place(-10 * self.scale, 22 * self.scale),
+                 skin_dark, max(2, int(3 * self.scale)))
+        cv2.ellipse(frame, nose_tip, (int(16 * self.scale), int(9 * self.scale)), roll, 0, 360, skin_dark, -1)
+        for side in (-1, 1):
+            cv2.circle(frame, place(side * 7 * self.scale, 31 * self.scale), max(2, int(3 * self.scale)),
+                       (50, 60, 90), -1)
+
+        # Mouth
+        mouth_center = place(0, self.mouth_offset)
+        open_height = int((3 + 28 * state['mouth_open']) * self.scale)
+        cv2.ellipse(frame, mouth_center, (self.mouth_half_width, open_height), roll, 0, 360, (70, 70, 150), -1)
+        if open_height > 5 * self.scale:
+            cv2.ellipse(frame, mouth_center, (int(self.mouth_half_width * 0.8), max(1, open_height - 4)),
+                        roll, 0, 360, (30, 25, 60), -1)
+
+        # Lighting and sensor noise
+        if state['brightness'] != 1.0:
+            cv2.convertScaleAbs(frame, frame, alpha=state['brightness'], beta=0)
+        if self.noise_sigma > 0:
+            # Noise seeded by frame index, so a frame does not depend on render order
+            noise_rng = np.random.default_rng((self.seed, int(round(timestamp * self.fps))))
+            self.noise_buffer[:] = noise_rng.normal(0.0, self.noise_sigma, self.noise_buffer.shape)
+            self.noise_buffer += frame
+            frame = self.noise_buffer.clip(0, 255).astype(np.uint8)
+
+        return frame, self._label(timestamp, state)
+
+    def _draw_eye(self, frame, center, aperture, skin, roll):
+        """
+        Draw one eye with the given eyelid aperture.
+
+        The visible eye is an ellipse of half-width a and half-height
+        OPEN_EYE_RATIO * a * aperture; the iris is clipped to it.
+        """
+        a = self.eye_half_width
+        b = max(1, int(round(OPEN_EYE_RATIO * a * aperture)))
+        lid_color = (60, 75, 110)
+
+        if aperture <= 0.08:
+            # Closed: lid crease and lashes only
+            cv2.ellipse(frame, center, (a, max(2, int(3 * self.scale))), roll, 0, 180, lid_color, 2)
+            return
+
+        # Draw into a small patch so the iris can be clipped to the eye opening
+        pad = int(a * 0.6)
+        x0, y0 = center[0] - a - pad, center[1] - a - pad
+        x1, y1 = center[0] + a + pad, center[1] + a + pad
+        if x0 < 0 or y0 < 0 or x1 > self.width or y1 > self.height:
+            return
+
+        patch = frame[y0:y1, x0:x1]
+        local = (a + pad, a + pad)
+
+        mask = np.zeros(patch.shape[:2], dtype=np.uint8)
+        cv2.ellipse(mask, local, (a, b), roll, 0, 360, 255, -1)
+
+        eye = patch.copy()
+        cv2.ellipse(eye, local, (a, b), roll, 0, 360, (225, 230, 235), -1)
+        cv2.circle(eye, local, int(a * 0.45), (60, 80, 110), -1)
+        cv2.circle(eye, local, int(a * 0.2), (15, 15, 20), -1)
+        cv2.circle(eye, (local[0] + int(a * 0.12), local[1] - int(a * 0.12)), max(1, int(a * 0.07)),
+                   (250, 250, 250), -1)
+
+        np.copyto(patch, eye, where=mask[:, :, None].astype(bool))
+
+        # Upper lid line and lower lid
+        cv2.ellipse(patch, local, (a, b), roll, 180, 360, lid_color, max(2, int(2 * self.scale)))
+        cv2.ellipse(patch, local, (a, b), roll, 0, 180, (90, 110, 150), 1)
+
+    def frames(self, duration=None, start=0.0):
+        """
+        Generate frames and labels.
+
+        Args:
+            duration: Seconds to generate (None = endless)
+            start: Start time in seconds
+
+        Yields:
+            tuple: (frame, label)
+        """
+        index = 0
+        while duration is None or index / self.fps < duration:
+            yield self.render(start + index / self.fps)
+            index += 1
+
+    def write_video(self, path, duration, labels_path=None, codec='mp4v'):
+        """
+        Render a clip to a video file plus a CSV of per-frame labels.
+
+        Args:
+            path: Output video path
+            duration: Clip length in seconds
+            labels_path: CSV path (default: video path with .csv extension)
+            codec: FourCC video codec
+
+        Returns:
+            int: Number of frames written
+        """
+        labels_path = labels_path or path.rsplit('.', 1)[0] + '.csv'
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), self.fps, (self.width, self.height))
+        if not writer.isOpened():
+            raise IOError(f"Could not open video writer: {path}")
+
+        count = 0
+        try:
+            with open(labels_path, 'w', newline='') as labels_file:
+                fields = ['frame', 'timestamp', 'ear', 'mar', 'aperture', 'eyes_closed', 'event']
+                label_writer = csv.DictWriter(labels_file, fieldnames=fields)
+                label_writer.writeheader()
+
+                for frame, label in self.frames(duration):
+                    writer.write(frame)
+                    label_writer.writerow(dict(label, frame=count, event=label['event'] or ''))
+                    count += 1
+        finally:
+            writer.release()
+
+        print(f"[INFO] Wrote {count} synthetic frames to {path} (labels: {labels_path})")
+        return count
+
+
+def check_tracking(generator, duration):
+    """
+    Run FaceEyeDetector on generated frames and compare with ground truth.
+
+    Args:
+        generator: SyntheticFaceGenerator
+        duration: Seconds of frames to check
+
+    Returns:
+        dict: detection rate and mean absolute EAR error
+    """
+    from src.detection.face_eye_detector import FaceEyeDetector
+
+    detector = FaceEyeDetector()
+    detected = 0
+    total = 0
+    errors = []
+
+    try:
+        for frame, label in generator.frames(duration):
+            total += 1
+            landmarks, features = detector.analyze_frame(frame)
+            if landmarks is not None:
+                detected += 1
+                errors.append(abs(features['ear'] - label['ear']))
+    finally:
+        detector.cleanup()
+
+    return {
+        'frames': total,
+        'detection_rate': detected / total if total else 0.0,
+        'mean_ear_error': sum(errors) / len(errors) if errors else None
+    }
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Render synthetic driver-face video with ground truth")
+    parser.add_argument('--output', required=True, help="Output video file (.mp4 / .avi)")
+    parser.add_argument('--duration', type=float, default=60.0, help="Clip length in seconds")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--width', type=int, default=config.CAMERA_WIDTH)
+    parser.add_argument('--height', type=int, default=config.CAMERA_HEIGHT)
+    parser.add_argument('--fps', type=float, default=config.CAMERA_FPS)
+    parser.add_argument('--noise', type=float, default=4.0, help="Sensor noise sigma")
+    parser.add_argument('--motion', type=float, default=1.0, help="Head motion scale")
+    parser.add_argument('--check', action='store_true', help="Verify FaceMesh tracks the rendered face")
+    args = parser.parse_args(argv)
+
+    generator = SyntheticFaceGenerator(
+        args.width, args.height, args.fps, seed=args.seed,
+        head_motion=args.motion, noise_sigma=args.noise
+    )
+    generator.write_video(args.output, args.duration)
+
+    if args.check:
+        result = check_tracking(
+            SyntheticFaceGenerator(args.width, args.height, args.fps, seed=args.seed,
+                                   head_motion=args.motion, noise_sigma=args.noise),
+            min(args.duration, 10.0)
+        )
+        print(f"[INFO] FaceMesh detection rate: {result['detection_rate'] * 100:.1f}% "
+              f"over {result['frames']} frames, mean EAR error: {result['mean_ear_error']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
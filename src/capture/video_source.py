@@ -0,0 +1,560 @@
+"""
+Video Source Module
+Opens webcams, video files, image-sequence directories, network streams and
+the synthetic face generator behind one interface, decoding frames on a
+prefetch thread
+"""
+
+import os
+import queue
+import threading
+import time
+import cv2
+import config
+
+
+# File extensions picked up when a directory is opened as an image sequence
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+# URL schemes treated as live network streams
+STREAM_SCHEMES = ('rtsp://', 'rtmp://', 'http://', 'https://', 'udp://', 'tcp://')
+
+# Source kinds
+KIND_CAMERA = 'camera'
+KIND_FILE = 'file'
+KIND_IMAGES = 'images'
+KIND_STREAM = 'stream'
+KIND_SYNTHETIC = 'synthetic'
+
+# Prefix selecting the in-process synthetic face generator, e.g. "synthetic://?seed=3"
+SYNTHETIC_PREFIX = 'synthetic://'
+
+# Options accepted in a synthetic source spec, by value type; range options
+# take "min,max", and the interval ones also "none" to disable the event kind
+SYNTHETIC_INT_OPTIONS = ('seed', 'width', 'height')
+SYNTHETIC_FLOAT_OPTIONS = ('fps', 'head_motion', 'lighting_variation', 'noise_sigma')
+SYNTHETIC_RANGE_OPTIONS = ('blink_interval', 'closure_interval', 'closure_duration',
+                           'yawn_interval', 'nod_interval')
+
+# Marker pushed onto the prefetch queue when recorded media is exhausted
+_END_OF_STREAM = object()
+
+
+def resolve_source_kind(source):
+    """
+    Work out what kind of source a source specification refers to.
+
+    Args:
+        source: Camera index (int or digit string), file path, directory or URL
+
+    Returns:
+        str: One of 'camera', 'file', 'images', 'stream' or 'synthetic'
+    """
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return KIND_CAMERA
+
+    if source.lower().startswith(SYNTHETIC_PREFIX):
+        return KIND_SYNTHETIC
+
+    if source.lower().startswith(STREAM_SCHEMES):
+        return KIND_STREAM
+
+    if os.path.isdir(source):
+        return KIND_IMAGES
+
+    return KIND_FILE
+
+
+class VideoSource:
+    """
+    Reads frames from a camera, video file, image directory or network stream.
+
+    Frames are decoded on a background prefetch thread into a bounded queue.
+    Every frame is paired with a timestamp in seconds: monotonic capture time
+    for live sources, media time for recorded sources. Recorded media can be
+    played back in real time or as fast as the consumer can take frames.
+    """
+
+    def __init__(self, source=None, prefetch_frames=None, realtime=None, loop=None):
+        """
+        Initialize the video source.
+
+        Args:
+            source: Camera index, video file, image directory or stream URL.
+                    Defaults to config.VIDEO_SOURCE, then config.CAMERA_INDEX.
+            prefetch_frames: Maximum number of decoded frames held in the queue
+            realtime: Pace recorded media at its native frame rate
+            loop: Restart recorded media from the beginning when it ends
+        """
+        if source is None:
+            source = config.VIDEO_SOURCE if config.VIDEO_SOURCE is not None else config.CAMERA_INDEX
+
+        self.source = source
+        self.kind = resolve_source_kind(source)
+        self.prefetch_frames = max(1, prefetch_frames or config.VIDEO_PREFETCH_FRAMES)
+        self.realtime = config.VIDEO_REALTIME_PLAYBACK if realtime is None else realtime
+        self.loop = config.VIDEO_LOOP if loop is None else loop
+
+        self.capture = None
+        self.cached_clip = None
+        self.cache_index = 0
+        self.synthetic = None
+        self.synthetic_index = 0
+        self.image_paths = []
+        self.image_index = 0
+        self.fps = config.CAMERA_FPS
+
+        # Prefetch thread state
+        self.frame_queue = queue.Queue(maxsize=self.prefetch_frames)
+        self.prefetch_thread = None
+        self.stop_event = None
+        self.is_running = False
+        self.end_of_stream = False
+
+        # Timestamp bookkeeping for looped recorded media
+        self.loop_offset = 0.0
+        self.last_media_timestamp = 0.0
+
+        # Real-time playback anchors (wall clock, media clock)
+        self.playback_anchor = None
+
+        # Statistics
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+
+    @property
+    def is_live(self):
+        """bool: True for cameras and network streams."""
+        return self.kind in (KIND_CAMERA, KIND_STREAM)
+
+    def open(self):
+        """
+        Open the underlying source.
+
+        Returns:
+            bool: True if the source was opened successfully
+        """
+        if self.kind == KIND_IMAGES:
+            self.image_paths = sorted(
+                os.path.join(self.source, name)
+                for name in os.listdir(self.source)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            self.fps = config.IMAGE_SEQUENCE_FPS
+            opened = len(self.image_paths) > 0
+        elif self.kind == KIND_SYNTHETIC:
+            from src.capture.synthetic_face import SyntheticFaceGenerator
+
+            try:
+                self.synthetic = SyntheticFaceGenerator(**_parse_synthetic_options(self.source))
+                self.fps = self.synthetic.fps
+                opened = True
+            except ValueError as e:
+                print(f"[ERROR] Invalid synthetic source {self.source}: {e}")
+                opened = False
+        elif self.kind == KIND_FILE and config.ENABLE_FRAME_CACHE and self._open_cached_clip():
+            self.fps = self.cached_clip.fps
+            opened = True
+        else:
+            target = int(self.source) if self.kind == KIND_CAMERA else self.source
+            self.capture = cv2.VideoCapture(target)
+
+            if self.kind == KIND_CAMERA:
+                self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
+                self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+                self.capture.set(cv2.CAP_PROP_FPS, config.CAMERA_FPS)
+
+            opened = self.capture.isOpened()
+            if opened:
+                reported_fps = self.capture.get(cv2.CAP_PROP_FPS)
+                if reported_fps and reported_fps > 0:
+                    self.fps = reported_fps
+
+        if opened:
+            print(f"[INFO] Video source opened: {self.source} ({self.kind}, {self.fps:.1f} FPS)")
+        else:
+            print(f"[ERROR] Could not open video source: {self.source}")
+
+        return opened
+
+    def _open_cached_clip(self):
+        """
+        Open a video file through the frame cache.
+
+        Returns:
+            bool: False if the file must be decoded directly instead
+        """
+        from src.capture.frame_cache import FrameCache
+
+        try:
+            self.cached_clip = FrameCache().open(self.source)
+        except IOError as e:
+            print(f"[WARNING] Frame cache failed, decoding directly: {e}")
+            return False
+
+        return self.cached_clip is not None
+
+    def start(self):
+        """
+        Open the source and start the prefetch thread.
+
+        Returns:
+            bool: True if the source is running
+        """
+        if not self.open():
+            return False
+
+        self.is_running = True
+        self.end_of_stream = False
+
+        # Each prefetch thread gets its own stop flag, capture and queue, so a
+        # thread that outlives release() can never touch its successor's
+        self.stop_event = threading.Event()
+        self.prefetch_thread = threading.Thread(
+            target=self._prefetch_loop, args=(self.stop_event, self.capture, self.frame_queue), daemon=True
+        )
+        self.prefetch_thread.start()
+        return True
+
+    def is_opened(self):
+        """
+        Check if the source is open and still producing frames.
+
+        Returns:
+            bool: True if frames can still be read
+        """
+        return self.is_running and not (self.end_of_stream and self.frame_queue.empty())
+
+    def read(self, timeout=1.0):
+        """
+        Get the next decoded frame.
+
+        Args:
+            timeout: Seconds to wait for a frame before giving up
+
+        Returns:
+            tuple: (success, frame, timestamp)
+        """
+        try:
+            item = self.frame_queue.get(timeout=timeout)
+        except queue.Empty:
+            return False, None, None
+
+        if item is _END_OF_STREAM:
+            self.end_of_stream = True
+            return False, None, None
+
+        frame, timestamp = item
+
+        if self.realtime and not self.is_live:
+            self._pace(timestamp)
+
+        return True, frame, timestamp
+
+    def _pace(self, timestamp):
+        """
+        Sleep until a recorded frame is due at its native playback time.
+
+        Args:
+            timestamp: Media timestamp of the frame about to be returned
+        """
+        now = time.monotonic()
+
+        if self.playback_anchor is None:
+            self.playback_anchor = (now, timestamp)
+            return
+
+        wall_start, media_start = self.playback_anchor
+        delay = (timestamp - media_start) - (now - wall_start)
+
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -1.0:
+            # Fell far behind (slow consumer) - re-anchor instead of bursting
+            self.playback_anchor = (now, timestamp)
+
+    def _prefetch_loop(self, stop_event, capture, frame_queue):
+        """
+        Decode frames into the bounded queue until stopped or exhausted.
+
+        Args:
+            stop_event: Set by release() to stop this thread
+            capture: cv2.VideoCapture owned by this thread (None for other kinds)
+            frame_queue: Queue this thread fills
+        """
+        try:
+            while not stop_event.is_set():
+                ok, frame, timestamp = self._decode_next(capture)
+
+                if stop_event.is_set():
+                    # Released while decoding (e.g. a hung camera read)
+                    return
+
+                if not ok:
+                    if self.is_live:
+                        # Transient read failure - avoid spinning on a dead device
+                        time.sleep(0.01)
+                        continue
+
+                    if self.loop and self._rewind(capture):
+                        continue
+
+                    self._put_blocking(frame_queue, _END_OF_STREAM, stop_event)
+                    return
+
+                self.frames_decoded += 1
+
+                if self.is_live:
+                    self._put_latest(frame_queue, (frame, timestamp))
+                else:
+                    self._put_blocking(frame_queue, (frame, timestamp), stop_event)
+        except Exception as e:
+            # End the stream so readers see it finish instead of waiting forever
+            print(f"[ERROR] Video source {self.source} failed: {e}")
+            if self.is_live:
+                self._put_latest(frame_queue, _END_OF_STREAM)
+            else:
+                self._put_blocking(frame_queue, _END_OF_STREAM, stop_event)
+        finally:
+            # release() gave up waiting and left the capture to this thread
+            if capture is not None and capture is not self.capture:
+                capture.release()
+
+    def _decode_next(self, capture=None):
+        """
+        Decode the next frame from the underlying source.
+
+        Args:
+            capture: cv2.VideoCapture to read from (file, camera and stream kinds)
+
+        Returns:
+            tuple: (success, frame, timestamp)
+        """
+        if self.kind == KIND_SYNTHETIC:
+            timestamp = self.synthetic_index / self.fps
+            self.synthetic_index += 1
+            frame, _ = self.synthetic.render(timestamp)
+            return True, frame, timestamp
+
+        if self.cached_clip is not None:
+            if self.cache_index >= len(self.cached_clip):
+                return False, None, None
+
+            # Read-only view into the memory map - no decode, no copy
+            frame, media_time = self.cached_clip.frame(self.cache_index)
+            self.cache_index += 1
+
+            timestamp = self.loop_offset + media_time
+            self.last_media_timestamp = timestamp
+            return True, frame, timestamp
+
+        if self.kind == KIND_IMAGES:
+            # Skip unreadable files
+            while self.image_index < len(self.image_paths):
+                frame = cv2.imread(self.image_paths[self.image_index])
+                timestamp = self.loop_offset + self.image_index / self.fps
+                self.image_index += 1
+
+                if frame is not None:
+                    self.last_media_timestamp = timestamp
+                    return True, frame, timestamp
+
+                print(f"[WARNING] Could not read image: {self.image_paths[self.image_index - 1]}")
+
+            return False, None, None
+
+        ret, frame = capture.read()
+        if not ret:
+            return False, None, None
+
+        if self.is_live:
+            return True, frame, time.monotonic()
+
+        position_ms = capture.get(cv2.CAP_PROP_POS_MSEC)
+        if position_ms > 0 or self.frames_decoded == 0:
+            media_time = position_ms / 1000.0
+        else:
+            # Some backends do not report positions - derive from frame rate
+            media_time = capture.get(cv2.CAP_PROP_POS_FRAMES) / self.fps
+
+        timestamp = self.loop_offset + media_time
+        self.last_media_timestamp = timestamp
+        return True, frame, timestamp
+
+    def _rewind(self, capture=None):
+        """
+        Restart recorded media, keeping timestamps monotonic.
+
+        Args:
+            capture: cv2.VideoCapture of a video file
+
+        Returns:
+            bool: True if the media was rewound
+        """
+        self.loop_offset = self.last_media_timestamp + 1.0 / self.fps
+
+        if self.cached_clip is not None:
+            self.cache_index = 0
+            return True
+
+        if self.kind == KIND_IMAGES:
+            self.image_index = 0
+            return len(self.image_paths) > 0
+
+        return capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _put_blocking(self, frame_queue, item, stop_event):
+        """Queue an item from recorded media, waiting for space without dropping."""
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _put_latest(self, frame_queue, item):
+        """Queue a live frame, dropping the oldest queued frame if full."""
+        while True:
+            try:
+                frame_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    frame_queue.get_nowait()
+                    self.frames_dropped += 1
+                except queue.Empty:
+                    pass
+
+    def restart(self):
+        """
+        Release and reopen the source, discarding queued frames.
+
+        Returns:
+            bool: True if the source is running again
+        """
+        self.release()
+
+        with self.frame_queue.mutex:
+            self.frame_queue.queue.clear()
+
+        self.playback_anchor = None
+        return self.start()
+
+    def get_label(self, timestamp):
+        """
+        Get the ground-truth label of a synthetic frame.
+
+        Args:
+            timestamp: Timestamp returned with the frame by read()
+
+        Returns:
+            dict: Label from SyntheticFaceGenerator.label_at
+            None: If this is not a synthetic source
+        """
+        if self.synthetic is None:
+            return None
+        return self.synthetic.label_at(timestamp)
+
+    def get_statistics(self):
+        """
+        Get decode statistics for the source.
+
+        Returns:
+            dict: Frames decoded, dropped and currently queued
+        """
+        return {
+            'kind': self.kind,
+            'fps': self.fps,
+            'decoded': self.frames_decoded,
+            'dropped': self.frames_dropped,
+            'queued': self.frame_queue.qsize()
+        }
+
+    def release(self):
+        """Stop the prefetch thread and release the underlying source."""
+        self.is_running = False
+        thread_exited = True
+
+        if self.prefetch_thread is not None:
+            self.stop_event.set()
+            self.prefetch_thread.join(timeout=1.0)
+            thread_exited = not self.prefetch_thread.is_alive()
+            self.prefetch_thread = None
+
+        if not thread_exited:
+            # Still blocked inside a read: leave it its capture and queue (it
+            # releases the capture when the read returns) and start afresh
+            print("[WARNING] Video prefetch thread did not stop - abandoning its capture")
+            self.frame_queue = queue.Queue(maxsize=self.prefetch_frames)
+        elif self.capture is not None:
+            self.capture.release()
+        self.capture = None
+
+        if self.cached_clip is not None:
+            if thread_exited:
+                self.cached_clip.close()
+            self.cached_clip = None
+            self.cache_index = 0
+
+        print("[INFO] Video source released")
+
+
+def _parse_synthetic_options(source):
+    """
+    Parse generator options from a synthetic source spec.
+
+    Args:
+        source: e.g. "synthetic://?seed=3&fps=60&noise_sigma=2&closure_interval=20,40"
+
+    Returns:
+        dict: Keyword arguments for SyntheticFaceGenerator
+
+    Raises:
+        ValueError: On an unknown option or a malformed value
+    """
+    options = {}
+    query = source[len(SYNTHETIC_PREFIX):].lstrip('?')
+
+    for pair in filter(None, query.split('&')):
+        key, _, value = pair.partition('=')
+        value = value.strip()
+
+        if key not in SYNTHETIC_INT_OPTIONS + SYNTHETIC_FLOAT_OPTIONS + SYNTHETIC_RANGE_OPTIONS:
+            raise ValueError(f"unknown option '{key}'")
+
+        try:
+            if key in SYNTHETIC_INT_OPTIONS:
+                options[key] = int(value)
+            elif key in SYNTHETIC_FLOAT_OPTIONS:
+                options[key] = float(value)
+            elif value.lower() == 'none' and key != 'closure_duration':
+                options[key] = None
+            else:
+                low, high = (float(part) for part in value.split(','))
+                options[key] = (low, high)
+        except ValueError:
+            raise ValueError(f"bad value for '{key}': '{value}'") from None
+
+    return options
+
+
+def open_video_source(source=None, **kwargs):
+    """
+    Create and start a video source.
+
+    Args:
+        source: Camera index, video file, image directory or stream URL
+        **kwargs: Extra VideoSource options
+
+    Returns:
+        VideoSource: Running video source
+
+    Raises:
+        IOError: If the source cannot be opened
+    """
+    video_source = VideoSource(source, **kwargs)
+
+    if not video_source.start():
+        raise IOError(f"Could not open video source: {video_source.source}")
+
+    return video_source
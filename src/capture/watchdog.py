@@ -0,0 +1,179 @@
+"""
+Capture Watchdog Module
+Detects stalled cameras and frozen or duplicate frames, and reopens the video
+source with bounded exponential backoff
+"""
+
+import time
+import numpy as np
+import config
+
+
+# Frame check results
+FRAME_OK = 'ok'
+FRAME_DUPLICATE = 'duplicate'
+FRAME_FROZEN = 'frozen'
+
+
+class CaptureWatchdog:
+    """
+    Watches a live video source for capture failures.
+
+    - Stall: no frame delivered for CAPTURE_STALL_TIMEOUT seconds
+    - Duplicate: a frame identical to the previous one (a sparse pixel sample
+      is compared; live sensor noise makes exact repeats rare)
+    - Frozen: duplicates for longer than CAPTURE_FROZEN_TIMEOUT seconds
+
+    Duplicates should be dropped rather than counted as new observations.
+    Stalls and frozen feeds are recovered by restarting the source. Time to
+    recover is measured from the last good frame to the first good frame
+    after the outage.
+    """
+
+    def __init__(self, stall_timeout=None, frozen_timeout=None):
+        """
+        Initialize the watchdog.
+
+        Args:
+            stall_timeout: Seconds without frames before the source is stalled
+            frozen_timeout: Seconds of identical frames before the feed is frozen
+        """
+        self.stall_timeout = config.CAPTURE_STALL_TIMEOUT if stall_timeout is None else stall_timeout
+        self.frozen_timeout = config.CAPTURE_FROZEN_TIMEOUT if frozen_timeout is None else frozen_timeout
+
+        now = time.monotonic()
+        self.last_frame_time = now
+        self.last_change_time = now
+        self.last_sample = None
+
+        # Start of the current outage (None while capture is healthy)
+        self.outage_start = None
+        self.outage_reason = None
+
+        # Statistics
+        self.duplicates = 0
+        self.stalls = 0
+        self.frozen = 0
+        self.recoveries = 0
+        self.last_recovery_time = None
+        self.max_recovery_time = 0.0
+
+    def check_frame(self, frame):
+        """
+        Check a frame that was read successfully.
+
+        Args:
+            frame: BGR frame from the source
+
+        Returns:
+            str: 'ok', 'duplicate' or 'frozen'
+        """
+        now = time.monotonic()
+        sample = frame[::8, ::8]
+
+        if self.last_sample is not None and sample.shape == self.last_sample.shape \
+                and np.array_equal(sample, self.last_sample):
+            self.duplicates += 1
+            self.last_frame_time = now
+
+            if now - self.last_change_time >= self.frozen_timeout:
+                self._begin_outage('frozen', self.last_change_time)
+                self.frozen += 1
+                self.last_change_time = now
+                return FRAME_FROZEN
+
+            return FRAME_DUPLICATE
+
+        self.last_sample = sample.copy()
+        self.last_frame_time = now
+        self.last_change_time = now
+
+        if self.outage_start is not None:
+            self._end_outage(now)
+
+        return FRAME_OK
+
+    def is_stalled(self):
+        """
+        Check whether the source has stopped delivering frames.
+
+        Returns:
+            bool: True if no frame arrived within the stall timeout
+        """
+        if time.monotonic() - self.last_frame_time < self.stall_timeout:
+            return False
+
+        if self.outage_start is None:
+            self.stalls += 1
+        self._begin_outage('stalled', self.last_frame_time)
+        return True
+
+    def recover(self, video_source, keep_running=lambda: True):
+        """
+        Restart the source, retrying with exponential backoff.
+
+        Args:
+            video_source: VideoSource to restart
+            keep_running: Callable returning False to abandon recovery
+
+        Returns:
+            bool: True if the source was reopened
+        """
+        delay = config.CAPTURE_RECOVERY_INITIAL_BACKOFF
+        attempt = 0
+
+        while keep_running():
+            attempt += 1
+            print(f"[WARNING] Capture {self.outage_reason} - reopening source (attempt {attempt})")
+
+            if video_source.restart():
+                # Give the fresh source a full timeout to deliver its first frame
+                self.last_frame_time = time.monotonic()
+                self.last_change_time = self.last_frame_time
+                self.last_sample = None
+                return True
+
+            time.sleep(delay)
+            delay = min(delay * 2.0, config.CAPTURE_RECOVERY_MAX_BACKOFF)
+
+        return False
+
+    def _begin_outage(self, reason, since):
+        """Record the start of an outage (kept if one is already running)."""
+        if self.outage_start is None:
+            self.outage_start = since
+            self.outage_reason = reason
+            print(f"[WARNING] Capture {reason}: no new frames for {time.monotonic() - since:.1f} s")
+
+    def _end_outage(self, now):
+        """Record the time to recover once good frames arrive again."""
+        elapsed = now - self.outage_start
+        self.recoveries += 1
+        self.last_recovery_time = elapsed
+        self.max_recovery_time = max(self.max_recovery_time, elapsed)
+        print(f"[INFO] Capture recovered from {self.outage_reason} in {elapsed:.2f} s")
+
+        self.outage_start = None
+        self.outage_reason = None
+
+    @property
+    def in_outage(self):
+        """bool: True between a detected stall/freeze and the next good frame."""
+        return self.outage_start is not None
+
+    def get_statistics(self):
+        """
+        Get watchdog statistics.
+
+        Returns:
+            dict: Duplicate frames, stalls, frozen feeds, recoveries and
+                  time-to-recover figures in seconds
+        """
+        return {
+            'duplicates': self.duplicates,
+            'stalls': self.stalls,
+            'frozen': self.frozen,
+            'recoveries': self.recoveries,
+            'last_recovery_s': self.last_recovery_time,
+            'max_recovery_s': self.max_recovery_time
+        }
@@ -5,5 +5,12 @@ Makes the detection package importable
 
 from .face_eye_detector import FaceEyeDetector
 from .drowsiness_detector import DrowsinessDetector
+from .feature_extractor import FeatureExtractor
+from .signal_conditioning import EARSignalConditioner
+from .motion_gate import MotionGate
+from .low_light import LowLightEnhancer
+from .shadow_policies import ShadowPolicyEvaluator
+from .face_tracker import FaceTracker
 
-__all__ = ['FaceEyeDetector', 'DrowsinessDetector']
+__all__ = ['FaceEyeDetector', 'DrowsinessDetector', 'FeatureExtractor', 'EARSignalConditioner', 'MotionGate', 'LowLightEnhancer',
+           'ShadowPolicyEvaluator', 'FaceTracker']
@@ -4,6 +4,7 @@ Manages the state machine for drowsiness detection based on EAR values
 """
 
 import time
+from collections import deque
 import config
 
 
@@ -30,6 +31,19 @@ class DrowsinessDetector:
         self.total_drowsy_events = 0
         self.last_alert_time = 0
         
+        # Reasons behind the current drowsy state ('eyes_closed', 'yawning', 'head_nod')
+        self.alert_reasons = []
+        
+        # Yawn tracking (mouth aspect ratio)
+        self.yawn_counter = 0
+        self.yawn_times = deque()
+        self.total_yawns = 0
+        
+        # Head nod tracking (head pitch against a slow running baseline)
+        self.nod_counter = 0
+        self.pitch_baseline = None
+        self.total_nods = 0
+        
         # History tracking for analytics
         self.ear_history = []
         self.max_history_length = 100
@@ -38,12 +52,16 @@ class DrowsinessDetector:
         print(f"[INFO] EAR Threshold: {self.ear_threshold}")
         print(f"[INFO] Consecutive Frames: {self.consecutive_frames_threshold}")
     
-    def update(self, ear_value):
+    def update(self, ear_value, features=None, eyes_closed=None):
         """
         Update the drowsiness state based on the current EAR value.
         
         Args:
             ear_value: Current Eye Aspect Ratio value
+            features: Optional fatigue features from FeatureExtractor; their
+                      mouth aspect ratio and head pitch add yawn and nod criteria
+            eyes_closed: Optional closed-eye decision from EARSignalConditioner;
+                         overrides the plain EAR threshold test
             
         Returns:
             bool: True if drowsiness is detected, False otherwise
@@ -51,28 +69,128 @@ class DrowsinessDetector:
         # Add to history
         self._add_to_history(ear_value)
         
-        # Check if EAR is below threshold
-        if ear_value is not None and ear_value < self.ear_threshold:
+        reasons = []
+        
+        if self._update_eye_state(ear_value, eyes_closed):
+            reasons.append('eyes_closed')
+        
+        if features is not None:
+            if config.ENABLE_YAWN_DETECTION and self._update_yawn_state(features['mar']):
+                reasons.append('yawning')
+            
+            if config.ENABLE_NOD_DETECTION and self._update_nod_state(features['head_pitch']):
+                reasons.append('head_nod')
+        
+        if reasons and not self.is_drowsy:
+            # Just entered drowsy state
+            self.total_drowsy_events += 1
+            print(f"[ALERT] Drowsiness detected ({', '.join(reasons)})! Event #{self.total_drowsy_events}")
+        
+        self.is_drowsy = bool(reasons)
+        self.alert_reasons = reasons
+        
+        return self.is_drowsy
+    
+    def _update_eye_state(self, ear_value, eyes_closed=None):
+        """
+        Count consecutive closed-eye frames.
+        
+        Args:
+            ear_value: Current EAR value
+            eyes_closed: Closed-eye decision made upstream, if any
+            
+        Returns:
+            bool: True if the eyes have been closed long enough to alert
+        """
+        if eyes_closed is None:
+            # Check if EAR is below threshold
+            eyes_closed = ear_value is not None and ear_value < self.ear_threshold
+        
+        if eyes_closed:
             # Eyes are closed - increment counter
             self.frame_counter += 1
             
-            # Check if threshold is exceeded
-            if self.frame_counter >= self.consecutive_frames_threshold:
-                if not self.is_drowsy:
-                    # Just entered drowsy state
-                    self.is_drowsy = True
-                    self.total_drowsy_events += 1
-                    print(f"[ALERT] Drowsiness detected! Event #{self.total_drowsy_events}")
-                
-                return True
-        else:
-            # Eyes are open - reset counter
-            if self.frame_counter > 0:
-                print(f"[INFO] Eyes opened - Frame counter reset from {self.frame_counter}")
+            return self.frame_counter >= self.consecutive_frames_threshold
+        
+        # Eyes are open - reset counter
+        if self.frame_counter > 0:
+            print(f"[INFO] Eyes opened - Frame counter reset from {self.frame_counter}")
+        
+        self.frame_counter = 0
+        return False
+    
+    def _update_yawn_state(self, mar):
+        """
+        Track yawns and flag frequent yawning.
+        
+        A yawn is the mouth aspect ratio staying above YAWN_MAR_THRESHOLD for
+        YAWN_CONSECUTIVE_FRAMES frames. Reaching YAWN_ALERT_COUNT yawns within
+        YAWN_ALERT_WINDOW seconds raises one alert and starts a new window.
+        
+        Args:
+            mar: Current mouth aspect ratio
+            
+        Returns:
+            bool: True on the frame that frequent yawning is detected
+        """
+        if mar <= config.YAWN_MAR_THRESHOLD:
+            self.yawn_counter = 0
+            return False
+        
+        self.yawn_counter += 1
+        if self.yawn_counter != config.YAWN_CONSECUTIVE_FRAMES:
+            return False
+        
+        # A new yawn just completed
+        current_time = time.time()
+        self.total_yawns += 1
+        self.yawn_times.append(current_time)
+        
+        while self.yawn_times and current_time - self.yawn_times[0] > config.YAWN_ALERT_WINDOW:
+            self.yawn_times.popleft()
+        
+        if len(self.yawn_times) >= config.YAWN_ALERT_COUNT:
+            self.yawn_times.clear()
+            return True
+        
+        return False
+    
+    def _update_nod_state(self, head_pitch):
+        """
+        Track the head dropping forward (nodding off).
+        
+        Only a downward change counts (head pitch grows as the nose moves
+        toward the chin). A drop held longer than NOD_MAX_FRAMES is taken as
+        a new posture, e.g. after a seat adjustment, and becomes the baseline
+        instead of keeping the alert latched.
+        
+        Args:
+            head_pitch: Current normalized head pitch
+            
+        Returns:
+            bool: True while the head has been dropped long enough to alert
+        """
+        if self.pitch_baseline is None:
+            self.pitch_baseline = head_pitch
+            return False
+        
+        if head_pitch - self.pitch_baseline > config.NOD_PITCH_THRESHOLD:
+            self.nod_counter += 1
+            
+            if self.nod_counter > config.NOD_MAX_FRAMES:
+                print("[INFO] Head pitch held - nod baseline moved to the new posture")
+                self.pitch_baseline = head_pitch
+                self.nod_counter = 0
+                return False
+            
+            if self.nod_counter == config.NOD_CONSECUTIVE_FRAMES:
+                self.total_nods += 1
             
-            self.frame_counter = 0
-            self.is_drowsy = False
+            return self.nod_counter >= config.NOD_CONSECUTIVE_FRAMES
         
+        # Head in its normal position or raised - follow slow posture changes
+        self.nod_counter = 0
+        self.pitch_baseline += config.NOD_BASELINE_ALPHA * (head_pitch - self.pitch_baseline)
         return False
     
     def _add_to_history(self, ear_value):
@@ -119,6 +237,9 @@ class DrowsinessDetector:
             'total_events': self.total_drowsy_events,
             'ear_threshold': self.ear_threshold,
             'frames_threshold': self.consecutive_frames_threshold,
+            'alert_reasons': list(self.alert_reasons),
+            'total_yawns': self.total_yawns,
+            'total_nods': self.total_nods,
             'progress': min(100, (self.frame_counter / self.consecutive_frames_threshold) * 100)
         }
     
@@ -149,12 +270,19 @@ class DrowsinessDetector:
         self.frame_counter = 0
         self.is_drowsy = False
         self.last_alert_time = 0
+        self.alert_reasons = []
+        self.yawn_counter = 0
+        self.nod_counter = 0
+        self.pitch_baseline = None
         print("[INFO] Drowsiness detector reset")
     
     def reset_statistics(self):
         """Reset all statistics and history."""
         self.reset()
         self.total_drowsy_events = 0
+        self.total_yawns = 0
+        self.total_nods = 0
+        self.yawn_times.clear()
         self.ear_history = []
         print("[INFO] All statistics reset")
     
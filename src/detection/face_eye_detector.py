@@ -8,6 +8,8 @@ import mediapipe as mp
 import numpy as np
 from scipy.spatial import distance as dist
 import config
+from src.detection.feature_extractor import FeatureExtractor
+from src.detection.low_light import LowLightEnhancer
 
 
 class FaceEyeDetector:
@@ -16,12 +18,22 @@ class FaceEyeDetector:
     Uses MediaPipe's Face Mesh for 468-point facial landmark detection.
     """
     
-    def __init__(self):
-        """Initialize the face and eye detector with MediaPipe."""
+    def __init__(self, static_image_mode=False, enable_low_light=None, max_num_faces=None):
+        """
+        Initialize the face and eye detector with MediaPipe.
+        
+        Args:
+            static_image_mode: Detect the face on every frame instead of tracking
+                               it from the previous one (for detectors shared by
+                               several streams)
+            enable_low_light: Override config.ENABLE_LOW_LIGHT_ENHANCEMENT
+            max_num_faces: Faces to detect (default config.MAX_NUM_FACES)
+        """
         # Initialize MediaPipe Face Mesh
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
+            static_image_mode=static_image_mode,
+            max_num_faces=max_num_faces or config.MAX_NUM_FACES,
             refine_landmarks=True,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
@@ -35,6 +47,14 @@ class FaceEyeDetector:
         # Right eye indices (6 points)
         self.RIGHT_EYE = [33, 160, 158, 133, 153, 144]
         
+        # Vectorized EAR / yawn / head pitch features
+        self.feature_extractor = FeatureExtractor()
+        
+        # Optional brightening of dark face regions before inference
+        if enable_low_light is None:
+            enable_low_light = config.ENABLE_LOW_LIGHT_ENHANCEMENT
+        self.low_light_enhancer = LowLightEnhancer() if enable_low_light else None
+        
         print(f"[INFO] MediaPipe Face Mesh initialized successfully")
     
     def detect_faces(self, frame):
@@ -85,6 +105,28 @@ class FaceEyeDetector:
         
         return np.array(landmarks)
     
+    def get_all_facial_landmarks(self, frame, face_results):
+        """
+        Get facial landmarks for every detected face in one conversion.
+        
+        Args:
+            frame: Input image frame (BGR format)
+            face_results: MediaPipe face mesh results
+            
+        Returns:
+            numpy.ndarray: Array of shape (faces, points, 2) with (x, y) pixel coordinates
+        """
+        if not face_results or not face_results.multi_face_landmarks:
+            return np.empty((0, 0, 2), dtype=int)
+        
+        h, w = frame.shape[:2]
+        normalized = np.array([
+            [(landmark.x, landmark.y) for landmark in face_landmarks.landmark]
+            for face_landmarks in face_results.multi_face_landmarks
+        ])
+        
+        return (normalized * (w, h)).astype(int)
+    
     def calculate_ear(self, eye_landmarks):
         """
         Calculate Eye Aspect Ratio (EAR) for a single eye.
@@ -155,6 +197,68 @@ class FaceEyeDetector:
         # Return average EAR
         return (left_ear + right_ear) / 2.0
     
+    def analyze_frame(self, frame):
+        """
+        Run face mesh inference on a frame and extract fatigue features.
+        
+        Args:
+            frame: Input image frame (BGR format)
+            
+        Returns:
+            tuple: (landmarks, features) - both None if no face was found.
+                   features holds left_ear, right_ear, ear, mar and head_pitch
+        """
+        if self.low_light_enhancer is not None:
+            frame = self.low_light_enhancer.enhance(frame)
+        
+        faces = self.detect_faces(frame)
+        landmarks = self.get_facial_landmarks(frame, faces[0]) if faces else None
+        
+        if self.low_light_enhancer is not None:
+            self.low_light_enhancer.update_region(landmarks, frame.shape)
+        
+        if landmarks is None:
+            return None, None
+        
+        return landmarks, self.extract_features(landmarks)
+    
+    def analyze_faces(self, frame):
+        """
+        Run face mesh inference and extract fatigue features for every face.
+        
+        Features for all faces are computed in one vectorized batch.
+        
+        Args:
+            frame: Input image frame (BGR format)
+            
+        Returns:
+            tuple: (landmarks, features) - an array of shape (faces, points, 2)
+                   and a list with one feature dict per face
+        """
+        if self.low_light_enhancer is not None:
+            frame = self.low_light_enhancer.enhance(frame)
+        
+        faces = self.detect_faces(frame)
+        landmarks = self.get_all_facial_landmarks(frame, faces[0] if faces else None)
+        
+        if self.low_light_enhancer is not None:
+            self.low_light_enhancer.update_region(landmarks[0] if len(landmarks) else None, frame.shape)
+        
+        return landmarks, self.feature_extractor.extract_batch(landmarks)
+    
+    def extract_features(self, landmarks):
+        """
+        Compute per-eye EAR, mouth aspect ratio and head pitch in one pass.
+        
+        Args:
+            landmarks: Full MediaPipe facial landmarks
+            
+        Returns:
+            dict: Feature values (see FeatureExtractor.extract)
+            None: If landmarks are not available
+        """
+        return self.feature_extractor.extract(landmarks)
+    
     def draw_face_rectangle(self, frame, landmarks, color=config.COLOR_GREEN, thickness=2):
         """
         Draw a rectangle around the detected face.
@@ -228,6 +332,11 @@ class FaceEyeDetector:
     
     def cleanup(self):
         """Release MediaPipe resources."""
+        if self.low_light_enhancer is not None:
+            stats = self.low_light_enhancer.get_statistics()
+            print(f"[INFO] Low-light enhancement ({stats['method']}): {stats['enhanced']}/{stats['checked']} frames, "
+                  f"{stats['enhance_ms']:.2f} ms/frame")
+        
         if hasattr(self, 'face_mesh'):
             self.face_mesh.close()
             print("[INFO] MediaPipe Face Mesh resources released")
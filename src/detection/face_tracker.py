@@ -0,0 +1,220 @@
+"""
+Face Tracker Module
+Keeps stable track IDs for every face in view, runs a drowsiness detector
+per occupant and picks the face in the driver's seat
+"""
+
+import numpy as np
+import config
+from src.detection.drowsiness_detector import DrowsinessDetector
+from src.detection.feature_extractor import FeatureExtractor
+
+
+class FaceTrack:
+    """One tracked face."""
+
+    def __init__(self, track_id, position, face_width):
+        """
+        Start a track.
+
+        Args:
+            track_id: Stable identifier
+            position: (x, y) nose tip position in pixels
+            face_width: Width between the outer eye corners in pixels
+        """
+        self.track_id = track_id
+        self.position = position
+        self.face_width = face_width
+        self.missed = 0
+        self.landmarks = None
+        self.features = None
+        self.detector = None
+
+
+class FaceTracker:
+    """
+    Associates faces across frames and selects the driver.
+
+    Faces are matched to tracks by nose tip distance measured in face widths,
+    computed for all track/face pairs at once and assigned greedily from the
+    closest pair. A track survives FACE_TRACK_MAX_MISSED frames without a
+    match, so a face briefly lost keeps its ID.
+
+    The driver is the tracked face whose nose tip lies inside
+    DRIVER_SEAT_REGION; the current driver keeps the seat while it stays in
+    the region, otherwise the largest (closest) face there takes it. The
+    driver is monitored by the caller's main DrowsinessDetector, which is
+    reset when a different face takes the seat. Every other occupant gets
+    its own DrowsinessDetector.
+    """
+
+    def __init__(self, driver_region=None, max_distance=None, max_missed=None):
+        """
+        Initialize the tracker.
+
+        Args:
+            driver_region: Normalized (x0, y0, x1, y1) driver seat region
+            max_distance: Largest match distance in face widths
+            max_missed: Frames a track is kept without a matching face
+        """
+        self.driver_region = driver_region or config.DRIVER_SEAT_REGION
+        self.max_distance = max_distance or config.FACE_TRACK_MAX_DISTANCE
+        self.max_missed = config.FACE_TRACK_MAX_MISSED if max_missed is None else max_missed
+
+        self.tracks = []
+        self.next_track_id = 1
+        self.driver_id = None
+
+        # Nose tip and outer eye corners, for positions and scale
+        self.nose_index = FeatureExtractor.NOSE_TIP
+        self.corner_indices = [FeatureExtractor.LEFT_EYE[3], FeatureExtractor.RIGHT_EYE[0]]
+
+        # Statistics
+        self.tracks_started = 0
+        self.driver_changes = 0
+
+    def update(self, landmarks, features, frame_shape):
+        """
+        Track the faces of one frame and select the driver.
+
+        Args:
+            landmarks: Array of shape (faces, points, 2) from FaceEyeDetector.analyze_faces
+            features: Feature dicts, one per face
+            frame_shape: Shape of the frame
+
+        Returns:
+            tuple: (driver landmarks, driver features, driver changed) -
+                   landmarks and features are None if the seat is empty
+        """
+        matched = self._associate(landmarks, features)
+
+        for track in self.tracks:
+            if track not in matched:
+                track.missed += 1
+                track.landmarks = track.features = None
+        self.tracks = [track for track in self.tracks if track.missed <= self.max_missed]
+
+        driver = self._select_driver(matched, frame_shape)
+        changed = driver is not None and driver.track_id != self.driver_id
+        if changed:
+            if self.driver_id is not None:
+                self.driver_changes += 1
+            self.driver_id = driver.track_id
+            driver.detector = None
+
+        # Passenger drowsiness, one detector per occupant
+        for track in matched:
+            if track is driver:
+                continue
+            if track.detector is None:
+                track.detector = DrowsinessDetector()
+            track.detector.update(track.features['ear'], track.features)
+
+        if driver is None:
+            return None, None, False
+        return driver.landmarks, driver.features, changed
+
+    def _associate(self, landmarks, features):
+        """
+        Match faces to tracks, starting tracks for unmatched faces.
+
+        Returns:
+            list: Tracks matched or started this frame
+        """
+        if len(landmarks) == 0:
+            return []
+
+        landmarks = np.asarray(landmarks)
+        positions = landmarks[:, self.nose_index].astype(np.float64)
+        corners = landmarks[:, self.corner_indices].astype(np.float64)
+        widths = np.maximum(np.linalg.norm(corners[:, 0] - corners[:, 1], axis=1), 1.0)
+
+        assigned = [None] * len(landmarks)
+
+        if self.tracks:
+            track_positions = np.array([track.position for track in self.tracks])
+            track_widths = np.array([track.face_width for track in self.tracks])
+
+            # Distance of every track to every face, in the track's face widths
+            cost = np.linalg.norm(track_positions[:, None, :] - positions[None, :, :], axis=2) / track_widths[:, None]
+
+            used_tracks = set()
+            for flat_index in np.argsort(cost, axis=None):
+                track_index, face_index = divmod(int(flat_index), cost.shape[1])
+                if cost[track_index, face_index] > self.max_distance:
+                    break
+                if track_index in used_tracks or assigned[face_index] is not None:
+                    continue
+                used_tracks.add(track_index)
+                assigned[face_index] = self.tracks[track_index]
+
+        matched = []
+        for face_index, track in enumerate(assigned):
+            if track is None:
+                track = FaceTrack(self.next_track_id, positions[face_index], widths[face_index])
+                self.next_track_id += 1
+                self.tracks_started += 1
+                self.tracks.append(track)
+
+            track.position = positions[face_index]
+            track.face_width = widths[face_index]
+            track.missed = 0
+            track.landmarks = landmarks[face_index]
+            track.features = features[face_index]
+            matched.append(track)
+
+        return matched
+
+    def _select_driver(self, matched, frame_shape):
+        """Pick the driver among the faces matched this frame."""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = self.driver_region
+
+        in_seat = [
+            track for track in matched
+            if x0 <= track.position[0] / width <= x1 and y0 <= track.position[1] / height <= y1
+        ]
+        if not in_seat:
+            return None
+
+        for track in in_seat:
+            if track.track_id == self.driver_id:
+                return track
+
+        return max(in_seat, key=lambda track: track.face_width)
+
+    def get_occupants(self):
+        """
+        Get the currently visible occupants.
+
+        Returns:
+            list: Dicts with track_id, is_driver, ear and is_drowsy (None for the driver)
+        """
+        return [
+            {
+                'track_id': track.track_id,
+                'is_driver': track.track_id == self.driver_id,
+                'ear': track.features['ear'],
+                'is_drowsy': track.detector.is_drowsy if track.detector is not None else None
+            }
+            for track in self.tracks if track.features is not None
+        ]
+
+    def get_statistics(self):
+        """
+        Get tracking statistics.
+
+        Returns:
+            dict: Active and started tracks, driver ID and driver changes
+        """
+        return {
+            'tracks': len(self.tracks),
+            'started': self.tracks_started,
+            'driver_id': self.driver_id,
+            'driver_changes': self.driver_changes
+        }
+
+    def reset(self):
+        """Forget all tracks."""
+        self.tracks = []
+        self.driver_id = None
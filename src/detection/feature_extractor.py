@@ -0,0 +1,130 @@
+"""
+Facial Feature Extraction Module
+Derives per-eye EAR, mouth aspect ratio (yawning) and head pitch (nodding)
+from a single vectorized gather over the face mesh landmark array
+"""
+
+import numpy as np
+
+
+class FeatureExtractor:
+    """
+    Computes all fatigue signals from one landmark gather and one batched
+    distance computation.
+
+    Every landmark any feature needs is gathered once into a small array,
+    then every distance is computed in one vectorized call. Per-feature work
+    is a handful of scalar divisions on that distance vector.
+    """
+
+    # MediaPipe indices, in the order p1..p6 used by the EAR formula
+    LEFT_EYE = [362, 385, 387, 263, 373, 380]
+    RIGHT_EYE = [33, 160, 158, 133, 153, 144]
+
+    # Mouth: left/right corners, then three upper/lower inner-lip pairs
+    MOUTH = [61, 291, 81, 178, 13, 14, 311, 402]
+
+    # Head pitch reference points: nose tip and chin
+    NOSE_TIP = 1
+    CHIN = 152
+
+    def __init__(self):
+        """Build the gather index and the distance pair tables."""
+        self.gather_indices = np.array(
+            self.LEFT_EYE + self.RIGHT_EYE + self.MOUTH + [self.NOSE_TIP, self.CHIN],
+            dtype=np.intp
+        )
+
+        # Positions inside the gathered array
+        left, right, mouth = 0, 6, 12
+        self.nose_position = 20
+        self.chin_position = 21
+
+        # Distance pairs (positions in the gathered array):
+        #   0-5   left eye   v1, v2, h   /  right eye v1, v2, h
+        #   6-9   mouth      v1, v2, v3, h
+        pairs = []
+        for base in (left, right):
+            pairs += [(base + 1, base + 5), (base + 2, base + 4), (base + 0, base + 3)]
+        pairs += [(mouth + 2, mouth + 3), (mouth + 4, mouth + 5), (mouth + 6, mouth + 7), (mouth + 0, mouth + 1)]
+
+        self.pair_a = np.array([a for a, _ in pairs], dtype=np.intp)
+        self.pair_b = np.array([b for _, b in pairs], dtype=np.intp)
+
+        # Eye corners used for the eye line in the pitch estimate
+        self.eye_corner_positions = np.array([left + 0, left + 3, right + 0, right + 3], dtype=np.intp)
+
+    def extract(self, landmarks):
+        """
+        Compute all fatigue features for one face.
+
+        Head pitch is the nose tip's vertical position between the eye line
+        and the chin (0 = at the eye line, 1 = at the chin). It changes when
+        the head tilts forward or back, and is compared against a running
+        baseline by DrowsinessDetector to detect nods.
+
+        Args:
+            landmarks: Array of (x, y) face mesh landmarks
+
+        Returns:
+            dict: left_ear, right_ear, ear, mar and head_pitch
+            None: If landmarks are not available
+        """
+        if landmarks is None:
+            return None
+
+        points = landmarks[self.gather_indices].astype(np.float64)
+        distances = np.linalg.norm(points[self.pair_a] - points[self.pair_b], axis=1)
+
+        left_ear = (distances[0] + distances[1]) / (2.0 * distances[2])
+        right_ear = (distances[3] + distances[4]) / (2.0 * distances[5])
+        mar = (distances[6] + distances[7] + distances[8]) / (3.0 * distances[9])
+
+        eye_line_y = points[self.eye_corner_positions, 1].mean()
+        face_height = points[self.chin_position, 1] - eye_line_y
+        head_pitch = (points[self.nose_position, 1] - eye_line_y) / face_height if face_height > 0 else 0.0
+
+        return {
+            'left_ear': float(left_ear),
+            'right_ear': float(right_ear),
+            'ear': float((left_ear + right_ear) / 2.0),
+            'mar': float(mar),
+            'head_pitch': float(head_pitch)
+        }
+
+    def extract_batch(self, landmarks):
+        """
+        Compute fatigue features for several faces in one vectorized pass.
+
+        Args:
+            landmarks: Array of shape (faces, points, 2), or a list of
+                       per-face landmark arrays
+
+        Returns:
+            list: One feature dict per face (see extract)
+        """
+        if len(landmarks) == 0:
+            return []
+
+        points = np.asarray(landmarks)[:, self.gather_indices].astype(np.float64)
+        distances = np.linalg.norm(points[:, self.pair_a] - points[:, self.pair_b], axis=2)
+
+        left_ear = (distances[:, 0] + distances[:, 1]) / (2.0 * distances[:, 2])
+        right_ear = (distances[:, 3] + distances[:, 4]) / (2.0 * distances[:, 5])
+        mar = (distances[:, 6] + distances[:, 7] + distances[:, 8]) / (3.0 * distances[:, 9])
+
+        eye_line_y = points[:, self.eye_corner_positions, 1].mean(axis=1)
+        face_height = points[:, self.chin_position, 1] - eye_line_y
+        nose_offset = points[:, self.nose_position, 1] - eye_line_y
+        head_pitch = np.divide(nose_offset, face_height, out=np.zeros_like(nose_offset), where=face_height > 0)
+
+        return [
+            {
+                'left_ear': float(left),
+                'right_ear': float(right),
+                'ear': float((left + right) / 2.0),
+                'mar': float(mouth),
+                'head_pitch': float(pitch)
+            }
+            for left, right, mouth, pitch in zip(left_ear, right_ear, mar, head_pitch)
+        ]
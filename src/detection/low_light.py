@@ -0,0 +1,161 @@
+"""
+Low-Light Enhancement Module
+Brightens the face region with precomputed gamma lookup tables or CLAHE when
+brightness statistics show the frame is too dark for reliable face tracking
+"""
+
+import time
+import cv2
+import numpy as np
+import config
+
+
+class LowLightEnhancer:
+    """
+    Conditional low-light preprocessing for face mesh inference.
+
+    Brightness is measured on a subsampled view of the last known face region
+    (or the whole frame when no face has been seen recently). Only when it is
+    below LOW_LIGHT_THRESHOLD is the region corrected, on a copy of the frame:
+
+    - "gamma": one cv2.LUT pass with a table precomputed at startup for the
+      measured brightness bucket
+    - "clahe": CLAHE on the luma channel of the region only
+
+    Bright frames pass through untouched, at the cost of one subsampled mean.
+    """
+
+    # Gamma tables are precomputed for these brightness bucket upper bounds
+    BRIGHTNESS_BUCKETS = (20, 35, 50, 65, 80)
+
+    def __init__(self, method=None, threshold=None, roi_padding=None):
+        """
+        Initialize the enhancer.
+
+        Args:
+            method: "gamma" or "clahe" (default config.LOW_LIGHT_METHOD)
+            threshold: Mean gray level (0-255) below which to enhance
+            roi_padding: Fraction of the face size added around the face box
+        """
+        self.method = method or config.LOW_LIGHT_METHOD
+        self.threshold = config.LOW_LIGHT_THRESHOLD if threshold is None else threshold
+        self.roi_padding = config.LOW_LIGHT_ROI_PADDING if roi_padding is None else roi_padding
+        self.target_brightness = config.LOW_LIGHT_TARGET
+
+        # One lookup table per brightness bucket, built once
+        self.gamma_luts = [self._build_gamma_lut(bound) for bound in self.BRIGHTNESS_BUCKETS]
+        self.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(4, 4))
+
+        # Face region from the last frame that had landmarks
+        self.face_box = None
+        self.frames_since_face = 0
+
+        # Statistics
+        self.frames_checked = 0
+        self.frames_enhanced = 0
+        self.enhance_time = 0.0
+
+    def _build_gamma_lut(self, brightness):
+        """
+        Build a gamma table mapping a brightness level to the target level.
+
+        Args:
+            brightness: Representative mean gray level of the bucket
+
+        Returns:
+            numpy.ndarray: 256-entry uint8 lookup table
+        """
+        source = max(brightness, 1) / 255.0
+        target = self.target_brightness / 255.0
+        gamma = np.log(target) / np.log(source)
+
+        levels = np.arange(256, dtype=np.float64) / 255.0
+        return np.clip((levels ** gamma) * 255.0, 0, 255).astype(np.uint8)
+
+    def enhance(self, frame):
+        """
+        Enhance the face region of a dark frame.
+
+        Args:
+            frame: BGR frame
+
+        Returns:
+            numpy.ndarray: The original frame if bright enough, else an
+                           enhanced copy
+        """
+        self.frames_checked += 1
+        x0, y0, x1, y1 = self._current_region(frame.shape)
+
+        # Subsampled green channel is a cheap brightness proxy
+        brightness = frame[y0:y1:4, x0:x1:4, 1].mean()
+        if brightness >= self.threshold:
+            return frame
+
+        start_time = time.perf_counter()
+        enhanced = frame.copy()
+        region = enhanced[y0:y1, x0:x1]
+
+        if self.method == "clahe":
+            ycrcb = cv2.cvtColor(region, cv2.COLOR_BGR2YCrCb)
+            ycrcb[:, :, 0] = self.clahe.apply(ycrcb[:, :, 0])
+            region[:] = cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+        else:
+            bucket = np.searchsorted(self.BRIGHTNESS_BUCKETS, brightness)
+            bucket = min(bucket, len(self.gamma_luts) - 1)
+            cv2.LUT(region, self.gamma_luts[bucket], dst=region)
+
+        self.frames_enhanced += 1
+        self.enhance_time += time.perf_counter() - start_time
+        return enhanced
+
+    def update_region(self, landmarks, frame_shape):
+        """
+        Track the face region for the next frame.
+
+        Args:
+            landmarks: Landmarks found in the current frame (None if lost)
+            frame_shape: Shape of the frame
+        """
+        if landmarks is None:
+            self.frames_since_face += 1
+            if self.frames_since_face > config.LOW_LIGHT_ROI_HOLD_FRAMES:
+                self.face_box = None
+            return
+
+        self.frames_since_face = 0
+        height, width = frame_shape[:2]
+        x_min, y_min = landmarks.min(axis=0)
+        x_max, y_max = landmarks.max(axis=0)
+        pad_x = int((x_max - x_min) * self.roi_padding)
+        pad_y = int((y_max - y_min) * self.roi_padding)
+
+        self.face_box = (
+            max(0, int(x_min) - pad_x),
+            max(0, int(y_min) - pad_y),
+            min(width, int(x_max) + pad_x),
+            min(height, int(y_max) + pad_y)
+        )
+
+    def _current_region(self, frame_shape):
+        """Region to measure and enhance: the tracked face box or the full frame."""
+        if self.face_box is not None:
+            x0, y0, x1, y1 = self.face_box
+            if x1 - x0 >= 8 and y1 - y0 >= 8:
+                return self.face_box
+
+        height, width = frame_shape[:2]
+        return 0, 0, width, height
+
+    def get_statistics(self):
+        """
+        Get enhancement statistics.
+
+        Returns:
+            dict: Frames checked / enhanced and average enhancement cost (ms)
+        """
+        return {
+            'method': self.method,
+            'checked': self.frames_checked,
+            'enhanced': self.frames_enhanced,
+            'enhance_ms': (self.enhance_time / self.frames_enhanced * 1000.0) if self.frames_enhanced else 0.0
+        }
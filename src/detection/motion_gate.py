@@ -0,0 +1,167 @@
+"""
+Motion Gate Module
+Skips face mesh inference when the eye regions have not changed since the
+last inferred frame, reusing the previous landmarks and features
+"""
+
+import cv2
+import numpy as np
+import config
+
+
+class MotionGate:
+    """
+    Cheap change detector on downscaled grayscale eye-region ROIs.
+
+    After every real inference the two eye regions (taken from the new
+    landmarks) are cropped, downscaled and stored as references. For later
+    frames the same regions are compared with the references by mean absolute
+    difference. If neither eye changed beyond the threshold, the previous
+    result is reused. Eyelid movement changes the eye ROI strongly, so blinks
+    still trigger inference immediately; the reuse count is capped so results
+    never get more than a few frames stale.
+    """
+
+    def __init__(self, threshold=None, max_reuse=None, roi_size=None):
+        """
+        Initialize the motion gate.
+
+        Args:
+            threshold: Mean absolute gray-level difference that counts as motion
+            max_reuse: Maximum consecutive frames a result may be reused
+            roi_size: (width, height) each eye ROI is downscaled to
+        """
+        self.threshold = config.MOTION_GATE_THRESHOLD if threshold is None else threshold
+        self.max_reuse = config.MOTION_GATE_MAX_REUSE if max_reuse is None else max_reuse
+        self.roi_size = tuple(roi_size or config.MOTION_GATE_ROI_SIZE)
+
+        # MediaPipe eye landmark indices (same as FaceEyeDetector)
+        self.eye_indices = [
+            np.array([362, 385, 387, 263, 373, 380], dtype=np.intp),
+            np.array([33, 160, 158, 133, 153, 144], dtype=np.intp)
+        ]
+
+        # Reference state from the last real inference
+        self.frame_shape = None
+        self.eye_boxes = None
+        self.reference_rois = None
+        self.cached_result = None
+        self.reuse_count = 0
+
+        # Statistics
+        self.frames_inferred = 0
+        self.frames_reused = 0
+
+    def lookup(self, frame):
+        """
+        Check whether the previous result can be reused for this frame.
+
+        Args:
+            frame: Current BGR frame
+
+        Returns:
+            tuple: Cached (landmarks, features) if reusable
+            None: If inference must run
+        """
+        if self.reference_rois is None or self.reuse_count >= self.max_reuse:
+            return None
+
+        if frame.shape[:2] != self.frame_shape:
+            return None
+
+        rois = self._extract_rois(frame)
+
+        for roi, reference in zip(rois, self.reference_rois):
+            if cv2.absdiff(roi, reference).mean() > self.threshold:
+                return None
+
+        self.reuse_count += 1
+        self.frames_reused += 1
+        return self.cached_result
+
+    def update(self, frame, landmarks, features):
+        """
+        Store the result of a real inference as the new reference.
+
+        Args:
+            frame: BGR frame the inference ran on
+            landmarks: Landmarks found (None if no face)
+            features: Features computed (None if no face)
+        """
+        self.frames_inferred += 1
+        self.reuse_count = 0
+
+        if landmarks is None:
+            # Never reuse "no face" - a face may appear at any time
+            self.reference_rois = None
+            self.cached_result = None
+            return
+
+        self.frame_shape = frame.shape[:2]
+        self.eye_boxes = [self._eye_box(landmarks[indices]) for indices in self.eye_indices]
+        self.reference_rois = self._extract_rois(frame)
+        self.cached_result = (landmarks, features)
+
+    def _eye_box(self, eye_points):
+        """
+        Padded bounding box around one eye, clipped to the frame.
+
+        Args:
+            eye_points: (6, 2) eye landmark coordinates
+
+        Returns:
+            tuple: (x0, y0, x1, y1)
+        """
+        x0, y0 = eye_points.min(axis=0)
+        x1, y1 = eye_points.max(axis=0)
+
+        # Pad vertically more than horizontally so the lids stay inside
+        pad_x = max(2, int((x1 - x0) * 0.2))
+        pad_y = max(4, int((x1 - x0) * 0.4))
+
+        height, width = self.frame_shape
+        return (
+            max(0, int(x0) - pad_x),
+            max(0, int(y0) - pad_y),
+            min(width, int(x1) + pad_x + 1),
+            min(height, int(y1) + pad_y + 1)
+        )
+
+    def _extract_rois(self, frame):
+        """
+        Crop, grayscale and downscale both eye regions.
+
+        Args:
+            frame: BGR frame
+
+        Returns:
+            list: Two small uint8 grayscale arrays
+        """
+        rois = []
+        for x0, y0, x1, y1 in self.eye_boxes:
+            crop = frame[y0:y1, x0:x1]
+            if crop.size == 0:
+                crop = frame[:1, :1]
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            rois.append(cv2.resize(gray, self.roi_size, interpolation=cv2.INTER_AREA))
+        return rois
+
+    def get_statistics(self):
+        """
+        Get gating statistics.
+
+        Returns:
+            dict: Inferred and reused frame counts and the skip ratio
+        """
+        total = self.frames_inferred + self.frames_reused
+        return {
+            'inferred': self.frames_inferred,
+            'reused': self.frames_reused,
+            'skip_ratio': self.frames_reused / total if total else 0.0
+        }
+
+    def reset(self):
+        """Drop the cached result so the next frame runs inference."""
+        self.reference_rois = None
+        self.cached_result = None
+        self.reuse_count = 0
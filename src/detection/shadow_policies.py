@@ -0,0 +1,197 @@
+"""
+Shadow Policy Module
+Runs candidate drowsiness policies alongside the active detector on the same
+EAR stream and logs where and when their decisions diverge
+"""
+
+import json
+import os
+import time
+import config
+from src.detection.drowsiness_detector import DrowsinessDetector
+
+
+class ShadowPolicyEvaluator:
+    """
+    Evaluates shadow DrowsinessDetector instances against the primary one.
+
+    Shadows never drive alerts. Each shadow only runs its own closed-eye
+    counter: EAR history and the yawn/nod criteria (which do not depend on
+    the policy thresholds) are shared with the primary. A shadow that is
+    idle and sees open eyes is skipped without any work, which is the
+    common case, so the evaluator costs a few comparisons per frame.
+
+    Each divergence is written as one JSON line when the policies agree
+    again: which side was drowsy, for how long, and whether the episode
+    ended with both drowsy (an onset timing difference) or both alert (an
+    extra or missed detection).
+    """
+
+    def __init__(self, primary, policies=None, log_path=None):
+        """
+        Initialize the evaluator.
+
+        Args:
+            primary: The DrowsinessDetector that drives alerts
+            policies: List of dicts with 'name', 'ear_threshold' and
+                      'consecutive_frames' (default config.SHADOW_POLICIES)
+            log_path: Divergence log file (default config.SHADOW_LOG_PATH)
+        """
+        self.primary = primary
+        self.shadows = []
+
+        for policy in (config.SHADOW_POLICIES if policies is None else policies):
+            detector = DrowsinessDetector(policy.get('ear_threshold'), policy.get('consecutive_frames'))
+            detector.ear_history = primary.ear_history
+            self.shadows.append(_Shadow(policy['name'], detector))
+
+        log_path = log_path or config.SHADOW_LOG_PATH
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        self.log_file = open(log_path, 'a', buffering=64 * 1024)
+
+        # Statistics
+        self.frames = 0
+        self.evaluations = 0
+        self.processing_time = 0.0
+
+        print(f"[INFO] Shadow policies: {', '.join(shadow.name for shadow in self.shadows)} -> {log_path}")
+
+    def update(self, ear_value, eyes_closed=None, timestamp=None):
+        """
+        Feed one frame to every shadow policy, after the primary has seen it.
+
+        Args:
+            ear_value: EAR the primary detector was updated with
+            eyes_closed: The primary's upstream closed-eye decision, if any;
+                         only used by shadows sharing the primary's threshold
+            timestamp: Capture timestamp (default now)
+        """
+        start_time = time.perf_counter()
+        self.frames += 1
+
+        primary = self.primary
+        primary_drowsy = primary.is_drowsy
+        other_reasons = None
+
+        for shadow in self.shadows:
+            detector = shadow.detector
+            threshold = detector.ear_threshold
+
+            if eyes_closed is not None and threshold == primary.ear_threshold:
+                closed = eyes_closed
+            else:
+                closed = ear_value < threshold
+
+            # Lazy path: an idle shadow that sees open eyes stays idle and, with
+            # the primary alert too, agrees with it
+            if not closed and not primary_drowsy and detector.frame_counter == 0 and not detector.is_drowsy:
+                if shadow.diverged_since is not None:
+                    self._close_divergence(shadow, primary_drowsy, timestamp)
+                continue
+
+            self.evaluations += 1
+            detector.frame_counter = detector.frame_counter + 1 if closed else 0
+
+            if other_reasons is None:
+                other_reasons = [reason for reason in primary.alert_reasons if reason != 'eyes_closed']
+
+            reasons = list(other_reasons)
+            if detector.frame_counter >= detector.consecutive_frames_threshold:
+                reasons.insert(0, 'eyes_closed')
+
+            if reasons and not detector.is_drowsy:
+                detector.total_drowsy_events += 1
+            detector.is_drowsy = bool(reasons)
+            detector.alert_reasons = reasons
+
+            # Track disagreement episodes with the primary
+            if detector.is_drowsy != primary_drowsy:
+                if shadow.diverged_since is None:
+                    shadow.diverged_since = timestamp if timestamp is not None else time.monotonic()
+                    shadow.drowsy_side = 'shadow' if detector.is_drowsy else 'primary'
+            elif shadow.diverged_since is not None:
+                self._close_divergence(shadow, primary_drowsy, timestamp)
+
+        self.processing_time += time.perf_counter() - start_time
+
+    def _close_divergence(self, shadow, both_drowsy, timestamp):
+        """Log a finished disagreement episode."""
+        now = timestamp if timestamp is not None else time.monotonic()
+        duration = now - shadow.diverged_since
+
+        shadow.divergences += 1
+        shadow.divergent_time += duration
+
+        self.log_file.write(json.dumps({
+            't': round(time.time(), 3),
+            'policy': shadow.name,
+            'drowsy': shadow.drowsy_side,
+            'dur': round(duration, 3),
+            'end': 'drowsy' if both_drowsy else 'alert'
+        }, separators=(',', ':')) + '\n')
+
+        shadow.diverged_since = None
+        shadow.drowsy_side = None
+
+    def get_statistics(self):
+        """
+        Get shadow evaluation statistics.
+
+        Returns:
+            dict: Per-policy events and divergences, and per-frame cost (us)
+        """
+        return {
+            'processing_us': (self.processing_time / self.frames * 1e6) if self.frames else 0.0,
+            'lazy_ratio': 1.0 - self.evaluations / (self.frames * len(self.shadows)) if self.frames and self.shadows else 0.0,
+            'primary_events': self.primary.total_drowsy_events,
+            'policies': {
+                shadow.name: {
+                    'events': shadow.detector.total_drowsy_events,
+                    'divergences': shadow.divergences,
+                    'divergent_s': shadow.divergent_time
+                }
+                for shadow in self.shadows
+            }
+        }
+
+    def reset(self):
+        """Reset shadow detector state along with the primary."""
+        for shadow in self.shadows:
+            shadow.detector.frame_counter = 0
+            shadow.detector.is_drowsy = False
+            shadow.detector.alert_reasons = []
+            shadow.diverged_since = None
+            shadow.drowsy_side = None
+
+    def reset_statistics(self):
+        """Reset state and statistics, after the primary's reset_statistics()."""
+        self.reset()
+        for shadow in self.shadows:
+            shadow.detector.total_drowsy_events = 0
+            shadow.detector.ear_history = self.primary.ear_history
+            shadow.divergences = 0
+            shadow.divergent_time = 0.0
+
+        self.frames = 0
+        self.evaluations = 0
+        self.processing_time = 0.0
+
+    def close(self):
+        """Flush and close the divergence log."""
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+
+class _Shadow:
+    """One shadow policy and its divergence tracking state."""
+
+    __slots__ = ('name', 'detector', 'diverged_since', 'drowsy_side', 'divergences', 'divergent_time')
+
+    def __init__(self, name, detector):
+        self.name = name
+        self.detector = detector
+        self.diverged_since = None
+        self.drowsy_side = None
+        self.divergences = 0
+        self.divergent_time = 0.0
@@ -0,0 +1,253 @@
+"""
+EAR Signal Conditioning Module
+Smooths the per-frame EAR signal, applies hysteresis to the open/closed
+decision and bridges brief landmark dropouts before the drowsiness state
+machine sees them
+"""
+
+import math
+import time
+import config
+
+
+class EMAFilter:
+    """Exponential moving average with a fixed smoothing factor."""
+
+    def __init__(self, alpha):
+        """
+        Initialize the filter.
+
+        Args:
+            alpha: Weight of the newest sample (0-1, higher = less smoothing)
+        """
+        self.alpha = alpha
+        self.value = None
+
+    def filter(self, value, timestamp):
+        """
+        Filter one sample.
+
+        Args:
+            value: New sample
+            timestamp: Sample time in seconds (unused, kept for a common interface)
+
+        Returns:
+            tuple: (filtered value, alpha applied to this sample)
+        """
+        if self.value is None:
+            self.value = value
+            return value, 1.0
+
+        self.value += self.alpha * (value - self.value)
+        return self.value, self.alpha
+
+    def reset(self):
+        """Forget the filter state."""
+        self.value = None
+
+
+class OneEuroFilter:
+    """
+    One Euro filter (Casiez et al., 2012).
+
+    An adaptive low-pass filter: heavy smoothing while the signal is steady,
+    light smoothing while it moves fast, so blinks and closures stay sharp.
+    """
+
+    def __init__(self, min_cutoff, beta, d_cutoff):
+        """
+        Initialize the filter.
+
+        Args:
+            min_cutoff: Minimum cutoff frequency in Hz
+            beta: Speed coefficient (higher = less lag on fast changes)
+            d_cutoff: Cutoff frequency for the derivative in Hz
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    @staticmethod
+    def _alpha(cutoff, interval):
+        """Smoothing factor for a cutoff frequency at a sample interval."""
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / interval)
+
+    def filter(self, value, timestamp):
+        """
+        Filter one sample.
+
+        Args:
+            value: New sample
+            timestamp: Sample time in seconds
+
+        Returns:
+            tuple: (filtered value, alpha applied to this sample)
+        """
+        if self.value is None:
+            self.value = value
+            self.last_timestamp = timestamp
+            return value, 1.0
+
+        interval = max(timestamp - self.last_timestamp, 1e-3)
+        self.last_timestamp = timestamp
+
+        derivative = (value - self.value) / interval
+        d_alpha = self._alpha(self.d_cutoff, interval)
+        self.derivative += d_alpha * (derivative - self.derivative)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        alpha = self._alpha(cutoff, interval)
+        self.value += alpha * (value - self.value)
+
+        return self.value, alpha
+
+    def reset(self):
+        """Forget the filter state."""
+        self.value = None
+        self.derivative = 0.0
+        self.last_timestamp = None
+
+
+class EARSignalConditioner:
+    """
+    Conditions raw EAR values between calculate_average_ear and update.
+
+    - Filtering: EMA or One Euro smoothing removes single-frame noise.
+    - Hysteresis: eyes close below the EAR threshold but only count as open
+      again above threshold + EAR_HYSTERESIS, so noise near the threshold
+      cannot reset the closed-frame counter.
+    - Gap tolerance: for up to EAR_GAP_TOLERANCE seconds without landmarks the
+      last conditioned value and eye state are held instead of dropped.
+
+    The latency this adds is reported by get_statistics().
+    """
+
+    def __init__(self, filter_type=None, hysteresis=None, gap_tolerance=None):
+        """
+        Initialize the conditioner.
+
+        Args:
+            filter_type: "none", "ema" or "one_euro"
+            hysteresis: Extra EAR above the threshold needed to reopen
+            gap_tolerance: Seconds of missing landmarks to bridge
+        """
+        self.filter_type = filter_type or config.EAR_FILTER
+        self.hysteresis = config.EAR_HYSTERESIS if hysteresis is None else hysteresis
+        self.gap_tolerance = config.EAR_GAP_TOLERANCE if gap_tolerance is None else gap_tolerance
+
+        if self.filter_type == "ema":
+            self.filter = EMAFilter(config.EAR_EMA_ALPHA)
+        elif self.filter_type == "one_euro":
+            self.filter = OneEuroFilter(
+                config.EAR_ONE_EURO_MIN_CUTOFF,
+                config.EAR_ONE_EURO_BETA,
+                config.EAR_ONE_EURO_D_CUTOFF
+            )
+        else:
+            self.filter = None
+
+        # Conditioned state
+        self.eyes_closed = False
+        self.last_value = None
+        self.last_sample_time = None
+        self.last_timestamp = None
+
+        # Latency / cost accounting
+        self.filter_lag_sum = 0.0
+        self.filter_lag_count = 0
+        self.processing_time_sum = 0.0
+        self.samples = 0
+        self.gaps_bridged = 0
+
+        print(f"[INFO] EAR signal conditioning: filter={self.filter_type}, "
+              f"hysteresis={self.hysteresis}, gap tolerance={self.gap_tolerance}s")
+
+    def process(self, ear_value, timestamp, ear_threshold):
+        """
+        Condition one EAR sample.
+
+        Args:
+            ear_value: Raw EAR, or None if no landmarks were found
+            timestamp: Frame time in seconds (None uses the monotonic clock)
+            ear_threshold: Current closing threshold of the detector
+
+        Returns:
+            tuple: (conditioned EAR or None, eyes closed decision)
+        """
+        start_time = time.perf_counter()
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        interval = timestamp - self.last_timestamp if self.last_timestamp is not None else 0.0
+        self.last_timestamp = timestamp
+
+        if ear_value is None:
+            result = self._bridge_gap(timestamp)
+        else:
+            value = ear_value
+            if self.filter is not None:
+                value, alpha = self.filter.filter(ear_value, timestamp)
+
+                # First-order low-pass group delay: (1 - alpha) / alpha samples
+                if 0 < alpha < 1 and interval > 0:
+                    self.filter_lag_sum += interval * (1.0 - alpha) / alpha
+                    self.filter_lag_count += 1
+
+            if self.eyes_closed:
+                self.eyes_closed = value < ear_threshold + self.hysteresis
+            else:
+                self.eyes_closed = value < ear_threshold
+
+            self.last_value = value
+            self.last_sample_time = timestamp
+            result = (value, self.eyes_closed)
+
+        self.processing_time_sum += time.perf_counter() - start_time
+        self.samples += 1
+
+        return result
+
+    def _bridge_gap(self, timestamp):
+        """
+        Hold the last state through a short landmark dropout.
+
+        Args:
+            timestamp: Time of the frame without landmarks
+
+        Returns:
+            tuple: (held EAR or None, held eyes closed decision)
+        """
+        if self.last_sample_time is not None and timestamp - self.last_sample_time <= self.gap_tolerance:
+            self.gaps_bridged += 1
+            return self.last_value, self.eyes_closed
+
+        # Gap too long - the face is really gone
+        self.reset()
+        return None, False
+
+    def get_statistics(self):
+        """
+        Get the detection latency and processing cost the conditioner adds.
+
+        Returns:
+            dict: Average filter lag (ms), processing time (us) and gap counts
+        """
+        return {
+            'filter': self.filter_type,
+            'filter_latency_ms': (self.filter_lag_sum / self.filter_lag_count * 1000.0) if self.filter_lag_count else 0.0,
+            'processing_us': (self.processing_time_sum / self.samples * 1e6) if self.samples else 0.0,
+            'gaps_bridged': self.gaps_bridged,
+            'max_gap_hold_ms': self.gap_tolerance * 1000.0
+        }
+
+    def reset(self):
+        """Forget the filter and eye state."""
+        if self.filter is not None:
+            self.filter.reset()
+
+        self.eyes_closed = False
+        self.last_value = None
+        self.last_sample_time = None
@@ -0,0 +1,4 @@
+"""
+__init__.py for diagnostics module
+Soak, profiling and latency harnesses for the detection pipeline
+"""
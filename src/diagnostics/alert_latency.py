@@ -0,0 +1,559 @@
+"""
+Alert Latency Harness
+Injects eye closures of known onset and length into a feature or frame
+stream, runs the pipeline through to AlertManager.play_alert with audio
+disabled, and checks the onset-to-alert latency distribution and missed
+alerts against a budget for every configuration tried
+
+Usage (from the project root):
+    python -m src.diagnostics.alert_latency --mode ear --frames-threshold 10 20 30 --conditioning both
+    python -m src.diagnostics.alert_latency --mode frames --trials 10 --realtime --load 4
+    python -m src.diagnostics.alert_latency --source fixtures/drive.mp4 --labels fixtures/drive.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+import config
+from src.alert.alert_manager import AlertManager
+from src.detection.drowsiness_detector import DrowsinessDetector
+from src.detection.signal_conditioning import EARSignalConditioner
+from src.pipeline.headless import HeadlessPipeline
+
+
+# Open and closed EAR levels of the feature stream
+OPEN_EAR = 0.30
+CLOSED_EAR = 0.12
+
+
+def build_schedule(durations, trials, gap, lead=2.0, seed=0):
+    """
+    Lay out closures separated by open-eye gaps.
+
+    Each gap is jittered by up to one second so onsets fall at different
+    phases of the frame clock.
+
+    Args:
+        durations: Closure lengths in seconds, each repeated per trial
+        trials: Repetitions of every duration
+        gap: Seconds of open eyes between closures
+        lead: Seconds of open eyes before the first closure
+        seed: Random seed for the order and jitter
+
+    Returns:
+        tuple: (list of (onset, duration), total stream length in seconds)
+    """
+    rng = random.Random(seed)
+    lengths = [duration for duration in durations for _ in range(trials)]
+    rng.shuffle(lengths)
+
+    schedule = []
+    timestamp = lead
+    for duration in lengths:
+        schedule.append((timestamp, duration))
+        timestamp += duration + gap + rng.random()
+
+    return schedule, timestamp
+
+
+class SyntheticEARSource:
+    """Feature stream (no FaceMesh) with closures at scheduled times."""
+
+    kind = 'features'
+
+    def __init__(self, schedule, length, fps=None, seed=0):
+        """
+        Precompute the stream.
+
+        Args:
+            schedule: (onset, duration) closures from build_schedule
+            length: Stream length in seconds
+            fps: Frame rate (default config.CAMERA_FPS)
+            seed: Random seed for the EAR noise
+        """
+        self.fps = fps or config.CAMERA_FPS
+        rng = random.Random(seed)
+        count = int(length * self.fps)
+
+        self.timestamps = [index / self.fps for index in range(count)]
+        self.closed = [False] * count
+        for onset, duration in schedule:
+            first = int(onset * self.fps + 0.999999)
+            for index in range(first, min(count, int((onset + duration) * self.fps + 0.999999))):
+                self.closed[index] = True
+
+        self.features = []
+        for closed in self.closed:
+            ear = (CLOSED_EAR if closed else OPEN_EAR) + rng.gauss(0, 0.01)
+            self.features.append({
+                'left_ear': ear,
+                'right_ear': ear,
+                'ear': ear,
+                'mar': 0.30 + rng.gauss(0, 0.03),
+                'head_pitch': 0.55
+            })
+
+    def read(self, index):
+        """Features of frame index."""
+        return self.features[index]
+
+    def close(self):
+        """Nothing to release."""
+
+
+class SyntheticFrameSource:
+    """Rendered synthetic face with closures at scheduled times."""
+
+    kind = 'frames'
+
+    def __init__(self, schedule, length, fps=None, seed=0):
+        """
+        Set up the generator; frames are rendered on demand.
+
+        Args:
+            schedule: (onset, duration) closures from build_schedule
+            length: Stream length in seconds
+            fps: Frame rate (default config.CAMERA_FPS)
+            seed: Generator seed (head motion, blinks, noise)
+        """
+        from src.capture.synthetic_face import SyntheticFaceGenerator, EVENT_CLOSURE
+
+        # Natural blinks stay in as short closures that must not alert
+        self.generator = SyntheticFaceGenerator(fps=fps, seed=seed, closure_interval=None,
+                                                yawn_interval=None, nod_interval=None)
+        for onset, duration in schedule:
+            self.generator.add_event(EVENT_CLOSURE, onset, duration)
+
+        self.fps = self.generator.fps
+        count = int(length * self.fps)
+        self.timestamps = [index / self.fps for index in range(count)]
+        self.closed = [self.generator.label_at(timestamp)['eyes_closed'] for timestamp in self.timestamps]
+
+    def read(self, index):
+        """Render frame index."""
+        frame, _ = self.generator.render(self.timestamps[index])
+        return frame
+
+    def close(self):
+        """Nothing to release."""
+
+
+class LabeledClipSource:
+    """Recorded clip with a per-frame labels CSV (as written by synthetic_face)."""
+
+    kind = 'frames'
+
+    def __init__(self, path, labels_path):
+        """
+        Open the clip and read its labels.
+
+        Args:
+            path: Video file
+            labels_path: CSV with frame, timestamp and eyes_closed columns
+
+        Raises:
+            IOError: If the clip cannot be opened
+        """
+        from src.capture.video_source import VideoSource
+
+        with open(labels_path, newline='') as labels_file:
+            rows = list(csv.DictReader(labels_file))
+
+        self.timestamps = [float(row['timestamp']) for row in rows]
+        self.closed = [row['eyes_closed'].strip().lower() in ('1', 'true', 'yes') for row in rows]
+        self.fps = (len(rows) - 1) / (self.timestamps[-1] - self.timestamps[0]) if len(rows) > 1 else config.CAMERA_FPS
+
+        self.video_source = VideoSource(path, realtime=False, loop=False)
+        if not self.video_source.start():
+            raise IOError(f"Could not open video source: {path}")
+        self.position = 0
+
+    def read(self, index):
+        """
+        Decode forward to frame index (frames may only be skipped, not revisited).
+
+        Returns:
+            numpy.ndarray: Frame, or None if the clip ended early
+        """
+        frame = None
+        while self.position <= index:
+            ret, frame, _ = self.video_source.read()
+            if not ret:
+                return None
+            self.position += 1
+        return frame
+
+    def close(self):
+        """Release the clip."""
+        self.video_source.release()
+
+
+def find_closures(timestamps, closed):
+    """
+    Ground-truth closures: runs of closed-eye frames.
+
+    Returns:
+        list: (first frame, frame after the last, onset time, duration) per run
+    """
+    closures = []
+    start = None
+    for index, is_closed in enumerate(closed + [False]):
+        if is_closed and start is None:
+            start = index
+        elif not is_closed and start is not None:
+            end_time = timestamps[index] if index < len(timestamps) else timestamps[-1]
+            closures.append((start, index, timestamps[start], end_time - timestamps[start]))
+            start = None
+    return closures
+
+
+def _burn_cpu(stop_event):
+    """Busy-loop until told to stop (simulated CPU load)."""
+    value = 0
+    while not stop_event.is_set():
+        for _ in range(10000):
+            value = (value * 31 + 7) % 1000003
+
+
+@contextlib.contextmanager
+def cpu_load(workers):
+    """
+    Keep some CPU cores busy for the duration of the block.
+
+    Args:
+        workers: Number of busy-looping processes (0 = no load)
+    """
+    stop_event = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=_burn_cpu, args=(stop_event,), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        yield
+    finally:
+        stop_event.set()
+        for process in processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+
+
+def run_configuration(source, frames_threshold, ear_threshold, conditioning, realtime=False):
+    """
+    Drive the stream through a fresh pipeline and record every alert.
+
+    Alert cooldowns are kept on media time, so a stream replayed faster than
+    real time sees the same cooldowns as a live run. With realtime, frames
+    are released at their capture times and the pipeline always takes the
+    newest one, dropping the rest like the live app does when it falls
+    behind; time spent producing frames is kept off that clock.
+
+    Args:
+        source: SyntheticEARSource, SyntheticFrameSource or LabeledClipSource
+        frames_threshold: Consecutive closed frames before alerting
+        ear_threshold: EAR threshold
+        conditioning: Run the EAR signal conditioner
+        realtime: Pace frames at the source frame rate
+
+    Returns:
+        dict: alerts as (frame index, timestamp, delay after capture in s),
+              frames processed and dropped, mean processing time in ms
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        pipeline = HeadlessPipeline(
+            drowsiness_detector=DrowsinessDetector(ear_threshold, frames_threshold),
+            alert_manager=AlertManager(enable_audio=False),
+            use_face_detector=source.kind == 'frames'
+        )
+        pipeline.signal_conditioner = EARSignalConditioner() if conditioning else None
+
+        alerts = []
+        last_alert_timestamp = None
+        processed = 0
+        busy_time = 0.0
+        count = len(source.timestamps)
+        origin = source.timestamps[0] if count else 0.0
+
+        clock_start = time.perf_counter()
+        source_time = 0.0
+        index = 0
+
+        try:
+            while index < count:
+                if realtime:
+                    media_now = time.perf_counter() - clock_start - source_time
+                    due = min(count - 1, int(media_now * source.fps))
+                    if due < index:
+                        time.sleep((index / source.fps) - media_now)
+                        continue
+                    index = due
+
+                timestamp = source.timestamps[index]
+
+                read_start = time.perf_counter()
+                item = source.read(index)
+                read_end = time.perf_counter()
+                if realtime:
+                    source_time += read_end - read_start
+                if item is None:
+                    break
+
+                if last_alert_timestamp is None or timestamp - last_alert_timestamp >= config.ALERT_COOLDOWN:
+                    pipeline.drowsiness_detector.last_alert_time = 0
+                    pipeline.alert_manager.last_alert_time = 0
+
+                if source.kind == 'frames':
+                    result = pipeline.process_frame(item, timestamp)
+                else:
+                    result = pipeline.process_features(None, item, timestamp)
+                done = time.perf_counter()
+                busy_time += done - read_end
+                processed += 1
+
+                if result is not None and result['alert']:
+                    if realtime:
+                        captured = clock_start + source_time + (timestamp - origin)
+                    else:
+                        captured = read_end
+                    alerts.append((index, timestamp, done - captured))
+                    last_alert_timestamp = timestamp
+
+                index += 1
+        finally:
+            pipeline.cleanup()
+
+    return {
+        'alerts': alerts,
+        'processed': processed,
+        'dropped': count - processed,
+        'processing_ms': busy_time / processed * 1000.0 if processed else 0.0
+    }
+
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of a sorted list."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(percent / 100.0 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def score_run(run, closures, frames_threshold, fps, grace=0.5):
+    """
+    Match alerts to ground-truth closures.
+
+    A closure at least frames_threshold frames long must raise an alert
+    between its onset and grace seconds after it ends; its latency is the
+    alert frame's time since onset plus the processing delay of that frame.
+    Overhead is the latency beyond what the configuration waits for by
+    design, (frames_threshold - 1) frame intervals after the onset frame.
+    Further alerts in the same window are cooldown repeats; alerts outside
+    every long closure are false alerts.
+
+    Returns:
+        dict: latencies and overheads in ms, missed, repeated and false alert counts
+    """
+    required = (frames_threshold - 1) / fps
+    alerts = list(run['alerts'])
+    latencies = []
+    overheads = []
+    missed = 0
+    repeats = 0
+    expected = 0
+
+    for start, end, onset, duration in closures:
+        if end - start < frames_threshold:
+            continue
+        expected += 1
+
+        in_window = [alert for alert in alerts if onset <= alert[1] < onset + duration + grace]
+        if not in_window:
+            missed += 1
+            continue
+
+        for alert in in_window:
+            alerts.remove(alert)
+        repeats += len(in_window) - 1
+
+        first = in_window[0]
+        latency = (first[1] - onset + first[2]) * 1000.0
+        latencies.append(latency)
+        overheads.append(latency - required * 1000.0)
+
+    latencies.sort()
+    overheads.sort()
+    return {
+        'expected': expected,
+        'latencies_ms': latencies,
+        'overheads_ms': overheads,
+        'missed': missed,
+        'repeats': repeats,
+        'false_alerts': len(alerts)
+    }
+
+
+def evaluate_budget(results, budget_ms, percentile, max_missed, max_false):
+    """
+    Check every configuration against the latency and miss budgets.
+
+    Args:
+        results: List of per-configuration result dicts
+        budget_ms: Allowed alert overhead in ms at the given percentile
+        percentile: Percentile of the overhead distribution checked
+        max_missed: Allowed missed alerts per configuration
+        max_false: Allowed false alerts per configuration
+
+    Returns:
+        list: Budget violation messages (empty if within budget)
+    """
+    failures = []
+    for result in results:
+        name = result['name']
+        overhead = _percentile(result['overheads_ms'], percentile)
+        if overhead is not None and overhead > budget_ms:
+            failures.append(f"{name}: p{percentile:g} alert overhead {overhead:.0f}ms (budget {budget_ms:.0f}ms)")
+        if result['missed'] > max_missed:
+            failures.append(f"{name}: {result['missed']}/{result['expected']} closures missed (budget {max_missed})")
+        if result['false_alerts'] > max_false:
+            failures.append(f"{name}: {result['false_alerts']} false alerts (budget {max_false})")
+    return failures
+
+
+def _format_ms(value):
+    """Format an optional millisecond value."""
+    return f"{value:7.0f}" if value is not None else "    n/a"
+
+
+def print_report(results, failures, fps, histogram=True):
+    """Print the latency distributions and budget verdict."""
+    frame_ms = 1000.0 / fps
+
+    print("\n" + "=" * 92)
+    print("ALERT LATENCY REPORT")
+    print("=" * 92)
+    print(f"{'configuration':<34}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}"
+          f"{'missed':>9}{'false':>7}{'proc ms':>9}{'dropped':>9}")
+
+    for result in results:
+        latencies = result['latencies_ms']
+        print(f"{result['name']:<34}"
+              f"{_format_ms(_percentile(latencies, 50))} {_format_ms(_percentile(latencies, 90))} "
+              f"{_format_ms(_percentile(latencies, 99))} {_format_ms(latencies[-1] if latencies else None)} "
+              f"{result['missed']:>4}/{result['expected']:<4}{result['false_alerts']:>6}"
+              f"{result['processing_ms']:>9.2f}{result['dropped']:>9}")
+
+    if histogram:
+        print(f"\nOverhead beyond the configured closure time, in frames ({frame_ms:.0f}ms):")
+        for result in results:
+            if not result['overheads_ms']:
+                continue
+            bins = {}
+            for overhead in result['overheads_ms']:
+                frame_bin = max(0, int(overhead // frame_ms))
+                bins[frame_bin] = bins.get(frame_bin, 0) + 1
+            peak = max(bins.values())
+            print(f"  {result['name']}")
+            for frame_bin in range(min(bins), max(bins) + 1):
+                count = bins.get(frame_bin, 0)
+                print(f"    +{frame_bin:<3} {'#' * max(int(40 * count / peak), 1 if count else 0)} {count}")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+    else:
+        print("[PASS] Alert latency and missed alerts within budget")
+
+
+def _make_source(args):
+    """Build the closure stream selected on the command line."""
+    if args.source is not None:
+        labels = args.labels or args.source.rsplit('.', 1)[0] + '.csv'
+        return LabeledClipSource(args.source, labels)
+
+    schedule, length = build_schedule(args.durations, args.trials, args.gap, seed=args.seed)
+    source_class = SyntheticFrameSource if args.mode == 'frames' else SyntheticEARSource
+    return source_class(schedule, length, args.fps, seed=args.seed)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Onset-to-alert latency regression harness")
+    parser.add_argument('--mode', choices=['ear', 'frames'], default='ear',
+                        help="Inject closures into EAR features (fast) or rendered face frames (full pipeline)")
+    parser.add_argument('--source', help="Recorded clip to use instead of synthetic input")
+    parser.add_argument('--labels', help="Labels CSV of --source (default: clip path with .csv)")
+    parser.add_argument('--durations', type=float, nargs='+', default=[0.3, 1.0, 2.0, 3.0],
+                        help="Injected closure lengths in seconds")
+    parser.add_argument('--trials', type=int, default=20, help="Closures per duration")
+    parser.add_argument('--gap', type=float, default=3.0, help="Seconds of open eyes between closures")
+    parser.add_argument('--fps', type=float, default=config.CAMERA_FPS, help="Synthetic frame rate")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--frames-threshold', type=int, nargs='+', default=[config.EAR_CONSECUTIVE_FRAMES],
+                        help="EAR_CONSECUTIVE_FRAMES values to try")
+    parser.add_argument('--ear-threshold', type=float, nargs='+', default=[config.EAR_THRESHOLD],
+                        help="EAR_THRESHOLD values to try")
+    parser.add_argument('--conditioning', choices=['off', 'on', 'both'],
+                        default='on' if config.ENABLE_SIGNAL_CONDITIONING else 'off',
+                        help="Run with and/or without EAR signal conditioning")
+    parser.add_argument('--load', type=int, nargs='+', default=[0],
+                        help="Busy CPU processes to run alongside (one run per value)")
+    parser.add_argument('--realtime', action='store_true',
+                        help="Release frames at their capture times and drop frames the pipeline misses")
+    parser.add_argument('--budget-ms', type=float, default=100.0,
+                        help="Allowed alert overhead beyond the configured closure time (ms)")
+    parser.add_argument('--percentile', type=float, default=99.0, help="Overhead percentile checked")
+    parser.add_argument('--max-missed', type=int, default=0, help="Allowed missed alerts per configuration")
+    parser.add_argument('--max-false', type=int, default=0, help="Allowed false alerts per configuration")
+    parser.add_argument('--output', help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    source = _make_source(args)
+    closures = find_closures(source.timestamps, source.closed)
+    print(f"[INFO] {len(source.timestamps)} frames at {source.fps:.1f} FPS, {len(closures)} ground-truth closures")
+
+    conditioning_values = {'off': [False], 'on': [True], 'both': [False, True]}[args.conditioning]
+    results = []
+
+    try:
+        for load, frames_threshold, ear_threshold, conditioning in itertools.product(
+                args.load, args.frames_threshold, args.ear_threshold, conditioning_values):
+            name = f"n={frames_threshold} ear<{ear_threshold:g}{' cond' if conditioning else ''}"
+            if load:
+                name += f" load={load}"
+
+            with cpu_load(load):
+                run = run_configuration(source, frames_threshold, ear_threshold, conditioning, args.realtime)
+
+            result = score_run(run, closures, frames_threshold, source.fps)
+            result.update(name=name, processing_ms=run['processing_ms'], dropped=run['dropped'])
+            results.append(result)
+            print(f"[INFO] {name}: {len(run['alerts'])} alerts, {result['missed']} missed, "
+                  f"{result['repeats']} cooldown repeats", flush=True)
+
+            # Clips are read forward only; reopen for the next configuration
+            if isinstance(source, LabeledClipSource):
+                source.close()
+                source = _make_source(args)
+    finally:
+        source.close()
+
+    failures = evaluate_budget(results, args.budget_ms, args.percentile, args.max_missed, args.max_false)
+    print_report(results, failures, source.fps)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({'results': results, 'failures': failures}, output_file, indent=2)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Pipeline Profiler
+Runs the detection pipeline for a fixed number of frames under a stack
+sampler (and optionally cProfile), writes a collapsed-stack file for flame
+graph tools and prints the most expensive functions
+
+Usage (from the project root):
+    python src/main.py profile --frames 600 --source recordings/drive.mp4
+    python -m src.diagnostics.profiler --frames 600 --deterministic
+
+The .collapsed output can be rendered with flamegraph.pl or speedscope.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from src.alert.alert_manager import AlertManager
+from src.capture.video_source import VideoSource
+from src.pipeline.headless import HeadlessPipeline
+
+
+# Components reported separately, matched on the source file of a stack frame
+COMPONENTS = (
+    ('FaceEyeDetector', ('face_eye_detector', 'feature_extractor', 'low_light', 'mediapipe')),
+    ('DrowsinessDetector', ('drowsiness_detector', 'signal_conditioning')),
+    ('AlertManager', ('alert_manager', 'pygame')),
+    ('UI conversion', ('render_frame', 'src.ui.', 'PIL.')),
+)
+
+
+class StackSampler:
+    """
+    Samples the call stack of one thread at a fixed interval.
+
+    Runs as a daemon thread using sys._current_frames(), so the profiled code
+    needs no instrumentation and pays only for the interpreter switching to
+    the sampler thread.
+    """
+
+    def __init__(self, thread_id=None, interval=0.002):
+        """
+        Initialize the sampler.
+
+        Args:
+            thread_id: Thread to sample (default: the calling thread)
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.is_running = False
+        self.thread = None
+
+    def start(self):
+        """Start sampling."""
+        self.is_running = True
+        self.thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _sample_loop(self):
+        """Record the target thread's stack until stopped."""
+        while self.is_running:
+            frame = sys._current_frames().get(self.thread_id)
+
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+                self.samples += 1
+
+            time.sleep(self.interval)
+
+    def write_collapsed(self, path):
+        """
+        Write stacks in the collapsed format ("root;child;leaf count").
+
+        Args:
+            path: Output file path
+        """
+        with open(path, 'w') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f"{';'.join(stack)} {count}\n")
+
+    def top_functions(self, limit):
+        """
+        Rank functions by samples spent in them.
+
+        Args:
+            limit: Number of functions to return
+
+        Returns:
+            list: (label, self_samples, inclusive_samples) tuples
+        """
+        self_counts = Counter()
+        inclusive_counts = Counter()
+
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                inclusive_counts[label] += count
+
+        return [
+            (label, count, inclusive_counts[label])
+            for label, count in self_counts.most_common(limit)
+        ]
+
+    def component_shares(self):
+        """
+        Share of samples spent inside each pipeline component.
+
+        Returns:
+            list: (component, samples) tuples in COMPONENTS order
+        """
+        totals = Counter()
+
+        for stack, count in self.stacks.items():
+            for name, patterns in COMPONENTS:
+                if any(pattern in label for label in stack for pattern in patterns):
+                    totals[name] += count
+
+        return [(name, totals[name]) for name, _ in COMPONENTS]
+
+
+def _frame_label(frame):
+    """Label a stack frame as module.qualified_name."""
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', os.path.basename(code.co_filename))
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{module}.{name}"
+
+
+def run_profile(num_frames, source=None, deterministic=False, interval=0.002,
+                render=True, audio=False, log=None):
+    """
+    Run the pipeline for a fixed number of frames under the profilers.
+
+    Frame decoding happens on the source's prefetch thread and is not part of
+    the samples; the sampled thread runs inference, detection, alerting and
+    the GUI's frame conversion.
+
+    Args:
+        num_frames: Frames to process
+        source: Video file, image directory or synthetic spec
+        deterministic: Also run cProfile for exact call counts
+        interval: Stack sampling interval in seconds
+        render: Include the BGR -> RGB -> PIL conversion the GUI performs
+        audio: Play alert sounds instead of only counting them
+        log: Stream for progress output (default: the real stdout)
+
+    Returns:
+        dict: sampler, optional cProfile stats, frames and elapsed time
+    """
+    log = log or sys.__stdout__
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        pipeline = HeadlessPipeline(alert_manager=AlertManager(enable_audio=audio), render=render)
+        video_source = VideoSource(source or "synthetic://?seed=1", realtime=False)
+
+        if not video_source.start():
+            raise IOError(f"Could not open video source: {video_source.source}")
+
+        sampler = StackSampler(interval=interval)
+        profiler = cProfile.Profile() if deterministic else None
+        frames = 0
+
+        sampler.start()
+        if profiler is not None:
+            profiler.enable()
+        start_time = time.perf_counter()
+
+        try:
+            while frames < num_frames:
+                ok, frame, timestamp = video_source.read()
+                if not ok:
+                    if not video_source.is_opened():
+                        break
+                    continue
+
+                pipeline.process_frame(frame, timestamp)
+                frames += 1
+
+                if frames % 100 == 0:
+                    print(f"[PROFILE] {frames}/{num_frames} frames", file=log, flush=True)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            if profiler is not None:
+                profiler.disable()
+            sampler.stop()
+            video_source.release()
+            pipeline.cleanup()
+
+    return {
+        'sampler': sampler,
+        'profiler': profiler,
+        'frames': frames,
+        'elapsed': elapsed,
+        'alerts': pipeline.alerts_played
+    }
+
+
+def print_report(report, top):
+    """Print the per-frame cost, component shares and top functions."""
+    sampler = report['sampler']
+    total = max(sampler.samples, 1)
+    frames = max(report['frames'], 1)
+
+    print("\n" + "=" * 60)
+    print("PROFILE REPORT")
+    print("=" * 60)
+    print(f"Frames:   {report['frames']} in {report['elapsed']:.1f}s "
+          f"({report['elapsed'] / frames * 1000:.2f} ms/frame)")
+    print(f"Samples:  {sampler.samples}")
+    print(f"Alerts:   {report['alerts']}")
+
+    print("\nTime by component (inclusive):")
+    for name, count in sampler.component_shares():
+        share = count / total
+        print(f"  {name:<20} {share:6.1%}  ~{share * report['elapsed'] / frames * 1000:.2f} ms/frame")
+
+    print(f"\nTop {top} functions by sampled self time:")
+    print(f"  {'self':>7} {'total':>7}  function")
+    for label, self_count, inclusive_count in sampler.top_functions(top):
+        print(f"  {self_count / total:7.1%} {inclusive_count / total:7.1%}  {label}")
+
+    if report['profiler'] is not None:
+        buffer = io.StringIO()
+        stats = pstats.Stats(report['profiler'], stream=buffer)
+        stats.sort_stats('tottime').print_stats(top)
+        print(f"\nTop {top} functions by exact self time (cProfile):")
+        print(buffer.getvalue())
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog="profile", description="Profile the detection pipeline")
+    parser.add_argument('--frames', type=int, default=600, help="Frames to process")
+    parser.add_argument('--source', help="Video file, image directory or synthetic://?seed=N "
+                                         "(default: synthetic face)")
+    parser.add_argument('--output', help="Collapsed-stack output file (default: profile_<time>.collapsed)")
+    parser.add_argument('--interval', type=float, default=2.0, help="Sampling interval in ms")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="Also run cProfile (exact call counts, slows the pipeline down)")
+    parser.add_argument('--no-render', action='store_true', help="Skip the GUI frame conversion")
+    parser.add_argument('--audio', action='store_true', help="Play alert sounds")
+    parser.add_argument('--top', type=int, default=20, help="Functions to list")
+    args = parser.parse_args(argv)
+
+    output = args.output or datetime.now().strftime("profile_%Y%m%d_%H%M%S.collapsed")
+
+    try:
+        report = run_profile(
+            args.frames,
+            source=args.source,
+            deterministic=args.deterministic,
+            interval=args.interval / 1000.0,
+            render=not args.no_render,
+            audio=args.audio
+        )
+    except IOError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    report['sampler'].write_collapsed(output)
+    print_report(report, args.top)
+
+    if report['profiler'] is not None:
+        stats_path = os.path.splitext(output)[0] + ".prof"
+        report['profiler'].dump_stats(stats_path)
+        print(f"[INFO] cProfile stats written to: {stats_path}")
+
+    print(f"[INFO] Collapsed stacks written to: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
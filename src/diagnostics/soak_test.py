@@ -0,0 +1,367 @@
+"""
+Soak Test Harness
+Drives the detection pipeline for millions of frames at accelerated speed,
+tracking Python allocations, RSS and thread counts, and fails when growth
+exceeds a budget
+
+Usage (from the project root):
+    python -m src.diagnostics.soak_test --features-only --frames 5000000
+    python -m src.diagnostics.soak_test --source recordings/drive.mp4 --frames 200000 --render
+"""
+
+import argparse
+import contextlib
+import gc
+import math
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import config
+from src.alert.alert_manager import AlertManager
+from src.pipeline.headless import HeadlessPipeline
+
+
+def get_rss_mb():
+    """
+    Get the resident set size of this process.
+
+    Returns:
+        float: RSS in MB, or None if it cannot be determined
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        with open('/proc/self/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    return None
+
+
+class SyntheticEARStream:
+    """
+    Deterministic stream of fatigue features: open eyes with noise, regular
+    blinks, occasional long closures, yawns and head drops.
+    """
+
+    def __init__(self, seed=0, fps=30.0):
+        """
+        Initialize the stream.
+
+        Args:
+            seed: Random seed (same seed = same stream)
+            fps: Simulated frame rate for timestamps
+        """
+        self.random = random.Random(seed)
+        self.fps = fps
+        self.frame_index = 0
+        self.event = None
+        self.event_frames_left = 0
+
+    def next(self):
+        """
+        Produce the next frame's features.
+
+        Returns:
+            tuple: (features dict, timestamp)
+        """
+        timestamp = self.frame_index / self.fps
+        self.frame_index += 1
+
+        if self.event_frames_left == 0:
+            roll = self.random.random()
+            if roll < 0.01:
+                self.event, self.event_frames_left = 'blink', self.random.randint(2, 5)
+            elif roll < 0.0105:
+                self.event, self.event_frames_left = 'closure', self.random.randint(30, 90)
+            elif roll < 0.011:
+                self.event, self.event_frames_left = 'yawn', self.random.randint(20, 60)
+            elif roll < 0.0112:
+                self.event, self.event_frames_left = 'nod', self.random.randint(20, 40)
+            else:
+                self.event = None
+
+        ear = 0.30 + self.random.gauss(0, 0.015)
+        mar = 0.30 + self.random.gauss(0, 0.03)
+        pitch = 0.55 + 0.01 * math.sin(timestamp)
+
+        if self.event_frames_left > 0:
+            self.event_frames_left -= 1
+            if self.event in ('blink', 'closure'):
+                ear = 0.12 + self.random.gauss(0, 0.01)
+            elif self.event == 'yawn':
+                mar = 0.85
+            elif self.event == 'nod':
+                pitch = 0.80
+
+        features = {
+            'left_ear': ear,
+            'right_ear': ear,
+            'ear': ear,
+            'mar': mar,
+            'head_pitch': pitch
+        }
+        return features, timestamp
+
+
+def _make_frame_source(source, num_frames):
+    """
+    Build a frame generator for full-pipeline runs.
+
+    Args:
+        source: Video file / image directory, or None for noise frames
+        num_frames: Frames to produce
+
+    Yields:
+        tuple: (frame, timestamp)
+    """
+    if source is not None:
+        from src.capture.video_source import VideoSource
+
+        video_source = VideoSource(source, realtime=False, loop=True)
+        if not video_source.start():
+            raise IOError(f"Could not open video source: {source}")
+
+        try:
+            produced = 0
+            while produced < num_frames:
+                ret, frame, timestamp = video_source.read()
+                if ret:
+                    produced += 1
+                    yield frame, timestamp
+        finally:
+            video_source.release()
+        return
+
+    import numpy as np
+
+    # A few pre-generated frames cycled, so frame generation does not dominate
+    rng = np.random.default_rng(0)
+    frames = [
+        rng.integers(0, 255, (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3), dtype=np.uint8)
+        for _ in range(8)
+    ]
+    for index in range(num_frames):
+        yield frames[index % len(frames)].copy(), index / config.CAMERA_FPS
+
+
+def _take_sample(frame_index, start_time):
+    """Record one memory/thread measurement."""
+    current, _ = tracemalloc.get_traced_memory()
+    return {
+        'frame': frame_index,
+        'elapsed': time.perf_counter() - start_time,
+        'rss_mb': get_rss_mb(),
+        'traced_mb': current / (1024 * 1024),
+        'threads': threading.active_count()
+    }
+
+
+def run_soak(num_frames, source=None, features_only=False, render=False, with_tk=False,
+             warmup_frames=5000, sample_every=50000, top_sites=10, log=None):
+    """
+    Run the soak test.
+
+    Args:
+        num_frames: Total frames to drive through the pipeline
+        source: Video file / image directory (full mode), None for noise frames
+        features_only: Skip FaceMesh and feed synthetic features (fastest)
+        render: Include the GUI's frame -> PIL image conversion
+        with_tk: Also create an ImageTk.PhotoImage per frame (needs a display)
+        warmup_frames: Frames run before the baseline measurement
+        sample_every: Frames between measurements
+        top_sites: Number of allocation sites to report
+        log: Stream for progress output (default: the real stdout)
+
+    Returns:
+        dict: baseline, final, samples and top allocation sites
+    """
+    log = log or sys.__stdout__
+    tk_root = None
+    photo_image = None
+
+    if with_tk:
+        import tkinter as tk
+        from PIL import ImageTk
+        tk_root = tk.Tk()
+        tk_root.withdraw()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        pipeline = HeadlessPipeline(
+            alert_manager=AlertManager(enable_audio=False),
+            use_face_detector=not features_only,
+            render=render or with_tk
+        )
+
+        if features_only:
+            stream = SyntheticEARStream()
+            frames = None
+        else:
+            frames = _make_frame_source(source, num_frames)
+
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        baseline = None
+        baseline_snapshot = None
+        samples = []
+
+        try:
+            for index in range(num_frames):
+                if features_only:
+                    features, timestamp = stream.next()
+                    pipeline.process_features(None, features, timestamp)
+                else:
+                    frame, timestamp = next(frames)
+                    pipeline.process_frame(frame, timestamp)
+
+                    if with_tk:
+                        # Mirrors update_gui: one PhotoImage per displayed frame
+                        photo_image = ImageTk.PhotoImage(image=pipeline.last_image)
+                        if index % 100 == 0:
+                            tk_root.update_idletasks()
+
+                if index + 1 == warmup_frames:
+                    gc.collect()
+                    baseline = _take_sample(index + 1, start_time)
+                    baseline_snapshot = tracemalloc.take_snapshot()
+                    samples.append(baseline)
+                elif baseline is not None and (index + 1) % sample_every == 0:
+                    sample = _take_sample(index + 1, start_time)
+                    samples.append(sample)
+                    print(f"[SOAK] {sample['frame']:>10} frames  {sample['elapsed']:8.1f}s  "
+                          f"rss={_format_mb(sample['rss_mb'])}  traced={sample['traced_mb']:.2f}MB  "
+                          f"threads={sample['threads']}", file=log, flush=True)
+        finally:
+            gc.collect()
+            final = _take_sample(num_frames, start_time)
+            final_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            pipeline.cleanup()
+
+            del photo_image
+            if tk_root is not None:
+                tk_root.destroy()
+
+    if baseline_snapshot is None:
+        # Run shorter than the warm-up - nothing to compare against
+        baseline, baseline_snapshot = final, final_snapshot
+
+    top = final_snapshot.compare_to(baseline_snapshot, 'lineno')[:top_sites]
+
+    return {
+        'baseline': baseline,
+        'final': final,
+        'samples': samples,
+        'top_sites': [(str(stat.traceback), stat.size_diff, stat.count_diff) for stat in top],
+        'frames_per_second': num_frames / max(final['elapsed'], 1e-9),
+        'alerts': pipeline.alerts_played
+    }
+
+
+def _format_mb(value):
+    """Format an optional MB value."""
+    return f"{value:.1f}MB" if value is not None else "n/a"
+
+
+def evaluate_budget(report, rss_budget_mb, traced_budget_mb, thread_budget):
+    """
+    Check growth between the baseline and final measurements.
+
+    Args:
+        report: Result of run_soak
+        rss_budget_mb: Allowed RSS growth in MB
+        traced_budget_mb: Allowed traced Python allocation growth in MB
+        thread_budget: Allowed growth in live thread count
+
+    Returns:
+        list: Budget violation messages (empty if within budget)
+    """
+    baseline, final = report['baseline'], report['final']
+    failures = []
+
+    if baseline['rss_mb'] is not None and final['rss_mb'] is not None:
+        rss_growth = final['rss_mb'] - baseline['rss_mb']
+        if rss_growth > rss_budget_mb:
+            failures.append(f"RSS grew {rss_growth:.1f}MB (budget {rss_budget_mb}MB)")
+
+    traced_growth = final['traced_mb'] - baseline['traced_mb']
+    if traced_growth > traced_budget_mb:
+        failures.append(f"Traced allocations grew {traced_growth:.2f}MB (budget {traced_budget_mb}MB)")
+
+    thread_growth = final['threads'] - baseline['threads']
+    if thread_growth > thread_budget:
+        failures.append(f"Thread count grew by {thread_growth} (budget {thread_budget})")
+
+    return failures
+
+
+def print_report(report, failures):
+    """Print the soak test summary."""
+    baseline, final = report['baseline'], report['final']
+
+    print("\n" + "=" * 60)
+    print("SOAK TEST REPORT")
+    print("=" * 60)
+    print(f"Frames:        {final['frame']} in {final['elapsed']:.1f}s ({report['frames_per_second']:.0f} frames/s)")
+    print(f"Alerts:        {report['alerts']}")
+    print(f"RSS:           {_format_mb(baseline['rss_mb'])} -> {_format_mb(final['rss_mb'])}")
+    print(f"Traced:        {baseline['traced_mb']:.2f}MB -> {final['traced_mb']:.2f}MB")
+    print(f"Threads:       {baseline['threads']} -> {final['threads']}")
+
+    print("\nTop allocation growth since baseline:")
+    for site, size_diff, count_diff in report['top_sites']:
+        print(f"  {size_diff / 1024:+10.1f} KB  {count_diff:+8d} blocks  {site}")
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f"[FAIL] {failure}")
+    else:
+        print("[PASS] Memory and thread growth within budget")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Long-run soak and memory-growth test")
+    parser.add_argument('--frames', type=int, default=1000000, help="Frames to process")
+    parser.add_argument('--source', help="Video file or image directory (default: noise frames)")
+    parser.add_argument('--features-only', action='store_true',
+                        help="Skip FaceMesh and feed synthetic EAR/MAR/pitch features")
+    parser.add_argument('--render', action='store_true', help="Include frame -> PIL image conversion")
+    parser.add_argument('--with-tk', action='store_true', help="Also create Tk PhotoImages (needs a display)")
+    parser.add_argument('--warmup', type=int, default=5000, help="Frames before the baseline measurement")
+    parser.add_argument('--sample-every', type=int, default=50000, help="Frames between measurements")
+    parser.add_argument('--rss-budget', type=float, default=50.0, help="Allowed RSS growth (MB)")
+    parser.add_argument('--traced-budget', type=float, default=5.0, help="Allowed traced growth (MB)")
+    parser.add_argument('--thread-budget', type=int, default=2, help="Allowed thread count growth")
+    parser.add_argument('--top', type=int, default=10, help="Allocation sites to report")
+    args = parser.parse_args(argv)
+
+    report = run_soak(
+        args.frames,
+        source=args.source,
+        features_only=args.features_only,
+        render=args.render,
+        with_tk=args.with_tk,
+        warmup_frames=min(args.warmup, args.frames),
+        sample_every=args.sample_every,
+        top_sites=args.top
+    )
+    failures = evaluate_budget(report, args.rss_budget, args.traced_budget, args.thread_budget)
+    print_report(report, failures)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ Project: Driver Drowsiness Detection
 
 import sys
 import os
+import multiprocessing
 
 # Determine if running as a PyInstaller bundle
 if getattr(sys, 'frozen', False):
@@ -144,5 +145,44 @@ def main():
         sys.exit(1)
 
 
+def run_profile_command(argv):
+    """
+    Run the pipeline profiler instead of the GUI.
+    
+    Args:
+        argv: Arguments after the 'profile' subcommand
+        
+    Returns:
+        int: Exit code
+    """
+    from diagnostics.profiler import main as profile_main
+    return profile_main(argv)
+
+
+def run_mosaic_command(argv):
+    """
+    Run the multi-stream grid view instead of the single-stream GUI.
+    
+    Args:
+        argv: Arguments after the 'mosaic' subcommand
+        
+    Returns:
+        int: Exit code
+    """
+    from ui.mosaic import main as mosaic_main
+    return mosaic_main(argv)
+
+
 if __name__ == "__main__":
+    # Required for worker processes in PyInstaller builds
+    multiprocessing.freeze_support()
+    
+    # "profile" subcommand: python src/main.py profile --frames 600 [--source FILE]
+    if len(sys.argv) > 1 and sys.argv[1] == "profile":
+        sys.exit(run_profile_command(sys.argv[2:]))
+    
+    # "mosaic" subcommand: python src/main.py mosaic SOURCE [SOURCE ...]
+    if len(sys.argv) > 1 and sys.argv[1] == "mosaic":
+        sys.exit(run_mosaic_command(sys.argv[2:]))
+    
     main()
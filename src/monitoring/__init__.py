@@ -0,0 +1,13 @@
+"""
+__init__.py for monitoring module
+Makes the monitoring package importable
+"""
+
+from .status_server import StatusPublisher, StatusServer
+from .fleet_client import FleetClient
+from .fleet_aggregator import FleetAggregator, FleetAggregatorServer
+
+# VideoStreamer needs OpenCV; import it from src.monitoring.video_stream so the
+# aggregator and status server keep running on hosts without it
+
+__all__ = ['StatusPublisher', 'StatusServer', 'FleetClient', 'FleetAggregator', 'FleetAggregatorServer']
@@ -0,0 +1,729 @@
+"""
+Fleet Aggregator Service
+Standalone process collecting event and status records from many detector
+instances, keeping time-windowed per-vehicle and fleet-wide rollups in memory
+
+Usage (from the project root):
+    python -m src.monitoring.fleet_aggregator
+    python -m src.monitoring.fleet_aggregator --simulate 200 --duration 20
+
+Records arrive as newline-delimited JSON on a TCP port (see FleetClient).
+Rollups are served as JSON over HTTP: /fleet, /vehicles, /vehicles/<id>, /health
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import socketserver
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+from src.monitoring.fleet_client import FleetClient
+
+
+# PERCLOS histogram: ten bins of 0.1
+PERCLOS_BINS = 10
+
+# Alert latency histogram upper edges in seconds (last bin is open-ended)
+LATENCY_EDGES = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+
+
+class _Bucket:
+    """Counters for one time slice of a rollup."""
+
+    __slots__ = ('start', 'events', 'alerts', 'latency_count', 'latency_sum', 'latency_max',
+                 'latency_hist', 'status_count', 'perclos_sum', 'perclos_hist')
+
+    def __init__(self, start):
+        self.start = start
+        self.events = 0
+        self.alerts = 0
+        self.latency_count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_hist = [0] * (len(LATENCY_EDGES) + 1)
+        self.status_count = 0
+        self.perclos_sum = 0.0
+        self.perclos_hist = [0] * PERCLOS_BINS
+
+
+class WindowedRollup:
+    """
+    Event, alert latency and PERCLOS counters over a sliding time window.
+
+    Records land in fixed-size buckets; buckets older than the window are
+    evicted whole, so both ingest and eviction are O(1) per record and a
+    summary costs O(buckets).
+    """
+
+    def __init__(self, window, bucket_seconds):
+        """
+        Initialize the rollup.
+
+        Args:
+            window: Window length in seconds
+            bucket_seconds: Bucket length in seconds
+        """
+        self.window = window
+        self.bucket_seconds = bucket_seconds
+        self.buckets = deque()
+
+    def _bucket(self, now):
+        """Get the bucket covering a time, creating it if needed."""
+        start = now - now % self.bucket_seconds
+
+        if not self.buckets or self.buckets[-1].start < start:
+            self.buckets.append(_Bucket(start))
+
+        return self.buckets[-1]
+
+    def add_event(self, now):
+        """Count a drowsiness event."""
+        self._bucket(now).events += 1
+
+    def add_alert(self, now, latency=None):
+        """Count an alert and its latency from event start (seconds)."""
+        bucket = self._bucket(now)
+        bucket.alerts += 1
+
+        if latency is not None:
+            bucket.latency_count += 1
+            bucket.latency_sum += latency
+            bucket.latency_max = max(bucket.latency_max, latency)
+            bucket.latency_hist[_latency_bin(latency)] += 1
+
+    def add_status(self, now, perclos):
+        """Count a PERCLOS sample (fraction of time the eyes were closed)."""
+        bucket = self._bucket(now)
+        bucket.status_count += 1
+        bucket.perclos_sum += perclos
+        bucket.perclos_hist[min(int(perclos * PERCLOS_BINS), PERCLOS_BINS - 1)] += 1
+
+    def evict(self, now):
+        """
+        Drop buckets that have left the window.
+
+        Returns:
+            bool: True if the rollup is now empty
+        """
+        cutoff = now - self.window
+        while self.buckets and self.buckets[0].start + self.bucket_seconds <= cutoff:
+            self.buckets.popleft()
+        return not self.buckets
+
+    def summary(self, now):
+        """
+        Summarize the window.
+
+        Args:
+            now: Current time
+
+        Returns:
+            dict: events_per_hour, alert latency and PERCLOS distribution
+        """
+        events = alerts = latency_count = status_count = 0
+        latency_sum = latency_max = perclos_sum = 0.0
+        latency_hist = [0] * (len(LATENCY_EDGES) + 1)
+        perclos_hist = [0] * PERCLOS_BINS
+
+        for bucket in self.buckets:
+            events += bucket.events
+            alerts += bucket.alerts
+            latency_count += bucket.latency_count
+            latency_sum += bucket.latency_sum
+            latency_max = max(latency_max, bucket.latency_max)
+            status_count += bucket.status_count
+            perclos_sum += bucket.perclos_sum
+            for index, count in enumerate(bucket.latency_hist):
+                latency_hist[index] += count
+            for index, count in enumerate(bucket.perclos_hist):
+                perclos_hist[index] += count
+
+        # Rate over the part of the window that actually has data
+        covered = min(self.window, now - self.buckets[0].start) if self.buckets else self.window
+        hours = max(covered, self.bucket_seconds) / 3600.0
+
+        perclos_edges = [(index + 1) / PERCLOS_BINS for index in range(PERCLOS_BINS)]
+
+        return {
+            'window_seconds': self.window,
+            'events': events,
+            'alerts': alerts,
+            'events_per_hour': events / hours,
+            'alerts_per_hour': alerts / hours,
+            'alert_latency': {
+                'count': latency_count,
+                'mean': latency_sum / latency_count if latency_count else None,
+                'p95': _histogram_percentile(latency_hist, LATENCY_EDGES, 0.95),
+                'max': latency_max if latency_count else None,
+                'histogram': dict(zip([str(edge) for edge in LATENCY_EDGES] + ['inf'], latency_hist))
+            },
+            'perclos': {
+                'samples': status_count,
+                'mean': perclos_sum / status_count if status_count else None,
+                'p50': _histogram_percentile(perclos_hist, perclos_edges, 0.50),
+                'p95': _histogram_percentile(perclos_hist, perclos_edges, 0.95),
+                'histogram': perclos_hist
+            }
+        }
+
+
+def _latency_bin(latency):
+    """Index of the latency histogram bin for a value."""
+    for index, edge in enumerate(LATENCY_EDGES):
+        if latency <= edge:
+            return index
+    return len(LATENCY_EDGES)
+
+
+def _histogram_percentile(histogram, edges, fraction):
+    """
+    Upper bound of the histogram bin holding a percentile.
+
+    Args:
+        histogram: Bin counts
+        edges: Upper edge of each bin (the last bin may be open-ended)
+        fraction: Percentile as a fraction (0-1)
+
+    Returns:
+        float: Bin upper edge (None if empty or in the open-ended bin)
+    """
+    total = sum(histogram)
+    if total == 0:
+        return None
+
+    target = fraction * total
+    running = 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= target:
+            return edges[index] if index < len(edges) else None
+
+    return None
+
+
+class FleetAggregator:
+    """
+    In-memory per-vehicle and fleet-wide rollups.
+
+    All state is guarded by one lock that is held only for counter updates,
+    so ingest threads and HTTP queries never wait on each other for long.
+    Vehicles whose windows have emptied are dropped.
+    """
+
+    def __init__(self, window=None, bucket_seconds=None):
+        """
+        Initialize the aggregator.
+
+        Args:
+            window: Rollup window in seconds (default config.FLEET_WINDOW)
+            bucket_seconds: Bucket size in seconds (default config.FLEET_BUCKET_SECONDS)
+        """
+        self.window = window or config.FLEET_WINDOW
+        self.bucket_seconds = bucket_seconds or config.FLEET_BUCKET_SECONDS
+
+        self.lock = threading.Lock()
+        self.fleet = WindowedRollup(self.window, self.bucket_seconds)
+        self.vehicles = {}
+        self.last_seen = {}
+        self.next_eviction = 0.0
+
+        # Statistics
+        self.records_ingested = 0
+        self.records_rejected = 0
+
+    def ingest(self, record, now=None):
+        """
+        Apply one record.
+
+        Server receive time is used for bucketing, so vehicle clock skew
+        does not matter.
+
+        Args:
+            record: Dict with 'vehicle', 'type' and type-specific fields
+            now: Receive time (default now)
+        """
+        now = now or time.time()
+
+        # Everything is validated before any rollup is touched, so a bad
+        # record cannot leave the vehicle and fleet totals out of step
+        parsed = self._parse_record(record)
+        if parsed is None:
+            self.reject_record()
+            return
+        vehicle_id, record_type, value = parsed
+
+        with self.lock:
+            rollup = self.vehicles.get(vehicle_id)
+            if rollup is None:
+                rollup = self.vehicles[vehicle_id] = WindowedRollup(self.window, self.bucket_seconds)
+
+            if record_type == 'status':
+                rollup.add_status(now, value)
+                self.fleet.add_status(now, value)
+            elif record_type == 'event':
+                rollup.add_event(now)
+                self.fleet.add_event(now)
+            else:
+                rollup.add_alert(now, value)
+                self.fleet.add_alert(now, value)
+
+            self.last_seen[vehicle_id] = now
+            self.records_ingested += 1
+
+            if now >= self.next_eviction:
+                self._evict(now)
+
+    @staticmethod
+    def _parse_record(record):
+        """
+        Validate a record and convert its fields.
+
+        Args:
+            record: Decoded JSON record
+
+        Returns:
+            tuple: (vehicle id, type, value) - value is the clamped PERCLOS of a
+                   status record, the latency (or None) of an alert, else None
+            None: If the record is malformed
+        """
+        try:
+            vehicle_id = str(record['vehicle'])
+            record_type = record['type']
+
+            value = None
+            if record_type == 'status':
+                value = float(record.get('perclos', 0.0))
+            elif record_type == 'alert':
+                if record.get('latency') is not None:
+                    value = float(record['latency'])
+            elif record_type != 'event':
+                return None
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if value is not None:
+            if not math.isfinite(value) or (record_type == 'alert' and value < 0):
+                return None
+            if record_type == 'status':
+                value = min(max(value, 0.0), 1.0)
+
+        return vehicle_id, record_type, value
+
+    def reject_record(self):
+        """Count a record that could not be decoded or applied."""
+        with self.lock:
+            self.records_rejected += 1
+
+    def _evict(self, now):
+        """Drop expired buckets and vehicles with nothing left (lock held)."""
+        self.fleet.evict(now)
+
+        for vehicle_id in [v for v, rollup in self.vehicles.items() if rollup.evict(now)]:
+            del self.vehicles[vehicle_id]
+            del self.last_seen[vehicle_id]
+
+        self.next_eviction = now + self.bucket_seconds
+
+    def fleet_summary(self, now=None):
+        """
+        Summarize the whole fleet.
+
+        Returns:
+            dict: Fleet rollup plus vehicle counts and ingest totals
+        """
+        now = now or time.time()
+
+        with self.lock:
+            self._evict(now)
+            summary = self.fleet.summary(now)
+            summary['vehicles'] = len(self.vehicles)
+            summary['active_vehicles'] = sum(
+                1 for seen in self.last_seen.values() if now - seen <= config.FLEET_ACTIVE_SECONDS
+            )
+
+        summary['records_ingested'] = self.records_ingested
+        summary['records_rejected'] = self.records_rejected
+        return summary
+
+    def vehicle_summary(self, vehicle_id, now=None):
+        """
+        Summarize one vehicle.
+
+        Returns:
+            dict: Vehicle rollup, or None if the vehicle is unknown
+        """
+        now = now or time.time()
+
+        with self.lock:
+            rollup = self.vehicles.get(vehicle_id)
+            if rollup is None:
+                return None
+            rollup.evict(now)
+            summary = rollup.summary(now)
+            summary['vehicle'] = vehicle_id
+            summary['last_seen'] = self.last_seen[vehicle_id]
+
+        return summary
+
+    def vehicle_list(self, now=None):
+        """
+        Compact per-vehicle listing, highest event rate first.
+
+        Returns:
+            list: Dicts with vehicle, events_per_hour, mean PERCLOS and last_seen
+        """
+        now = now or time.time()
+        vehicles = []
+
+        with self.lock:
+            self._evict(now)
+            for vehicle_id, rollup in self.vehicles.items():
+                summary = rollup.summary(now)
+                vehicles.append({
+                    'vehicle': vehicle_id,
+                    'events_per_hour': summary['events_per_hour'],
+                    'perclos_mean': summary['perclos']['mean'],
+                    'alert_latency_mean': summary['alert_latency']['mean'],
+                    'last_seen': self.last_seen[vehicle_id]
+                })
+
+        vehicles.sort(key=lambda item: item['events_per_hour'], reverse=True)
+        return vehicles
+
+
+class _IngestHandler(socketserver.StreamRequestHandler):
+    """Reads newline-delimited JSON records from one client connection."""
+
+    # Set on the handler class by FleetAggregatorServer
+    aggregator = None
+
+    def handle(self):
+        """Ingest records until the client disconnects."""
+        for line in self.rfile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.aggregator.reject_record()
+                continue
+            self.aggregator.ingest(record)
+
+
+class _IngestServer(socketserver.ThreadingTCPServer):
+    """TCP server with one thread per client connection."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    # Whole fleets reconnect at once after an aggregator restart; a short
+    # accept backlog makes the kernel silently drop early data
+    request_queue_size = 1024
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    """Serves /fleet, /vehicles, /vehicles/<id> and /health."""
+
+    # Set on the handler class by FleetAggregatorServer
+    aggregator = None
+
+    def do_GET(self):
+        """Handle a GET request."""
+        path = self.path.split('?', 1)[0].rstrip('/')
+
+        if path in ('', '/fleet'):
+            document = self.aggregator.fleet_summary()
+        elif path == '/vehicles':
+            document = self.aggregator.vehicle_list()
+        elif path.startswith('/vehicles/'):
+            document = self.aggregator.vehicle_summary(path[len('/vehicles/'):])
+            if document is None:
+                self.send_error(404)
+                return
+        elif path == '/health':
+            document = {'ok': True}
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps(document).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Suppress per-request logging."""
+        pass
+
+
+class FleetAggregatorServer:
+    """
+    Runs the TCP ingest listener and the HTTP query server around one
+    FleetAggregator, each on a daemon thread.
+    """
+
+    def __init__(self, aggregator=None, host=None, ingest_port=None, query_port=None):
+        """
+        Initialize the servers.
+
+        Args:
+            aggregator: FleetAggregator to serve (created if None)
+            host: Interface to bind (default config.FLEET_AGGREGATOR_HOST)
+            ingest_port: TCP port for records (default config.FLEET_INGEST_PORT)
+            query_port: HTTP port for queries (default config.FLEET_QUERY_PORT)
+        """
+        self.aggregator = aggregator or FleetAggregator()
+        self.host = host or config.FLEET_AGGREGATOR_HOST
+        self.ingest_port = config.FLEET_INGEST_PORT if ingest_port is None else ingest_port
+        self.query_port = config.FLEET_QUERY_PORT if query_port is None else query_port
+        self.ingest_server = None
+        self.query_server = None
+        self.is_running = False
+
+    def start(self):
+        """
+        Start both servers.
+
+        Returns:
+            bool: True if both servers started
+        """
+        ingest_handler = type('IngestHandler', (_IngestHandler,), {'aggregator': self.aggregator})
+        query_handler = type('QueryHandler', (_QueryHandler,), {'aggregator': self.aggregator})
+
+        try:
+            self.ingest_server = _IngestServer((self.host, self.ingest_port), ingest_handler)
+            self.query_server = ThreadingHTTPServer((self.host, self.query_port), query_handler)
+        except OSError as e:
+            print(f"[ERROR] Could not start fleet aggregator on {self.host}: {e}")
+            # Neither server is serving yet, so there is nothing to shut down
+            for server in (self.ingest_server, self.query_server):
+                if server is not None:
+                    server.server_close()
+            self.ingest_server = None
+            self.query_server = None
+            return False
+
+        self.query_server.daemon_threads = True
+        self.ingest_port = self.ingest_server.server_address[1]
+        self.query_port = self.query_server.server_port
+
+        for server in (self.ingest_server, self.query_server):
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.is_running = True
+
+        print(f"[INFO] Fleet aggregator ingesting on tcp://{self.host}:{self.ingest_port}, "
+              f"queries on http://{self.host}:{self.query_port}/fleet")
+        return True
+
+    def stop(self):
+        """Stop both servers."""
+        for server in (self.ingest_server, self.query_server):
+            if server is not None:
+                # shutdown() waits for serve_forever(), so only call it once serving
+                if self.is_running:
+                    server.shutdown()
+                server.server_close()
+
+        self.ingest_server = None
+        self.query_server = None
+        self.is_running = False
+
+
+# ==================== SIMULATED CLIENTS ====================
+
+def _simulated_vehicle(client, rate, duration, rng):
+    """
+    Drive one FleetClient with synthetic detections.
+
+    Args:
+        client: Started FleetClient
+        rate: Records per second to generate
+        duration: Seconds to run
+        rng: random.Random for this vehicle
+    """
+    drowsiness = rng.uniform(0.0, 0.3)
+    end_time = time.monotonic() + duration
+    interval = 1.0 / rate
+
+    while time.monotonic() < end_time:
+        roll = rng.random()
+
+        if roll < 0.02 + drowsiness * 0.1:
+            now = time.monotonic()
+            client.record_event(['eyes_closed'], now - rng.uniform(0.5, 3.0))
+            client.record_alert(now)
+        else:
+            perclos = min(1.0, max(0.0, rng.gauss(drowsiness, 0.05)))
+            client.record_status(perclos, 0.3 - perclos * 0.1)
+
+        time.sleep(interval)
+
+
+def _run_simulated_clients(port, vehicles, duration, rate, results):
+    """
+    Child-process body: run simulated vehicles and report what they sent.
+
+    Args:
+        port: Aggregator ingest port on localhost
+        vehicles: Number of simulated vehicles
+        duration: Seconds to send records
+        rate: Records per second per vehicle
+        results: multiprocessing.Queue receiving (sent, dropped)
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        clients = [FleetClient(f"sim-{index:04d}", "127.0.0.1", port) for index in range(vehicles)]
+        threads = [
+            threading.Thread(target=_simulated_vehicle, args=(client, rate, duration, random.Random(index)))
+            for index, client in enumerate(clients)
+        ]
+
+        for client in clients:
+            client.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Let every sender flush at once
+        for client in clients:
+            client.is_running = False
+        for client in clients:
+            client.stop()
+
+    results.put((
+        sum(client.records_sent for client in clients),
+        sum(client.records_dropped for client in clients)
+    ))
+
+
+def run_simulation(vehicles, duration, rate, queries=200):
+    """
+    Run an aggregator against locally simulated detector clients.
+
+    The clients run in a separate process so they do not compete with the
+    aggregator for the interpreter lock; the ingest rate is the aggregator's
+    own single-process throughput.
+
+    Args:
+        vehicles: Number of simulated vehicles (one FleetClient each)
+        duration: Seconds the clients send records
+        rate: Records per second per vehicle
+        queries: Number of /fleet queries used to measure query latency
+
+    Returns:
+        dict: Throughput, query latency and the final fleet summary
+    """
+    server = FleetAggregatorServer(host="127.0.0.1", ingest_port=0, query_port=0)
+    if not server.start():
+        raise RuntimeError("Could not start the fleet aggregator")
+
+    aggregator = server.aggregator
+    results = multiprocessing.Queue()
+    client_process = multiprocessing.Process(
+        target=_run_simulated_clients, args=(server.ingest_port, vehicles, duration, rate, results)
+    )
+
+    start_time = time.perf_counter()
+    client_process.start()
+
+    # Query while ingest is running
+    query_url = f"http://127.0.0.1:{server.query_port}/fleet"
+    query_times = []
+    query_interval = duration / max(queries, 1)
+
+    for _ in range(queries):
+        query_start = time.perf_counter()
+        with urllib.request.urlopen(query_url) as response:
+            json.loads(response.read())
+        query_times.append(time.perf_counter() - query_start)
+        time.sleep(max(0.0, query_interval - query_times[-1]))
+
+    sent, dropped = results.get()
+    client_process.join()
+
+    # Wait for the aggregator to work through what is still in socket buffers
+    drain_deadline = time.monotonic() + 30.0
+    while aggregator.records_ingested + aggregator.records_rejected < sent and time.monotonic() < drain_deadline:
+        time.sleep(0.01)
+
+    elapsed = time.perf_counter() - start_time
+
+    query_times.sort()
+    summary = aggregator.fleet_summary()
+    server.stop()
+
+    return {
+        'vehicles': vehicles,
+        'elapsed': elapsed,
+        'sent': sent,
+        'dropped': dropped,
+        'ingested': aggregator.records_ingested,
+        'ingest_rate': aggregator.records_ingested / elapsed,
+        'query_p50_ms': query_times[len(query_times) // 2] * 1000.0 if query_times else None,
+        'query_p99_ms': query_times[int(len(query_times) * 0.99)] * 1000.0 if query_times else None,
+        'summary': summary
+    }
+
+
+def _format_value(value, spec):
+    """Format an optional number, 'n/a' if it is None."""
+    return format(value, spec) if value is not None else "n/a"
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Fleet event aggregator")
+    parser.add_argument('--host', help="Interface to bind")
+    parser.add_argument('--ingest-port', type=int, help="TCP port for detector records")
+    parser.add_argument('--query-port', type=int, help="HTTP port for rollup queries")
+    parser.add_argument('--simulate', type=int, metavar='VEHICLES',
+                        help="Run against this many simulated detector clients and report")
+    parser.add_argument('--duration', type=float, default=10.0, help="Simulation length (s)")
+    parser.add_argument('--rate', type=float, default=20.0, help="Records/s per simulated vehicle")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        report = run_simulation(args.simulate, args.duration, args.rate)
+        fleet = report['summary']
+        print("\n" + "=" * 60)
+        print("FLEET AGGREGATOR SIMULATION")
+        print("=" * 60)
+        print(f"Vehicles:       {report['vehicles']}")
+        print(f"Records:        {report['ingested']} ingested / {report['sent']} sent / "
+              f"{report['dropped']} dropped")
+        print(f"Ingest rate:    {report['ingest_rate']:.0f} records/s")
+        print(f"Query latency:  p50 {_format_value(report['query_p50_ms'], '.2f')} ms, "
+              f"p99 {_format_value(report['query_p99_ms'], '.2f')} ms")
+        print(f"Fleet events/h: {fleet['events_per_hour']:.0f}")
+        print(f"PERCLOS:        mean {_format_value(fleet['perclos']['mean'], '.3f')}, "
+              f"p95 <= {_format_value(fleet['perclos']['p95'], '')}")
+        print(f"Alert latency:  mean {_format_value(fleet['alert_latency']['mean'], '.2f')} s, "
+              f"p95 <= {_format_value(fleet['alert_latency']['p95'], '')} s")
+        return 0
+
+    server = FleetAggregatorServer(host=args.host, ingest_port=args.ingest_port, query_port=args.query_port)
+    if not server.start():
+        return 1
+
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        print("\n[INFO] Fleet aggregator stopped")
+    finally:
+        server.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Fleet Client Module
+Sends drowsiness events, alerts and periodic status records from one
+detector to the fleet aggregator as newline-delimited JSON over TCP
+"""
+
+import json
+import queue
+import socket
+import threading
+import time
+import config
+
+
+class FleetClient:
+    """
+    Reports one vehicle's detections to a FleetAggregator.
+
+    The frame loop only updates counters and queues small records; a sender
+    thread keeps one TCP connection open and reconnects when it drops. When
+    the aggregator is unreachable, records are dropped and counted rather
+    than buffered without bound.
+    """
+
+    def __init__(self, vehicle_id=None, host=None, port=None, status_interval=None):
+        """
+        Initialize the client.
+
+        Args:
+            vehicle_id: Identifier of this vehicle (default config.VEHICLE_ID)
+            host: Aggregator host (default config.FLEET_AGGREGATOR_HOST)
+            port: Aggregator ingest port (default config.FLEET_INGEST_PORT)
+            status_interval: Seconds between status records
+        """
+        self.vehicle_id = vehicle_id or config.VEHICLE_ID
+        self.host = host or config.FLEET_AGGREGATOR_HOST
+        self.port = config.FLEET_INGEST_PORT if port is None else port
+        self.status_interval = status_interval or config.FLEET_STATUS_INTERVAL
+
+        self.send_queue = queue.Queue(maxsize=config.FLEET_CLIENT_QUEUE_SIZE)
+        self.is_running = False
+        self.sender_thread = None
+        self.sock = None
+
+        # Frame-loop side accumulators for the next status record
+        self.interval_start = time.monotonic()
+        self.face_frames = 0
+        self.closed_frames = 0
+        self.ear_sum = 0.0
+        self.closure_start = None
+        self.event_start = None
+
+        # Statistics
+        self.records_sent = 0
+        self.records_dropped = 0
+
+    def start(self):
+        """Start the sender thread."""
+        self.is_running = True
+        self.sender_thread = threading.Thread(target=self._sender_loop, daemon=True)
+        self.sender_thread.start()
+        print(f"[INFO] Fleet reporting to {self.host}:{self.port} as '{self.vehicle_id}'")
+
+    # ==================== FRAME LOOP SIDE ====================
+
+    def record_frame(self, ear_value, eyes_closed, now=None):
+        """
+        Account one processed frame and send a status record when due.
+
+        Args:
+            ear_value: EAR fed to the detector, or None if no face
+            eyes_closed: Whether the eyes counted as closed this frame
+            now: Monotonic time (default now)
+        """
+        now = now or time.monotonic()
+
+        if ear_value is not None:
+            self.face_frames += 1
+            self.ear_sum += ear_value
+            if eyes_closed:
+                self.closed_frames += 1
+
+        # Onset of the current eye closure, for alert latency
+        if not eyes_closed:
+            self.closure_start = None
+        elif self.closure_start is None:
+            self.closure_start = now
+
+        if now - self.interval_start >= self.status_interval:
+            if self.face_frames:
+                self.record_status(self.closed_frames / self.face_frames, self.ear_sum / self.face_frames)
+
+            self.interval_start = now
+            self.face_frames = 0
+            self.closed_frames = 0
+            self.ear_sum = 0.0
+
+    def record_status(self, perclos, ear):
+        """
+        Report eye-closure statistics for the last status interval.
+
+        Args:
+            perclos: Fraction of face frames with the eyes closed
+            ear: Mean EAR over the interval
+        """
+        self._enqueue({'type': 'status', 'perclos': perclos, 'ear': ear})
+
+    def record_event(self, reasons, now=None):
+        """
+        Report the start of a drowsiness event.
+
+        Alert latency is measured from the onset of the eye closure that
+        led to the event when one is in progress, else from now.
+
+        Args:
+            reasons: Alert reasons of the event
+            now: Monotonic time the event started (default: closure onset or now)
+        """
+        self.event_start = now or self.closure_start or time.monotonic()
+        self._enqueue({'type': 'event', 'reasons': list(reasons)})
+
+    def record_alert(self, now=None):
+        """
+        Report an alert, with its latency from the start of the event.
+
+        Only the first alert of an event carries a latency; cooldown repeats
+        during the same event are reported without one, so they do not skew
+        the fleet latency distribution.
+
+        Args:
+            now: Monotonic time (default now)
+        """
+        now = now or time.monotonic()
+        latency = now - self.event_start if self.event_start is not None else None
+        self.event_start = None
+        self._enqueue({'type': 'alert', 'latency': latency})
+
+    def _enqueue(self, record):
+        """Queue a record without blocking."""
+        record['vehicle'] = self.vehicle_id
+        record['ts'] = time.time()
+
+        try:
+            self.send_queue.put_nowait(record)
+        except queue.Full:
+            self.records_dropped += 1
+
+    # ==================== SENDER THREAD ====================
+
+    def _sender_loop(self):
+        """Send queued records, reconnecting as needed."""
+        while self.is_running or not self.send_queue.empty():
+            try:
+                record = self.send_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # Send everything already queued in one write
+            batch = [record]
+            while len(batch) < 256:
+                try:
+                    batch.append(self.send_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            payload = ''.join(json.dumps(item) + '\n' for item in batch).encode('utf-8')
+
+            if self._send(payload):
+                self.records_sent += len(batch)
+            else:
+                self.records_dropped += len(batch)
+
+        self._disconnect()
+
+    def _send(self, payload):
+        """
+        Send a payload, opening the connection if needed.
+
+        Returns:
+            bool: True if the payload was sent
+        """
+        for _ in range(2):
+            try:
+                if self.sock is None:
+                    self.sock = socket.create_connection((self.host, self.port), timeout=2.0)
+                self.sock.sendall(payload)
+                return True
+            except OSError:
+                self._disconnect()
+
+        # Aggregator unreachable - back off briefly before the next batch
+        time.sleep(1.0)
+        return False
+
+    def _disconnect(self):
+        """Close the connection, if open."""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def get_statistics(self):
+        """
+        Get client statistics.
+
+        Returns:
+            dict: Records sent, dropped and queued
+        """
+        return {
+            'sent': self.records_sent,
+            'dropped': self.records_dropped,
+            'queued': self.send_queue.qsize()
+        }
+
+    def stop(self):
+        """Flush queued records and stop the sender thread."""
+        self.is_running = False
+        if self.sender_thread is not None:
+            self.sender_thread.join(timeout=3.0)
+            self.sender_thread = None
@@ -0,0 +1,224 @@
+"""
+Status Server Module
+Optional embedded HTTP server exposing live detection status as JSON and
+Prometheus text, read from immutable snapshots published by the frame loop
+"""
+
+import json
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import config
+
+
+# One frame's worth of status. Tuples are immutable, so a published snapshot
+# can be read from any thread without locking.
+StatusSnapshot = namedtuple('StatusSnapshot', [
+    'timestamp',          # Wall-clock time the snapshot was published
+    'frames_processed',   # Frames processed since start
+    'fps',                # Processed frames per second
+    'ear',                # Current EAR value (0.0 if no face)
+    'face_detected',      # Whether the last frame had a face
+    'detector_status',    # DrowsinessDetector.get_status() dict
+    'alert_count'         # AlertManager.get_alert_count()
+])
+
+
+class StatusPublisher:
+    """
+    Holds the latest status snapshot.
+
+    The frame loop replaces the snapshot reference once per frame; readers
+    just read the reference. Rebinding an attribute is atomic in CPython, so
+    neither side ever takes a lock or waits for the other.
+    """
+
+    def __init__(self):
+        """Initialize the publisher with no snapshot yet."""
+        self.start_time = time.time()
+        self.frames_processed = 0
+        self.snapshot = None
+
+    def publish(self, fps, ear, face_detected, detector_status, alert_count):
+        """
+        Publish the status of the frame that was just processed.
+
+        Args:
+            fps: Processed frames per second
+            ear: Current EAR value
+            face_detected: Whether a face was found
+            detector_status: Dict from DrowsinessDetector.get_status()
+            alert_count: Total alerts played
+        """
+        self.frames_processed += 1
+        self.snapshot = StatusSnapshot(
+            time.time(), self.frames_processed, fps, ear, face_detected, detector_status, alert_count
+        )
+
+    def get_uptime(self):
+        """
+        Get the seconds since the publisher was created.
+
+        Returns:
+            float: Uptime in seconds
+        """
+        return time.time() - self.start_time
+
+
+def snapshot_to_dict(snapshot, uptime):
+    """
+    Convert a snapshot to a JSON-serializable dict.
+
+    Args:
+        snapshot: StatusSnapshot, or None before the first frame
+        uptime: Seconds since start
+
+    Returns:
+        dict: Status document
+    """
+    if snapshot is None:
+        return {'uptime_seconds': uptime, 'ready': False}
+
+    return {
+        'ready': True,
+        'uptime_seconds': uptime,
+        'timestamp': snapshot.timestamp,
+        'frames_processed': snapshot.frames_processed,
+        'fps': snapshot.fps,
+        'ear': snapshot.ear,
+        'face_detected': snapshot.face_detected,
+        'detector': snapshot.detector_status,
+        'alert_count': snapshot.alert_count
+    }
+
+
+def snapshot_to_prometheus(snapshot, uptime):
+    """
+    Render a snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: StatusSnapshot, or None before the first frame
+        uptime: Seconds since start
+
+    Returns:
+        str: Metrics text
+    """
+    metrics = [
+        ('drowsiness_uptime_seconds', 'gauge', 'Seconds since the detector started', uptime)
+    ]
+
+    if snapshot is not None:
+        status = snapshot.detector_status
+        metrics += [
+            ('drowsiness_frames_processed_total', 'counter', 'Frames processed', snapshot.frames_processed),
+            ('drowsiness_fps', 'gauge', 'Processed frames per second', snapshot.fps),
+            ('drowsiness_ear', 'gauge', 'Current eye aspect ratio', snapshot.ear),
+            ('drowsiness_face_detected', 'gauge', 'Whether a face is detected', int(snapshot.face_detected)),
+            ('drowsiness_is_drowsy', 'gauge', 'Whether the driver is drowsy', int(status['is_drowsy'])),
+            ('drowsiness_closed_frames', 'gauge', 'Consecutive closed-eye frames', status['frame_counter']),
+            ('drowsiness_events_total', 'counter', 'Drowsiness events', status['total_events']),
+            ('drowsiness_yawns_total', 'counter', 'Yawns detected', status.get('total_yawns', 0)),
+            ('drowsiness_nods_total', 'counter', 'Head nods detected', status.get('total_nods', 0)),
+            ('drowsiness_alerts_total', 'counter', 'Alerts played', snapshot.alert_count),
+            ('drowsiness_ear_threshold', 'gauge', 'Configured EAR threshold', status['ear_threshold'])
+        ]
+
+    lines = []
+    for name, metric_type, help_text, value in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+class _StatusRequestHandler(BaseHTTPRequestHandler):
+    """Serves /status (JSON), /metrics (Prometheus) and /health."""
+
+    # Set on the server class by StatusServer
+    publisher = None
+
+    def do_GET(self):
+        """Handle a GET request."""
+        # Grab the reference once so the whole response uses one snapshot
+        snapshot = self.publisher.snapshot
+        uptime = self.publisher.get_uptime()
+        path = self.path.split('?', 1)[0]
+
+        if path in ('/', '/status'):
+            body = json.dumps(snapshot_to_dict(snapshot, uptime)).encode('utf-8')
+            content_type = 'application/json'
+        elif path == '/metrics':
+            body = snapshot_to_prometheus(snapshot, uptime).encode('utf-8')
+            content_type = 'text/plain; version=0.0.4'
+        elif path == '/health':
+            body = b'ok\n'
+            content_type = 'text/plain'
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Suppress per-request logging (scrapers poll frequently)."""
+        pass
+
+
+class StatusServer:
+    """
+    Embedded HTTP server for fleet monitoring.
+
+    Runs on a daemon thread and only reads the publisher's current snapshot,
+    so scrapes never block or slow down the frame loop.
+    """
+
+    def __init__(self, publisher, host=None, port=None):
+        """
+        Initialize the status server.
+
+        Args:
+            publisher: StatusPublisher updated by the frame loop
+            host: Interface to bind (default config.STATUS_SERVER_HOST)
+            port: TCP port (default config.STATUS_SERVER_PORT)
+        """
+        self.publisher = publisher
+        self.host = host or config.STATUS_SERVER_HOST
+        self.port = config.STATUS_SERVER_PORT if port is None else port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """
+        Start serving in the background.
+
+        Returns:
+            bool: True if the server started
+        """
+        handler = type('StatusRequestHandler', (_StatusRequestHandler,), {'publisher': self.publisher})
+
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError as e:
+            print(f"[ERROR] Could not start status server on {self.host}:{self.port}: {e}")
+            return False
+
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+        print(f"[INFO] Status server listening on http://{self.host}:{self.httpd.server_port}/status")
+        return True
+
+    def stop(self):
+        """Stop the server."""
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+            print("[INFO] Status server stopped")
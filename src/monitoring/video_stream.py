@@ -0,0 +1,266 @@
+"""
+Video Stream Module
+Optional MJPEG endpoint streaming the annotated feed to remote viewers, with
+one shared JPEG encode per frame and latest-frame-wins delivery per client
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import cv2
+import config
+
+
+BOUNDARY = b'frame'
+
+VIEWER_PAGE = b"""<!DOCTYPE html>
+<html><head><title>Driver Drowsiness Detection</title></head>
+<body style="margin:0;background:#000"><img src="/stream.mjpg" style="width:100%"></body></html>
+"""
+
+
+class VideoStreamer:
+    """
+    Encodes displayed frames to JPEG for any number of MJPEG viewers.
+
+    The display side only hands over a frame reference. An encoder thread
+    downscales to STREAM_MAX_WIDTH, encodes at most STREAM_MAX_FPS frames per
+    second, and only while someone is watching. Every viewer is served from
+    the same encoded buffer; a viewer that falls behind simply skips to the
+    newest frame, so nothing queues up and the pipeline never waits.
+    """
+
+    def __init__(self, host=None, port=None, max_width=None, quality=None, max_fps=None):
+        """
+        Initialize the streamer.
+
+        Args:
+            host: Interface to bind (default config.STREAM_HOST)
+            port: TCP port (default config.STREAM_PORT)
+            max_width: Frames wider than this are downscaled
+            quality: JPEG quality (0-100)
+            max_fps: Maximum encoded frames per second
+        """
+        self.host = host or config.STREAM_HOST
+        self.port = config.STREAM_PORT if port is None else port
+        self.max_width = max_width or config.STREAM_MAX_WIDTH
+        self.quality = quality or config.STREAM_JPEG_QUALITY
+        self.min_interval = 1.0 / (max_fps or config.STREAM_MAX_FPS)
+
+        # Latest submitted frame (display side) and latest encoded frame
+        self.pending_frame = None
+        self.frame_ready = threading.Event()
+        self.jpeg = None
+        self.sequence = 0
+        self.jpeg_condition = threading.Condition()
+
+        self.viewers = 0
+        self.viewer_lock = threading.Lock()
+        self.is_running = False
+        self.encoder_thread = None
+        self.httpd = None
+
+        # Statistics
+        self.frames_encoded = 0
+        self.encode_time = 0.0
+
+    def start(self):
+        """
+        Start the HTTP server and the encoder thread.
+
+        Returns:
+            bool: True if the server started
+        """
+        handler = type('StreamRequestHandler', (_StreamRequestHandler,), {'streamer': self})
+
+        try:
+            self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError as e:
+            print(f"[ERROR] Could not start video stream on {self.host}:{self.port}: {e}")
+            return False
+
+        self.httpd.daemon_threads = True
+        self.is_running = True
+        self.encoder_thread = threading.Thread(target=self._encoder_loop, daemon=True)
+        self.encoder_thread.start()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+        print(f"[INFO] Video stream on http://{self.host}:{self.httpd.server_port}/")
+        return True
+
+    def submit(self, frame):
+        """
+        Offer an annotated frame. Never blocks or copies.
+
+        The frame must not be modified afterwards; the display side hands
+        over frames it has finished drawing on.
+
+        Args:
+            frame: BGR frame with overlays
+        """
+        if self.viewers == 0:
+            return
+
+        self.pending_frame = frame
+        self.frame_ready.set()
+
+    def _encoder_loop(self):
+        """Encode the newest submitted frame, rate-limited."""
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), int(self.quality)]
+        last_encode = 0.0
+
+        while self.is_running:
+            if not self.frame_ready.wait(timeout=0.5):
+                continue
+
+            # Respect the frame rate cap; newer frames replace older ones meanwhile
+            delay = self.min_interval - (time.monotonic() - last_encode)
+            if delay > 0:
+                time.sleep(delay)
+
+            self.frame_ready.clear()
+            frame = self.pending_frame
+            if frame is None:
+                continue
+
+            start_time = time.perf_counter()
+            height, width = frame.shape[:2]
+            if width > self.max_width:
+                scale = self.max_width / width
+                frame = cv2.resize(frame, (self.max_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+
+            ok, buffer = cv2.imencode('.jpg', frame, params)
+            last_encode = time.monotonic()
+            if not ok:
+                continue
+
+            self.encode_time += time.perf_counter() - start_time
+            self.frames_encoded += 1
+
+            with self.jpeg_condition:
+                self.jpeg = buffer.tobytes()
+                self.sequence += 1
+                self.jpeg_condition.notify_all()
+
+    def wait_for_frame(self, last_sequence, timeout=2.0):
+        """
+        Wait for an encoded frame newer than the one a viewer last sent.
+
+        Args:
+            last_sequence: Sequence number the viewer already has
+            timeout: Seconds to wait
+
+        Returns:
+            tuple: (sequence, jpeg bytes), or (last_sequence, None) on timeout
+        """
+        with self.jpeg_condition:
+            self.jpeg_condition.wait_for(
+                lambda: self.sequence != last_sequence or not self.is_running, timeout=timeout
+            )
+            if self.sequence == last_sequence:
+                return last_sequence, None
+            return self.sequence, self.jpeg
+
+    def add_viewer(self, delta):
+        """Count a viewer connecting (+1) or disconnecting (-1)."""
+        with self.viewer_lock:
+            self.viewers += delta
+
+    def get_statistics(self):
+        """
+        Get streaming statistics.
+
+        Returns:
+            dict: Viewers, frames encoded and average encode time (ms)
+        """
+        return {
+            'viewers': self.viewers,
+            'encoded': self.frames_encoded,
+            'encode_ms': (self.encode_time / self.frames_encoded * 1000.0) if self.frames_encoded else 0.0
+        }
+
+    def stop(self):
+        """Stop the server and the encoder thread."""
+        self.is_running = False
+        self.frame_ready.set()
+
+        with self.jpeg_condition:
+            self.jpeg_condition.notify_all()
+
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+            print("[INFO] Video stream stopped")
+
+
+class _StreamRequestHandler(BaseHTTPRequestHandler):
+    """Serves / (viewer page), /stream.mjpg and /snapshot.jpg."""
+
+    # Set on the handler class by VideoStreamer
+    streamer = None
+
+    def do_GET(self):
+        """Handle a GET request."""
+        path = self.path.split('?', 1)[0]
+
+        if path == '/':
+            self._send_body(VIEWER_PAGE, 'text/html')
+        elif path == '/snapshot.jpg':
+            self._send_snapshot()
+        elif path == '/stream.mjpg':
+            self._send_stream()
+        else:
+            self.send_error(404)
+
+    def _send_body(self, body, content_type):
+        """Send a complete response."""
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_snapshot(self):
+        """Send a freshly encoded frame as a single JPEG."""
+        streamer = self.streamer
+        streamer.add_viewer(1)
+        try:
+            # Frames are only encoded while someone watches, so wait for a new one
+            _, jpeg = streamer.wait_for_frame(streamer.sequence)
+        finally:
+            streamer.add_viewer(-1)
+
+        if jpeg is None:
+            self.send_error(503, "No frame available")
+            return
+        self._send_body(jpeg, 'image/jpeg')
+
+    def _send_stream(self):
+        """Send frames as multipart MJPEG until the viewer disconnects."""
+        streamer = self.streamer
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=' + BOUNDARY.decode())
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        streamer.add_viewer(1)
+        sequence = 0
+
+        try:
+            while streamer.is_running:
+                sequence, jpeg = streamer.wait_for_frame(sequence)
+                if jpeg is None:
+                    continue
+
+                # Blocks only this viewer's thread; it then jumps to the newest frame
+                self.wfile.write(b'--' + BOUNDARY + b'\r\nContent-Type: image/jpeg\r\nContent-Length: '
+                                 + str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            streamer.add_viewer(-1)
+
+    def log_message(self, format, *args):
+        """Suppress per-request logging."""
+        pass
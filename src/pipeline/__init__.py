@@ -0,0 +1,15 @@
+"""
+__init__.py for pipeline module
+Makes the pipeline package importable
+"""
+
+from .shared_frame_ring import SharedFrameRing
+from .reorder_buffer import ReorderBuffer
+from .inference_process import InferenceProcess
+from .headless import HeadlessPipeline
+from .duty_cycle import DutyCycleController
+from .inference_server import InferenceServer
+from .inference_client import RemoteFaceEyeDetector
+
+__all__ = ['SharedFrameRing', 'ReorderBuffer', 'InferenceProcess', 'HeadlessPipeline', 'DutyCycleController',
+           'InferenceServer', 'RemoteFaceEyeDetector']
@@ -0,0 +1,226 @@
+"""
+Duty Cycle Module
+Risk-adaptive frame sampling that lowers the inference rate while the driver
+is clearly alert and returns to full rate as soon as risk appears
+"""
+
+from collections import deque
+import config
+
+
+# Sampling modes
+MODE_FULL = 'full'
+MODE_LOW = 'low'
+
+
+class DutyCycleController:
+    """
+    Decides which frames get face mesh inference.
+
+    At full rate every frame is processed. After DUTY_CYCLE_CALM_SECONDS of
+    low risk the controller drops to DUTY_CYCLE_LOW_FPS. Any of the following
+    on a processed frame switches back to full rate for the very next frame:
+
+    - the face is lost
+    - the eyes are counted as closed or the detector is drowsy
+    - EAR is within DUTY_CYCLE_EAR_MARGIN of the detector threshold
+    - the recent EAR trend projects into that margin within two low-rate periods
+    - the blink rate exceeds DUTY_CYCLE_MAX_BLINK_RATE
+
+    The extra detection delay for a closure that starts in low-rate mode is
+    bounded by one low-rate period; the closed-eye frame count only starts
+    once full rate has resumed, so alert timing is otherwise unchanged.
+    """
+
+    def __init__(self, low_fps=None, calm_seconds=None, ear_margin=None, trend_window=None):
+        """
+        Initialize the duty cycle controller.
+
+        Args:
+            low_fps: Inference rate used while risk is low
+            calm_seconds: Seconds of low risk required before dropping rate
+            ear_margin: EAR distance above the threshold treated as risky
+            trend_window: Number of recent EAR samples used for the trend
+        """
+        low_fps = low_fps or config.DUTY_CYCLE_LOW_FPS
+        self.low_interval = 1.0 / low_fps
+        self.calm_seconds = config.DUTY_CYCLE_CALM_SECONDS if calm_seconds is None else calm_seconds
+        self.ear_margin = config.DUTY_CYCLE_EAR_MARGIN if ear_margin is None else ear_margin
+
+        self.mode = MODE_FULL
+        self.calm_since = None
+        self.last_processed = None
+        self.risk_reason = 'startup'
+
+        # Recent (timestamp, ear) samples for the trend estimate
+        self.recent_ear = deque(maxlen=trend_window or config.DUTY_CYCLE_TREND_WINDOW)
+
+        # Blink tracking (closed -> open transitions of the detector)
+        self.eyes_were_closed = False
+        self.blink_times = deque()
+
+        # Statistics
+        self.frames_seen = 0
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        self.wakeups = 0
+        self.inference_time = 0.0
+        self.inference_samples = 0
+
+    def should_process(self, timestamp):
+        """
+        Decide whether a frame should get inference.
+
+        Args:
+            timestamp: Capture timestamp of the frame in seconds
+
+        Returns:
+            bool: True to run inference, False to skip the frame
+        """
+        self.frames_seen += 1
+
+        due = (
+            self.mode == MODE_FULL
+            or self.last_processed is None
+            or timestamp - self.last_processed >= self.low_interval * 0.95
+        )
+
+        if not due:
+            self.frames_skipped += 1
+            return False
+
+        self.last_processed = timestamp
+        self.frames_processed += 1
+        return True
+
+    def update(self, timestamp, ear_value, face_detected, drowsiness_detector):
+        """
+        Re-evaluate risk after a processed frame.
+
+        Args:
+            timestamp: Capture timestamp of the frame in seconds
+            ear_value: EAR passed to the detector (None if no face)
+            face_detected: Whether a face was found
+            drowsiness_detector: DrowsinessDetector updated with this frame
+        """
+        reason = self._assess_risk(timestamp, ear_value, face_detected, drowsiness_detector)
+        self.risk_reason = reason
+
+        if reason is not None:
+            if self.mode == MODE_LOW:
+                self.wakeups += 1
+                print(f"[INFO] Duty cycle: full rate ({reason})")
+            self.mode = MODE_FULL
+            self.calm_since = None
+            return
+
+        if self.calm_since is None:
+            self.calm_since = timestamp
+        elif self.mode == MODE_FULL and timestamp - self.calm_since >= self.calm_seconds:
+            self.mode = MODE_LOW
+            print(f"[INFO] Duty cycle: low rate ({1.0 / self.low_interval:.0f} FPS)")
+
+    def _assess_risk(self, timestamp, ear_value, face_detected, drowsiness_detector):
+        """
+        Check the current frame for signs that full-rate sampling is needed.
+
+        Returns:
+            str: Reason full rate is needed
+            None: If risk is low
+        """
+        if not face_detected or ear_value is None:
+            self.recent_ear.clear()
+            return 'face_lost'
+
+        eyes_closed = drowsiness_detector.frame_counter > 0
+        if self.eyes_were_closed and not eyes_closed:
+            self.blink_times.append(timestamp)
+        self.eyes_were_closed = eyes_closed
+
+        while self.blink_times and timestamp - self.blink_times[0] > 60.0:
+            self.blink_times.popleft()
+
+        self.recent_ear.append((timestamp, ear_value))
+
+        if eyes_closed or drowsiness_detector.is_drowsy:
+            return 'eyes_closed'
+
+        floor = drowsiness_detector.ear_threshold + self.ear_margin
+        if ear_value < floor:
+            return 'ear_near_threshold'
+
+        if self._projected_ear(2.0 * self.low_interval) < floor:
+            return 'ear_trend'
+
+        if len(self.blink_times) > config.DUTY_CYCLE_MAX_BLINK_RATE:
+            return 'blink_rate'
+
+        return None
+
+    def _projected_ear(self, horizon):
+        """
+        Extrapolate EAR with a least-squares line over the recent samples.
+
+        Args:
+            horizon: Seconds ahead of the latest sample
+
+        Returns:
+            float: Projected EAR (latest EAR if there is no usable trend)
+        """
+        latest_time, latest_ear = self.recent_ear[-1]
+        count = len(self.recent_ear)
+        if count < 3:
+            return latest_ear
+
+        mean_t = sum(t for t, _ in self.recent_ear) / count
+        mean_e = sum(e for _, e in self.recent_ear) / count
+        var_t = sum((t - mean_t) ** 2 for t, _ in self.recent_ear)
+        if var_t <= 0:
+            return latest_ear
+
+        slope = sum((t - mean_t) * (e - mean_e) for t, e in self.recent_ear) / var_t
+        return latest_ear + min(slope, 0.0) * horizon
+
+    def record_inference_cost(self, seconds):
+        """
+        Record the cost of one inference, for the savings estimate.
+
+        Args:
+            seconds: Time spent on face mesh inference for a frame
+        """
+        self.inference_time += seconds
+        self.inference_samples += 1
+
+    def get_statistics(self):
+        """
+        Get sampling statistics and the estimated savings.
+
+        Returns:
+            dict: Frames seen / processed / skipped, wakeups, and the CPU time
+                  and energy saved by skipped inferences
+        """
+        mean_cost = self.inference_time / self.inference_samples if self.inference_samples else 0.0
+        cpu_saved = self.frames_skipped * mean_cost
+
+        return {
+            'mode': self.mode,
+            'risk_reason': self.risk_reason,
+            'seen': self.frames_seen,
+            'processed': self.frames_processed,
+            'skipped': self.frames_skipped,
+            'skip_ratio': self.frames_skipped / self.frames_seen if self.frames_seen else 0.0,
+            'wakeups': self.wakeups,
+            'inference_ms': mean_cost * 1000.0,
+            'cpu_saved_s': cpu_saved,
+            'energy_saved_j': cpu_saved * config.DUTY_CYCLE_INFERENCE_POWER_W
+        }
+
+    def reset(self):
+        """Return to full rate and clear risk history."""
+        self.mode = MODE_FULL
+        self.calm_since = None
+        self.last_processed = None
+        self.risk_reason = 'reset'
+        self.recent_ear.clear()
+        self.blink_times.clear()
+        self.eyes_were_closed = False
@@ -0,0 +1,15 @@
+"""
+Frame Result Module
+Compact per-frame record produced by inference and detection
+"""
+
+from collections import namedtuple
+
+
+# Everything needed to draw overlays or report on a frame, without the pixels.
+#   timestamp:    Capture timestamp of the frame
+#   landmarks:    Facial landmark array, or None if no face was found
+#   ear:          EAR fed to the detector (after conditioning), or None
+#   is_drowsy:    Detector state after this frame
+#   face_detected: Whether inference found a face
+FrameResult = namedtuple('FrameResult', ['timestamp', 'landmarks', 'ear', 'is_drowsy', 'face_detected'])
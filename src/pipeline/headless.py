@@ -0,0 +1,194 @@
+"""
+Headless Pipeline Module
+The detection pipeline without the Tk window, for diagnostics and harnesses
+"""
+
+import time
+import cv2
+from PIL import Image
+import config
+from src.detection.drowsiness_detector import DrowsinessDetector
+from src.detection.shadow_policies import ShadowPolicyEvaluator
+from src.detection.face_tracker import FaceTracker
+from src.detection.signal_conditioning import EARSignalConditioner
+from src.detection.motion_gate import MotionGate
+from src.pipeline.duty_cycle import DutyCycleController
+from src.alert.alert_manager import AlertManager
+
+
+class HeadlessPipeline:
+    """
+    Runs FaceEyeDetector -> DrowsinessDetector -> AlertManager on frames or
+    on precomputed features, the same way DrowsinessDetectionApp does, but
+    without a GUI.
+    """
+
+    def __init__(self, face_detector=None, drowsiness_detector=None, alert_manager=None,
+                 use_face_detector=True, render=False):
+        """
+        Initialize the headless pipeline.
+
+        Args:
+            face_detector: FaceEyeDetector to use (created if needed)
+            drowsiness_detector: DrowsinessDetector to use (created if None)
+            alert_manager: AlertManager to use (created if None)
+            use_face_detector: False to only feed precomputed features
+            render: Also run the GUI's BGR -> RGB -> PIL image conversion
+        """
+        if face_detector is None and use_face_detector:
+            # Imported here so feature-only runs do not load MediaPipe
+            if config.INFERENCE_MODE == "server":
+                from src.pipeline.inference_client import RemoteFaceEyeDetector
+                face_detector = RemoteFaceEyeDetector()
+            else:
+                from src.detection.face_eye_detector import FaceEyeDetector
+                face_detector = FaceEyeDetector()
+
+        self.face_detector = face_detector
+        self.drowsiness_detector = drowsiness_detector or DrowsinessDetector()
+        self.alert_manager = alert_manager or AlertManager()
+        self.signal_conditioner = EARSignalConditioner() if config.ENABLE_SIGNAL_CONDITIONING else None
+        self.motion_gate = MotionGate() if config.ENABLE_MOTION_GATE else None
+        self.duty_cycle = DutyCycleController() if config.ENABLE_DUTY_CYCLE else None
+        self.shadow_policies = ShadowPolicyEvaluator(self.drowsiness_detector) if config.ENABLE_SHADOW_POLICIES else None
+        self.face_tracker = None
+        if config.MAX_NUM_FACES > 1 and hasattr(self.face_detector, 'analyze_faces'):
+            self.face_tracker = FaceTracker()
+        self.render = render
+
+        self.frames_processed = 0
+        self.alerts_played = 0
+        self.last_image = None
+        self.last_result = None
+
+    def process_frame(self, frame, timestamp=None):
+        """
+        Run inference and detection on one frame.
+
+        Args:
+            frame: BGR video frame
+            timestamp: Capture timestamp of the frame
+
+        Returns:
+            dict: Frame result (see process_features). Frames skipped by the
+                  duty cycle repeat the previous result with processed=False
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        if self.duty_cycle is not None and not self.duty_cycle.should_process(timestamp):
+            if self.last_result is None:
+                return None
+            return dict(self.last_result, timestamp=timestamp, alert=False, processed=False)
+
+        cached = self.motion_gate.lookup(frame) if self.motion_gate is not None else None
+
+        if cached is not None:
+            landmarks, features = cached
+        else:
+            start_time = time.perf_counter()
+            if self.face_tracker is not None:
+                landmarks, features = self._analyze_occupants(frame)
+            else:
+                landmarks, features = self.face_detector.analyze_frame(frame)
+            if self.duty_cycle is not None:
+                self.duty_cycle.record_inference_cost(time.perf_counter() - start_time)
+            if self.motion_gate is not None:
+                self.motion_gate.update(frame, landmarks, features)
+
+        result = self.process_features(landmarks, features, timestamp)
+
+        if self.render:
+            self.render_frame(frame)
+
+        return result
+
+    def _analyze_occupants(self, frame):
+        """
+        Run multi-face inference and pick out the driver.
+
+        Returns:
+            tuple: (landmarks, features) of the driver, or (None, None)
+        """
+        all_landmarks, all_features = self.face_detector.analyze_faces(frame)
+        landmarks, features, changed = self.face_tracker.update(all_landmarks, all_features, frame.shape)
+
+        if changed:
+            self.drowsiness_detector.reset()
+            if self.signal_conditioner is not None:
+                self.signal_conditioner.reset()
+
+        return landmarks, features
+
+    def render_frame(self, frame):
+        """
+        Convert a frame the same way the GUI does for every displayed frame.
+
+        Args:
+            frame: BGR video frame
+
+        Returns:
+            PIL.Image.Image: RGB image (also kept as last_image)
+        """
+        self.last_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        return self.last_image
+
+    def process_features(self, landmarks, features, timestamp=None):
+        """
+        Run detection on inference output.
+
+        Args:
+            landmarks: Facial landmarks, or None if no face was found
+            features: Fatigue features from FeatureExtractor, or None
+            timestamp: Capture timestamp of the frame
+
+        Returns:
+            dict: ear, is_drowsy, alert (whether an alert was played), face_detected, processed
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        ear_value = features['ear'] if features is not None else None
+        eyes_closed = None
+
+        if self.signal_conditioner is not None:
+            ear_value, eyes_closed = self.signal_conditioner.process(
+                ear_value, timestamp, self.drowsiness_detector.ear_threshold
+            )
+
+        is_drowsy = False
+        alert = False
+
+        if ear_value is not None:
+            is_drowsy = self.drowsiness_detector.update(ear_value, features, eyes_closed)
+            if self.shadow_policies is not None:
+                self.shadow_policies.update(ear_value, eyes_closed, timestamp)
+
+            if self.drowsiness_detector.should_play_alert():
+                alert = self.alert_manager.play_alert()
+                self.alerts_played += int(alert)
+
+        if self.duty_cycle is not None:
+            self.duty_cycle.update(timestamp, ear_value, landmarks is not None, self.drowsiness_detector)
+
+        self.frames_processed += 1
+
+        self.last_result = {
+            'timestamp': timestamp,
+            'ear': ear_value,
+            'is_drowsy': is_drowsy,
+            'alert': alert,
+            'face_detected': landmarks is not None,
+            'processed': True
+        }
+        return self.last_result
+
+    def cleanup(self):
+        """Release detector and audio resources."""
+        if self.shadow_policies is not None:
+            self.shadow_policies.close()
+
+        if self.face_detector is not None:
+            self.face_detector.cleanup()
+
+        self.alert_manager.cleanup()
@@ -0,0 +1,331 @@
+"""
+Inference Client Module
+FaceEyeDetector-compatible proxy that sends frames to a shared local
+inference server instead of loading its own MediaPipe model
+"""
+
+import time
+from multiprocessing.connection import Client
+import cv2
+import numpy as np
+import config
+from src.detection.feature_extractor import FeatureExtractor
+from src.detection.low_light import LowLightEnhancer
+from src.pipeline.shared_frame_ring import SharedFrameRing
+from src.pipeline.inference_server import STATUS_OK, STATUS_OVERLOADED
+
+
+class RemoteFaceEyeDetector:
+    """
+    Drop-in replacement for FaceEyeDetector backed by an InferenceServer.
+
+    Frames are copied into a shared-memory slot owned by this process; only
+    the slot number crosses the socket and only the landmark array comes
+    back. Features and low-light enhancement, which need per-stream state,
+    are computed locally. A frame the server refuses as overloaded, or does
+    not answer in time, is reported as no face, like a landmark dropout.
+
+    The server returns every face it found; analyze_faces hands them all to
+    a FaceTracker, while analyze_frame keeps the single-face behaviour.
+
+    A slot is not written again until the server has answered the request
+    that used it, even if that answer arrives after the client gave up, so
+    a worker never reads a frame that is being overwritten.
+    """
+
+    # MediaPipe landmark indices for eyes (same as FaceEyeDetector)
+    LEFT_EYE = FeatureExtractor.LEFT_EYE
+    RIGHT_EYE = FeatureExtractor.RIGHT_EYE
+
+    def __init__(self, socket_path=None, timeout=None):
+        """
+        Connect to the inference server.
+
+        Args:
+            socket_path: Server socket (default config.INFERENCE_SERVER_SOCKET)
+            timeout: Seconds to wait for a reply (default config.INFERENCE_SERVER_TIMEOUT)
+
+        Raises:
+            ConnectionError: If the server is not running
+        """
+        self.socket_path = socket_path or config.INFERENCE_SERVER_SOCKET
+        self.timeout = timeout or config.INFERENCE_SERVER_TIMEOUT
+
+        self.feature_extractor = FeatureExtractor()
+        self.low_light_enhancer = LowLightEnhancer() if config.ENABLE_LOW_LIGHT_ENHANCEMENT else None
+
+        self.conn = None
+        self.ring = None
+        self.free_slots = []
+        self.outstanding = {}  # request id -> slot, until the server replies
+        self.next_request_id = 0
+        self.last_reconnect = 0.0
+        self.predictor_loaded = True
+
+        # Statistics
+        self.requests = 0
+        self.overloaded = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.last_wait_ms = 0.0
+
+        try:
+            self.conn = Client(self.socket_path, family='AF_UNIX')
+        except OSError as e:
+            raise ConnectionError(f"Inference server not reachable at {self.socket_path}: {e}") from e
+
+        print(f"[INFO] Using shared inference server at {self.socket_path}")
+
+    def analyze_frame(self, frame):
+        """
+        Run face mesh inference on the server and extract fatigue features.
+
+        Args:
+            frame: Input image frame (BGR format)
+
+        Returns:
+            tuple: (landmarks, features) - both None if no face was found
+                   or the server could not serve the frame
+        """
+        all_landmarks = self._analyze(frame)
+        if not len(all_landmarks):
+            return None, None
+
+        return all_landmarks[0], self.feature_extractor.extract(all_landmarks[0])
+
+    def analyze_faces(self, frame):
+        """
+        Run face mesh inference on the server and extract features for every face.
+
+        Args:
+            frame: Input image frame (BGR format)
+
+        Returns:
+            tuple: (landmarks, features) - an array of shape (faces, points, 2)
+                   and a list with one feature dict per face
+        """
+        all_landmarks = self._analyze(frame)
+        return all_landmarks, self.feature_extractor.extract_batch(all_landmarks)
+
+    def _analyze(self, frame):
+        """
+        Enhance a frame, get the landmarks of every face and update the
+        low-light region.
+
+        Returns:
+            numpy.ndarray: Landmarks of shape (faces, points, 2); no faces
+                           when the server could not serve the frame
+        """
+        if self.low_light_enhancer is not None:
+            frame = self.low_light_enhancer.enhance(frame)
+
+        all_landmarks = self._request_landmarks(frame)
+        if all_landmarks is None:
+            all_landmarks = np.empty((0, 0, 2), dtype=int)
+
+        if self.low_light_enhancer is not None:
+            self.low_light_enhancer.update_region(all_landmarks[0] if len(all_landmarks) else None, frame.shape)
+
+        return all_landmarks
+
+    def _request_landmarks(self, frame):
+        """
+        Send one frame to the server and wait for the landmarks of its faces.
+
+        Returns:
+            numpy.ndarray: Landmarks of shape (faces, points, 2), or None
+        """
+        if self.conn is None and not self._reconnect():
+            return None
+
+        try:
+            if self.ring is None or self.ring.frame_shape != frame.shape:
+                self._attach(frame.shape)
+
+            # Late replies to requests that timed out release their slots
+            while self.outstanding and self.conn.poll(0):
+                self._settle(self.conn.recv())
+
+            if not self.free_slots:
+                # Every slot is still being read by the server
+                self.timeouts += 1
+                return None
+
+            slot = self.free_slots.pop()
+            self.ring.write(slot, frame)
+            request_id = self.next_request_id
+            self.next_request_id += 1
+            self.requests += 1
+            self.outstanding[request_id] = slot
+            self.conn.send({'op': 'infer', 'id': request_id, 'slot': slot})
+
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    self.timeouts += 1
+                    return None
+
+                reply = self.conn.recv()
+                self._settle(reply)
+                if reply.get('id') == request_id:
+                    break
+        except (OSError, EOFError) as e:
+            print(f"[WARNING] Inference server connection lost: {e}")
+            self.errors += 1
+            self._disconnect()
+            return None
+
+        if reply['status'] == STATUS_OK:
+            self.last_wait_ms = reply['wait_ms']
+            return reply['landmarks']
+
+        if reply['status'] == STATUS_OVERLOADED:
+            self.overloaded += 1
+        else:
+            self.errors += 1
+            print(f"[WARNING] Inference server error: {reply.get('error')}")
+        return None
+
+    def _settle(self, reply):
+        """Free the slot of the request a reply answers."""
+        slot = self.outstanding.pop(reply.get('id'), None)
+        if slot is not None:
+            self.free_slots.append(slot)
+
+    def _attach(self, frame_shape):
+        """Create frame slots of the given shape and map them into the server."""
+        if self.ring is not None:
+            self.ring.close()
+
+        # One slot per request the server may hold for this client, plus
+        # the one being written
+        num_slots = config.INFERENCE_SERVER_CLIENT_QUEUE + 1
+        self.ring = SharedFrameRing(frame_shape, num_slots)
+        self.free_slots = list(range(num_slots))
+        self.outstanding = {}
+        self.conn.send({'op': 'attach', 'ring': self.ring.describe()})
+
+        # Wait for the server to map the ring before writing requests;
+        # replies still in flight for the old ring are dropped
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.conn.poll(remaining):
+                raise OSError("no reply to attach")
+            if self.conn.recv().get('op') == 'attached':
+                return
+
+    def _reconnect(self):
+        """
+        Try to reconnect, at most once a second.
+
+        Returns:
+            bool: True if connected
+        """
+        now = time.monotonic()
+        if now - self.last_reconnect < 1.0:
+            return False
+        self.last_reconnect = now
+
+        try:
+            self.conn = Client(self.socket_path, family='AF_UNIX')
+        except OSError:
+            return False
+
+        print("[INFO] Reconnected to inference server")
+        return True
+
+    def _disconnect(self):
+        """Close the connection and the frame slot."""
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+            self.conn = None
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        self.free_slots = []
+        self.outstanding = {}
+
+    def extract_features(self, landmarks):
+        """
+        Compute per-eye EAR, mouth aspect ratio and head pitch in one pass.
+
+        Args:
+            landmarks: Full MediaPipe facial landmarks
+
+        Returns:
+            dict: Feature values (see FeatureExtractor.extract)
+        """
+        return self.feature_extractor.extract(landmarks)
+
+    def get_eye_landmarks(self, landmarks):
+        """
+        Extract eye landmarks from full facial landmarks.
+
+        Args:
+            landmarks: Full facial landmarks array
+
+        Returns:
+            tuple: (left_eye_landmarks, right_eye_landmarks)
+        """
+        return landmarks[self.LEFT_EYE], landmarks[self.RIGHT_EYE]
+
+    def draw_eye_contours(self, frame, landmarks, color=config.COLOR_GREEN, thickness=1):
+        """
+        Draw contours around the eyes.
+
+        Args:
+            frame: Input image frame
+            landmarks: Full facial landmarks
+            color: BGR color tuple
+            thickness: Line thickness
+        """
+        if landmarks is None:
+            return
+
+        left_eye, right_eye = self.get_eye_landmarks(landmarks)
+        cv2.polylines(frame, [left_eye], True, color, thickness)
+        cv2.polylines(frame, [right_eye], True, color, thickness)
+
+    def is_model_loaded(self):
+        """
+        Check if the server connection is up.
+
+        Returns:
+            bool: True if connected
+        """
+        return self.conn is not None
+
+    def get_statistics(self):
+        """
+        Get client statistics.
+
+        Returns:
+            dict: Requests, overloaded and timed-out replies, errors, last queue wait (ms)
+        """
+        return {
+            'requests': self.requests,
+            'overloaded': self.overloaded,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'wait_ms': self.last_wait_ms
+        }
+
+    def cleanup(self):
+        """Detach from the server."""
+        stats = self.get_statistics()
+        print(f"[INFO] Inference server client: {stats['requests']} requests, "
+              f"{stats['overloaded']} overloaded, {stats['timeouts']} timed out")
+
+        if self.conn is not None:
+            try:
+                self.conn.send({'op': 'detach'})
+            except OSError:
+                pass
+
+        self._disconnect()
@@ -0,0 +1,255 @@
+"""
+Inference Process Module
+Runs face mesh inference in one or more worker processes fed through a
+shared-memory frame ring, so inference does not compete with capture and the
+GUI for the GIL
+"""
+
+import multiprocessing
+import queue
+import time
+import cv2
+import config
+from src.pipeline.shared_frame_ring import SharedFrameRing
+from src.pipeline.reorder_buffer import ReorderBuffer
+
+
+def inference_worker(ring_spec, request_queue, result_queue):
+    """
+    Worker process entry point: run face mesh inference on ring slots.
+
+    Requests are (slot, frame_id, timestamp) tuples; None stops the worker.
+    Each request produces one small result record on the result queue. With
+    MAX_NUM_FACES > 1 the record holds every face, since workers share the
+    stream's frames and only the parent can track who is in the driver's seat.
+
+    Args:
+        ring_spec: SharedFrameRing.describe() of the parent's ring
+        request_queue: Queue of inference requests
+        result_queue: Queue receiving result records
+    """
+    # Imported here so MediaPipe is only loaded inside the worker
+    from src.detection.face_eye_detector import FaceEyeDetector
+
+    ring = SharedFrameRing(**ring_spec)
+    detector = FaceEyeDetector()
+
+    try:
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+
+            slot, frame_id, timestamp = request
+
+            start_time = time.perf_counter()
+            if config.MAX_NUM_FACES > 1:
+                landmarks, features = detector.analyze_faces(ring.view(slot))
+            else:
+                landmarks, features = detector.analyze_frame(ring.view(slot))
+            inference_ms = (time.perf_counter() - start_time) * 1000.0
+
+            result_queue.put({
+                'frame_id': frame_id,
+                'slot': slot,
+                'timestamp': timestamp,
+                'landmarks': landmarks,
+                'features': features,
+                'inference_ms': inference_ms
+            })
+    finally:
+        detector.cleanup()
+        ring.close()
+
+
+class InferenceProcess:
+    """
+    Parent-side handle for a pool of inference worker processes.
+
+    Frames are copied into preallocated shared-memory slots and only slot
+    indices are sent to the workers. The parent keeps its own reference to each
+    submitted frame so results can be drawn without sending pixels back.
+
+    Each worker owns a FaceMesh instance and pulls requests from one shared
+    queue, so consecutive frames of a single stream are spread across workers.
+    Results are put back into frame order by a ReorderBuffer before they are
+    returned, keeping the drowsiness state machine strictly ordered.
+    """
+
+    def __init__(self, num_slots=None, num_workers=None, reorder_window=None):
+        """
+        Initialize the inference process handle.
+
+        Args:
+            num_slots: Number of shared frame slots (frames in flight)
+            num_workers: Number of FaceMesh worker processes
+            reorder_window: Frames a missing result may hold back later ones
+        """
+        self.num_workers = max(1, num_workers or config.INFERENCE_WORKERS)
+
+        # Every worker needs at least two slots to stay busy
+        self.num_slots = max(num_slots or config.INFERENCE_RING_SLOTS, 2 * self.num_workers)
+        self.reorder_buffer = ReorderBuffer(reorder_window or config.INFERENCE_REORDER_WINDOW)
+
+        # Spawn rather than fork: the parent runs Tk and capture threads
+        self.context = multiprocessing.get_context('spawn')
+
+        self.ring = None
+        self.processes = []
+        self.request_queue = None
+        self.result_queue = None
+
+        # Slot bookkeeping (parent side only)
+        self.free_slots = []
+        self.pending_frames = {}
+        self.next_frame_id = 0
+
+        # Statistics
+        self.frames_submitted = 0
+        self.frames_completed = 0
+        self.frames_dropped = 0
+        self.last_inference_ms = 0.0
+
+    def start(self, frame_shape):
+        """
+        Allocate the frame ring and start the worker processes.
+
+        Args:
+            frame_shape: Shape of the frames that will be submitted
+        """
+        self.ring = SharedFrameRing(frame_shape, self.num_slots)
+        self.request_queue = self.context.Queue()
+        self.result_queue = self.context.Queue()
+        self.free_slots = list(range(self.num_slots))
+
+        for _ in range(self.num_workers):
+            process = self.context.Process(
+                target=inference_worker,
+                args=(self.ring.describe(), self.request_queue, self.result_queue),
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+
+        print(f"[INFO] Inference workers started ({self.num_workers} processes, {self.num_slots} slots)")
+
+    def submit(self, frame, timestamp=None):
+        """
+        Submit a frame for inference.
+
+        The ring is allocated lazily from the first frame's shape. When every
+        slot is in flight the frame is dropped so capture never blocks.
+
+        Args:
+            frame: BGR frame to analyze
+            timestamp: Capture timestamp carried through to the result
+
+        Returns:
+            bool: True if the frame was queued, False if it was dropped
+        """
+        if self.ring is None:
+            self.start(frame.shape)
+
+        if not self.free_slots:
+            self.frames_dropped += 1
+            return False
+
+        if frame.shape != self.ring.frame_shape:
+            height, width = self.ring.frame_shape[:2]
+            frame = cv2.resize(frame, (width, height))
+
+        slot = self.free_slots.pop()
+        self.ring.write(slot, frame)
+
+        frame_id = self.next_frame_id
+        self.next_frame_id += 1
+        self.pending_frames[frame_id] = frame
+
+        self.request_queue.put((slot, frame_id, timestamp))
+        self.frames_submitted += 1
+        return True
+
+    def collect(self, timeout=0.0):
+        """
+        Collect finished inference results in frame order.
+
+        Results for frames that were skipped by the reorder window arrive
+        late; they are dropped and counted rather than released.
+
+        Args:
+            timeout: Seconds to wait for the first result (0 = do not wait)
+
+        Returns:
+            list: (frame, result) pairs in submission order
+
+        Raises:
+            RuntimeError: If a worker process has exited
+        """
+        if not self.processes:
+            return []
+
+        completed = []
+        wait = timeout
+
+        while True:
+            try:
+                if wait > 0:
+                    result = self.result_queue.get(timeout=wait)
+                else:
+                    result = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            wait = 0
+            self.free_slots.append(result['slot'])
+            frame = self.pending_frames.pop(result['frame_id'], None)
+            self.frames_completed += 1
+            self.last_inference_ms = result['inference_ms']
+            completed.extend(self.reorder_buffer.push(result['frame_id'], (frame, result)))
+
+        if not completed and not all(process.is_alive() for process in self.processes):
+            raise RuntimeError("Inference process exited unexpectedly")
+
+        return completed
+
+    def get_statistics(self):
+        """
+        Get transport statistics.
+
+        Returns:
+            dict: Submitted, completed and dropped frame counts
+        """
+        reorder = self.reorder_buffer.get_statistics()
+
+        return {
+            'workers': self.num_workers,
+            'submitted': self.frames_submitted,
+            'completed': self.frames_completed,
+            'dropped': self.frames_dropped,
+            'in_flight': len(self.pending_frames),
+            'reorder_held': reorder['held'],
+            'reorder_skipped': reorder['skipped'],
+            'late': reorder['late'],
+            'inference_ms': self.last_inference_ms
+        }
+
+    def stop(self):
+        """Stop the worker processes and free the shared frame ring."""
+        if self.processes:
+            for _ in self.processes:
+                self.request_queue.put(None)
+
+            for process in self.processes:
+                process.join(timeout=2.0)
+
+                if process.is_alive():
+                    process.terminate()
+
+            self.processes = []
+            print("[INFO] Inference workers stopped")
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+        self.pending_frames.clear()
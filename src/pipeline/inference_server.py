@@ -0,0 +1,446 @@
+"""
+Inference Server Module
+Local face mesh inference service: one process holds a small pool of FaceMesh
+instances and serves landmark requests from many client processes over a Unix
+domain socket, with frames passed through shared memory
+
+Usage (from the project root):
+    python -m src.pipeline.inference_server
+    python -m src.pipeline.inference_server --socket /tmp/facemesh.sock --pool 3
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Listener
+import config
+from src.pipeline.shared_frame_ring import SharedFrameRing
+
+
+# Reply status values
+STATUS_OK = 'ok'
+STATUS_OVERLOADED = 'overloaded'
+STATUS_ERROR = 'error'
+
+
+class FairRequestQueue:
+    """
+    Per-client request queues served round-robin.
+
+    A client with many outstanding frames cannot starve the others: each
+    get() takes the oldest request of the next client in rotation. Every
+    client's queue is bounded; put() refuses requests beyond the bound.
+    """
+
+    def __init__(self, max_per_client):
+        """
+        Initialize the queue.
+
+        Args:
+            max_per_client: Requests a client may have waiting
+        """
+        self.max_per_client = max_per_client
+        self.queues = {}
+        self.rotation = deque()
+        self.pending = 0
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def put(self, client_id, request):
+        """
+        Queue a request.
+
+        Returns:
+            bool: False if the client's queue is full
+        """
+        with self.condition:
+            client_queue = self.queues.setdefault(client_id, deque())
+            if len(client_queue) >= self.max_per_client:
+                return False
+
+            if not client_queue:
+                self.rotation.append(client_id)
+            client_queue.append(request)
+            self.pending += 1
+            self.condition.notify()
+            return True
+
+    def get(self, timeout=0.5):
+        """
+        Take the next request in round-robin order.
+
+        Returns:
+            tuple: (client_id, request), or None on timeout or close
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.pending or self.closed, timeout=timeout) or self.closed:
+                return None
+
+            client_id = self.rotation.popleft()
+            client_queue = self.queues[client_id]
+            request = client_queue.popleft()
+            self.pending -= 1
+
+            if client_queue:
+                self.rotation.append(client_id)
+            return client_id, request
+
+    def remove_client(self, client_id):
+        """
+        Drop a client's queue.
+
+        Returns:
+            int: Number of requests discarded
+        """
+        with self.condition:
+            client_queue = self.queues.pop(client_id, None)
+            if not client_queue:
+                return 0
+
+            self.rotation.remove(client_id)
+            self.pending -= len(client_queue)
+            return len(client_queue)
+
+    def close(self):
+        """Wake all waiting workers."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class _ClientSession:
+    """Server-side state of one connected client."""
+
+    def __init__(self, client_id, conn):
+        self.client_id = client_id
+        self.conn = conn
+        self.send_lock = threading.Lock()
+        self.ring = None
+        self.in_flight = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        """Send a reply; a vanished client is ignored."""
+        try:
+            with self.send_lock:
+                self.conn.send(message)
+        except (OSError, EOFError):
+            self.closed = True
+
+
+class InferenceServer:
+    """
+    Serves face landmark requests from local client processes.
+
+    Each client maps its own shared-memory frame ring into the server and
+    then sends only slot numbers. Requests wait in a per-client fair queue
+    until one of the pool's FaceMesh workers is free. A request is refused
+    with an 'overloaded' reply, instead of queued, when the client already
+    has INFERENCE_SERVER_CLIENT_QUEUE requests waiting or the expected wait
+    exceeds INFERENCE_SERVER_MAX_WAIT_MS, so clients learn about overload
+    immediately rather than through growing latency.
+
+    Pool detectors run in static image mode by default, because a shared
+    FaceMesh cannot keep per-stream tracking state. For the same reason the
+    landmarks of every detected face are returned: picking the driver needs
+    tracks across frames, which the client's FaceTracker keeps.
+    """
+
+    def __init__(self, socket_path=None, pool_size=None, max_wait_ms=None):
+        """
+        Initialize the server.
+
+        Args:
+            socket_path: Unix socket path (default config.INFERENCE_SERVER_SOCKET)
+            pool_size: Number of FaceMesh instances (default config.INFERENCE_SERVER_POOL_SIZE)
+            max_wait_ms: Queueing delay beyond which requests are refused
+        """
+        self.socket_path = socket_path or config.INFERENCE_SERVER_SOCKET
+        self.pool_size = max(1, pool_size or config.INFERENCE_SERVER_POOL_SIZE)
+        self.max_wait = (max_wait_ms or config.INFERENCE_SERVER_MAX_WAIT_MS) / 1000.0
+
+        self.requests = FairRequestQueue(config.INFERENCE_SERVER_CLIENT_QUEUE)
+        self.listener = None
+        self.is_running = False
+        self.workers = []
+        self.ready = threading.Barrier(self.pool_size + 1)
+
+        self.sessions = {}
+        self.next_client_id = 0
+        self.stats_lock = threading.Lock()
+
+        # Statistics
+        self.served = 0
+        self.overloaded = 0
+        self.errors = 0
+        self.inference_time = 0.0
+        self.avg_inference = 0.03  # Seconds; refined as requests are served
+
+    def start(self):
+        """
+        Load the FaceMesh pool and start accepting clients.
+
+        Returns:
+            bool: True if the server is listening
+        """
+        socket_dir = os.path.dirname(self.socket_path)
+        if socket_dir:
+            os.makedirs(socket_dir, exist_ok=True)
+
+        # A socket file left by a crashed server would make bind fail
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self.is_running = True
+
+        # Each worker builds its own FaceMesh, so warm-up happens in parallel
+        for index in range(self.pool_size):
+            worker = threading.Thread(target=self._worker_loop, args=(index,), daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+        try:
+            self.ready.wait()
+        except threading.BrokenBarrierError:
+            self.stop()
+            return False
+
+        try:
+            self.listener = Listener(self.socket_path, family='AF_UNIX')
+        except OSError as e:
+            print(f"[ERROR] Could not listen on {self.socket_path}: {e}")
+            self.stop()
+            return False
+
+        # Frames are this user's camera feed - keep other users out
+        os.chmod(self.socket_path, 0o600)
+
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"[INFO] Inference server listening on {self.socket_path} ({self.pool_size} FaceMesh instances)")
+        return True
+
+    def _accept_loop(self):
+        """Accept client connections."""
+        while self.is_running:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                break
+
+            with self.stats_lock:
+                client_id = self.next_client_id
+                self.next_client_id += 1
+                session = _ClientSession(client_id, conn)
+                self.sessions[client_id] = session
+
+            threading.Thread(target=self._client_loop, args=(session,), daemon=True).start()
+
+    def _client_loop(self, session):
+        """Receive one client's messages until it disconnects."""
+        try:
+            while self.is_running:
+                message = session.conn.recv()
+                op = message.get('op')
+
+                if op == 'attach':
+                    if session.ring is not None:
+                        self._release_ring(session)
+                    # The client's tracker owns the block; ours must not unlink it
+                    session.ring = SharedFrameRing(**message['ring'], track=False)
+                    session.send({'op': 'attached', 'client_id': session.client_id})
+                elif op == 'infer':
+                    self._enqueue(session, message)
+                elif op == 'detach':
+                    break
+        except (EOFError, OSError):
+            pass
+        finally:
+            session.closed = True
+            discarded = self.requests.remove_client(session.client_id)
+            with session.lock:
+                session.in_flight -= discarded
+            self._release_ring(session)
+            session.conn.close()
+
+            with self.stats_lock:
+                self.sessions.pop(session.client_id, None)
+
+    def _enqueue(self, session, message):
+        """Queue an inference request, or refuse it when overloaded."""
+        if session.ring is None:
+            session.send({'id': message['id'], 'status': STATUS_ERROR, 'error': "no frame ring attached"})
+            return
+
+        # Expected wait: everything queued ahead, spread over the pool
+        expected_wait = (self.requests.pending / self.pool_size) * self.avg_inference
+        message['received'] = time.monotonic()
+
+        # Counted before a worker can see the request, so a re-attach or
+        # disconnect never frees the ring under it
+        with session.lock:
+            session.in_flight += 1
+
+        if expected_wait > self.max_wait or not self.requests.put(session.client_id, message):
+            with session.lock:
+                session.in_flight -= 1
+            self._refuse(session, message, expected_wait)
+
+    def _refuse(self, session, message, wait):
+        """Tell a client its request was not served."""
+        with self.stats_lock:
+            self.overloaded += 1
+
+        session.send({
+            'id': message['id'],
+            'status': STATUS_OVERLOADED,
+            'queued': self.requests.pending,
+            'wait_ms': wait * 1000.0
+        })
+
+    def _worker_loop(self, index):
+        """Serve requests with one FaceMesh instance."""
+        # Imported here so only the server loads MediaPipe
+        from src.detection.face_eye_detector import FaceEyeDetector
+
+        # Low-light enhancement is per-stream state; the client proxy does it
+        try:
+            detector = FaceEyeDetector(static_image_mode=config.INFERENCE_SERVER_STATIC_MODE, enable_low_light=False)
+        except Exception as e:
+            print(f"[ERROR] FaceMesh instance {index} failed to load: {e}")
+            self.ready.abort()
+            return
+
+        try:
+            self.ready.wait()
+
+            while self.is_running:
+                item = self.requests.get()
+                if item is None:
+                    continue
+
+                client_id, message = item
+                session = self.sessions.get(client_id)
+                if session is None:
+                    continue
+
+                try:
+                    waited = time.monotonic() - message['received']
+                    if waited > self.max_wait:
+                        # Stale by the time a worker got to it
+                        self._refuse(session, message, waited)
+                        continue
+
+                    start_time = time.perf_counter()
+                    frame = session.ring.view(message['slot'])
+                    faces = detector.detect_faces(frame)
+                    landmarks = detector.get_all_facial_landmarks(frame, faces[0] if faces else None)
+                    inference = time.perf_counter() - start_time
+
+                    with self.stats_lock:
+                        self.served += 1
+                        self.inference_time += inference
+                        self.avg_inference += 0.1 * (inference - self.avg_inference)
+
+                    session.send({
+                        'id': message['id'],
+                        'status': STATUS_OK,
+                        'landmarks': landmarks,
+                        'inference_ms': inference * 1000.0,
+                        'wait_ms': waited * 1000.0
+                    })
+                except Exception as e:
+                    # One bad request must not take this pool thread down
+                    print(f"[ERROR] Inference failed for client {client_id}: {e}")
+                    with self.stats_lock:
+                        self.errors += 1
+                    session.send({'id': message['id'], 'status': STATUS_ERROR, 'error': str(e)})
+                finally:
+                    with session.lock:
+                        session.in_flight -= 1
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            detector.cleanup()
+
+    def _release_ring(self, session):
+        """Detach from a client's ring once no worker is reading it."""
+        while True:
+            with session.lock:
+                if session.in_flight <= 0:
+                    break
+            time.sleep(0.005)
+
+        if session.ring is not None:
+            session.ring.close()
+            session.ring = None
+
+    def get_statistics(self):
+        """
+        Get server statistics.
+
+        Returns:
+            dict: Clients, requests served, refused and failed, queue depth, inference time (ms)
+        """
+        with self.stats_lock:
+            return {
+                'clients': len(self.sessions),
+                'served': self.served,
+                'overloaded': self.overloaded,
+                'errors': self.errors,
+                'queued': self.requests.pending,
+                'inference_ms': (self.inference_time / self.served * 1000.0) if self.served else 0.0
+            }
+
+    def stop(self):
+        """Stop serving and release the FaceMesh pool."""
+        self.is_running = False
+        self.requests.close()
+
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+        for worker in self.workers:
+            worker.join(timeout=2.0)
+        self.workers = []
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        print("[INFO] Inference server stopped")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Shared face mesh inference server")
+    parser.add_argument('--socket', help="Unix socket path (default config.INFERENCE_SERVER_SOCKET)")
+    parser.add_argument('--pool', type=int, help="FaceMesh instances (default config.INFERENCE_SERVER_POOL_SIZE)")
+    parser.add_argument('--max-wait-ms', type=float, help="Refuse requests expected to wait longer")
+    parser.add_argument('--stats-interval', type=float, default=10.0, help="Seconds between statistics lines")
+    args = parser.parse_args(argv)
+
+    server = InferenceServer(args.socket, args.pool, args.max_wait_ms)
+    if not server.start():
+        return 1
+
+    try:
+        while True:
+            time.sleep(args.stats_interval)
+            stats = server.get_statistics()
+            print(f"[INFO] {stats['clients']} clients, {stats['served']} served, "
+                  f"{stats['overloaded']} overloaded, {stats['errors']} failed, {stats['queued']} queued, "
+                  f"{stats['inference_ms']:.1f} ms/frame")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
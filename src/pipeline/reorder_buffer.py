@@ -0,0 +1,85 @@
+"""
+Reorder Buffer Module
+Puts results that finish out of order back into frame order
+"""
+
+
+class ReorderBuffer:
+    """
+    Releases items strictly in frame-id order with a bounded reorder window.
+
+    Items that arrive early are held until the missing ids arrive. If the
+    newest held id gets `window` or more frames ahead of the oldest missing
+    id, that id is skipped (treated as never captured) so a stuck or lost
+    result cannot stall the stream. A result for a skipped id that arrives
+    later is late: it is dropped and counted, never released out of order.
+    """
+
+    def __init__(self, window):
+        """
+        Initialize the reorder buffer.
+
+        Args:
+            window: Maximum number of frames a missing result may hold back
+        """
+        self.window = max(1, window)
+        self.next_id = 0
+        self.highest_id = -1
+        self.pending = {}
+
+        # Statistics
+        self.released_count = 0
+        self.skipped_count = 0
+        self.late_count = 0
+
+    def push(self, frame_id, item):
+        """
+        Add a finished item and release everything that is now in order.
+
+        Args:
+            frame_id: Sequential id assigned when the frame was submitted
+            item: Item to release
+
+        Returns:
+            list: Items released in frame order (may be empty)
+        """
+        if frame_id < self.next_id:
+            # Its slot in the sequence was already skipped
+            self.late_count += 1
+            return []
+
+        self.pending[frame_id] = item
+        self.highest_id = max(self.highest_id, frame_id)
+
+        released = []
+
+        while True:
+            if self.next_id in self.pending:
+                released.append(self.pending.pop(self.next_id))
+                self.next_id += 1
+            elif self.pending and self.highest_id - self.next_id >= self.window:
+                self.skipped_count += 1
+                self.next_id += 1
+            else:
+                break
+
+        self.released_count += len(released)
+        return released
+
+    def __len__(self):
+        """Number of items held waiting for earlier frames."""
+        return len(self.pending)
+
+    def get_statistics(self):
+        """
+        Get reorder statistics.
+
+        Returns:
+            dict: Released, held, skipped and late counts
+        """
+        return {
+            'released': self.released_count,
+            'held': len(self.pending),
+            'skipped': self.skipped_count,
+            'late': self.late_count
+        }
@@ -0,0 +1,110 @@
+"""
+Shared Frame Ring Module
+Preallocated shared-memory frame slots for passing frames between processes
+without pickling them
+"""
+
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+
+class SharedFrameRing:
+    """
+    A fixed number of equally sized frame slots in one shared-memory block.
+
+    The owning process creates the block; other processes attach to it by name.
+    Only slot indices travel over queues - the pixels stay in shared memory.
+    """
+
+    def __init__(self, frame_shape, num_slots, name=None, dtype=np.uint8, track=True):
+        """
+        Create or attach to a shared frame ring.
+
+        Args:
+            frame_shape: Shape of one frame, e.g. (480, 640, 3)
+            num_slots: Number of frame slots in the ring
+            name: Name of an existing block to attach to (None creates one)
+            dtype: Pixel data type
+            track: Register an attached block with this process's resource
+                   tracker. Pass False when attaching to a block of an
+                   unrelated process, or this process's tracker unlinks it
+                   on exit while its owner is still using it
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.num_slots = num_slots
+        self.dtype = np.dtype(dtype)
+        self.slot_bytes = int(np.prod(self.frame_shape)) * self.dtype.itemsize
+        self.is_owner = name is None
+
+        if self.is_owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * num_slots)
+        elif track:
+            self.shm = shared_memory.SharedMemory(name=name)
+        elif sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix':
+                # Older versions register every attach; undo it
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+
+        # One array view per slot, created once and reused
+        self.slots = [
+            np.ndarray(self.frame_shape, dtype=self.dtype, buffer=self.shm.buf, offset=i * self.slot_bytes)
+            for i in range(num_slots)
+        ]
+
+    @property
+    def name(self):
+        """str: Name other processes use to attach to the ring."""
+        return self.shm.name
+
+    def describe(self):
+        """
+        Get the arguments another process needs to attach to this ring.
+
+        Returns:
+            dict: Keyword arguments for SharedFrameRing
+        """
+        return {
+            'frame_shape': self.frame_shape,
+            'num_slots': self.num_slots,
+            'name': self.name,
+            'dtype': self.dtype.str
+        }
+
+    def write(self, slot, frame):
+        """
+        Copy a frame into a slot.
+
+        Args:
+            slot: Slot index
+            frame: Frame with the ring's shape and dtype
+        """
+        np.copyto(self.slots[slot], frame)
+
+    def view(self, slot):
+        """
+        Get a zero-copy view of a slot.
+
+        Args:
+            slot: Slot index
+
+        Returns:
+            numpy.ndarray: Array backed by shared memory
+        """
+        return self.slots[slot]
+
+    def close(self):
+        """Detach from the ring, and free it if this process created it."""
+        # Views must be dropped before the buffer can be released
+        self.slots = []
+        self.shm.close()
+
+        if self.is_owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,8 @@
+"""
+__init__.py for recording module
+Makes the recording package importable
+"""
+
+from .event_clips import EventClipRecorder
+
+__all__ = ['EventClipRecorder']
@@ -0,0 +1,306 @@
+"""
+Event Clip Recording Module
+Keeps a memory-capped ring of JPEG-compressed recent frames and writes the
+seconds around each drowsiness event to a video file with JSON metadata
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import cv2
+import numpy as np
+import config
+
+
+class _PendingClip:
+    """Frames collected for one clip until its post-event window has passed."""
+
+    def __init__(self, trigger_time, end_time, metadata, frames):
+        self.trigger_times = [trigger_time]
+        self.end_time = end_time
+        self.metadata = metadata
+        self.frames = frames
+        self.size = sum(len(data) for _, data in frames)
+
+
+class EventClipRecorder:
+    """
+    Records evidence clips around drowsiness events.
+
+    The frame loop only copies the frame into a bounded queue. An encoder
+    thread JPEG-compresses frames into a ring that holds CLIP_PRE_SECONDS of
+    history within CLIP_MAX_BUFFER_MB. On trigger(), the ring contents plus
+    the next CLIP_POST_SECONDS of frames become a clip, which a writer thread
+    decodes into a video file next to a JSON metadata file. Events that
+    arrive while a clip is still collecting extend that clip.
+
+    Frames are dropped (and counted) rather than blocking if the encoder
+    falls behind. Triggers bypass the frame queue, so a clip is never lost
+    to load.
+    """
+
+    def __init__(self, output_dir=None, pre_seconds=None, post_seconds=None,
+                 jpeg_quality=None, max_buffer_mb=None):
+        """
+        Initialize the recorder.
+
+        Args:
+            output_dir: Directory for clips (default config.CLIP_OUTPUT_DIR)
+            pre_seconds: Seconds of video kept before an event
+            post_seconds: Seconds of video recorded after an event
+            jpeg_quality: JPEG quality (0-100) of buffered frames
+            max_buffer_mb: Cap on compressed frame memory
+        """
+        self.output_dir = output_dir or config.CLIP_OUTPUT_DIR
+        self.pre_seconds = config.CLIP_PRE_SECONDS if pre_seconds is None else pre_seconds
+        self.post_seconds = config.CLIP_POST_SECONDS if post_seconds is None else post_seconds
+        self.jpeg_quality = jpeg_quality or config.CLIP_JPEG_QUALITY
+        self.max_buffer_bytes = int((max_buffer_mb or config.CLIP_MAX_BUFFER_MB) * 1024 * 1024)
+
+        # Encoder side: ring of (timestamp, jpeg bytes)
+        self.ring = deque()
+        self.ring_bytes = 0
+        self.pending = None
+
+        self.encode_queue = queue.Queue(maxsize=config.CLIP_ENCODE_QUEUE_SIZE)
+
+        # Triggers waiting for the encoder: (timestamp, metadata), unbounded
+        self.trigger_lock = threading.Lock()
+        self.pending_triggers = []
+
+        self.write_queue = queue.Queue(maxsize=2)
+        self.is_running = False
+        self.encoder_thread = None
+        self.writer_thread = None
+
+        # Statistics
+        self.frames_dropped = 0
+        self.frames_evicted = 0
+        self.clips_written = 0
+        self.clips_dropped = 0
+        self.encode_time = 0.0
+        self.frames_encoded = 0
+
+    def start(self):
+        """Start the encoder and writer threads."""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.is_running = True
+        self.encoder_thread = threading.Thread(target=self._encoder_loop, daemon=True)
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.encoder_thread.start()
+        self.writer_thread.start()
+
+        print(f"[INFO] Event clip recorder: {self.output_dir} "
+              f"({self.pre_seconds:.0f} s before / {self.post_seconds:.0f} s after)")
+
+    # ==================== FRAME LOOP SIDE ====================
+
+    def add_frame(self, frame, timestamp):
+        """
+        Buffer a frame. Never blocks.
+
+        Args:
+            frame: BGR frame (copied, so the caller may draw on it afterwards)
+            timestamp: Capture timestamp in seconds
+        """
+        try:
+            self.encode_queue.put_nowait((timestamp, frame.copy()))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def trigger(self, timestamp, metadata=None):
+        """
+        Request a clip around an event. Never blocks.
+
+        Args:
+            timestamp: Capture timestamp of the event
+            metadata: JSON-serializable details stored with the clip
+        """
+        metadata = dict(metadata or {}, wall_time=time.time())
+
+        with self.trigger_lock:
+            self.pending_triggers.append((timestamp, metadata))
+
+    # ==================== ENCODER THREAD ====================
+
+    def _encoder_loop(self):
+        """Compress frames into the ring and assemble clips."""
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), int(self.jpeg_quality)]
+
+        while self.is_running or not self.encode_queue.empty() or self.pending_triggers:
+            # Start clips before encoding queued frames, which then join them
+            self._take_triggers()
+
+            try:
+                timestamp, frame = self.encode_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            start_time = time.perf_counter()
+            ok, buffer = cv2.imencode('.jpg', frame, params)
+            self.encode_time += time.perf_counter() - start_time
+            if not ok:
+                continue
+
+            self.frames_encoded += 1
+            entry = (timestamp, buffer.tobytes())
+            self._append_to_ring(entry)
+
+            if self.pending is not None:
+                self.pending.frames.append(entry)
+                self.pending.size += len(entry[1])
+
+                if timestamp >= self.pending.end_time:
+                    self._finish_clip()
+
+        # Shutting down - keep whatever a pending clip has collected
+        if self.pending is not None:
+            self._finish_clip()
+
+    def _take_triggers(self):
+        """Start or extend clips for triggers received since the last frame."""
+        if not self.pending_triggers:
+            return
+
+        with self.trigger_lock:
+            triggers, self.pending_triggers = self.pending_triggers, []
+
+        for timestamp, metadata in triggers:
+            self._start_clip(timestamp, metadata)
+
+    def _append_to_ring(self, entry):
+        """Add a frame to the ring, evicting by age and by the memory cap."""
+        timestamp, data = entry
+        self.ring.append(entry)
+        self.ring_bytes += len(data)
+
+        # Frames shared by the ring and a pending clip are counted twice, so
+        # the cap is conservative
+        pending_bytes = self.pending.size if self.pending is not None else 0
+
+        while self.ring:
+            oldest_time, oldest = self.ring[0]
+
+            if timestamp - oldest_time <= self.pre_seconds:
+                if self.ring_bytes + pending_bytes <= self.max_buffer_bytes:
+                    break
+                # Still inside the pre-event window, but over the memory cap
+                self.frames_evicted += 1
+
+            self.ring.popleft()
+            self.ring_bytes -= len(oldest)
+
+    def _start_clip(self, timestamp, metadata):
+        """Start a clip, or extend the one still collecting post-event frames."""
+        end_time = timestamp + self.post_seconds
+
+        if self.pending is not None:
+            self.pending.trigger_times.append(timestamp)
+            self.pending.end_time = end_time
+            return
+
+        frames = [entry for entry in self.ring if entry[0] >= timestamp - self.pre_seconds]
+        self.pending = _PendingClip(timestamp, end_time, metadata, frames)
+
+    def _finish_clip(self):
+        """Hand the pending clip to the writer thread."""
+        clip, self.pending = self.pending, None
+
+        try:
+            self.write_queue.put_nowait(clip)
+        except queue.Full:
+            print("[WARNING] Event clip writer busy - clip dropped")
+            self.clips_dropped += 1
+
+    # ==================== WRITER THREAD ====================
+
+    def _writer_loop(self):
+        """Write finished clips to disk."""
+        while self.is_running or not self.write_queue.empty() or \
+                (self.encoder_thread is not None and self.encoder_thread.is_alive()):
+            try:
+                clip = self.write_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            try:
+                self._write_clip(clip)
+            except Exception as e:
+                print(f"[ERROR] Could not write event clip: {e}")
+
+    def _write_clip(self, clip):
+        """
+        Decode a clip's frames into a video file and write its metadata.
+
+        Args:
+            clip: _PendingClip to write
+        """
+        if not clip.frames:
+            return
+
+        first_time = clip.frames[0][0]
+        duration = clip.frames[-1][0] - first_time
+        fps = (len(clip.frames) - 1) / duration if duration > 0 else config.CAMERA_FPS
+
+        name = datetime.fromtimestamp(clip.metadata['wall_time']).strftime("event_%Y%m%d_%H%M%S_%f")
+        video_path = os.path.join(self.output_dir, name + ".mp4")
+
+        writer = None
+        for _, data in clip.frames:
+            frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if writer is None:
+                height, width = frame.shape[:2]
+                writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+            writer.write(frame)
+        writer.release()
+
+        metadata = dict(clip.metadata)
+        metadata.update({
+            'video': os.path.basename(video_path),
+            'event_times': [t - first_time for t in clip.trigger_times],
+            'frames': len(clip.frames),
+            'fps': fps,
+            'duration': duration,
+            'pre_seconds': self.pre_seconds,
+            'post_seconds': self.post_seconds
+        })
+        with open(os.path.join(self.output_dir, name + ".json"), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        self.clips_written += 1
+        print(f"[INFO] Event clip saved: {video_path} ({len(clip.frames)} frames, {duration:.1f} s)")
+
+    # ==================== STATUS / SHUTDOWN ====================
+
+    def get_statistics(self):
+        """
+        Get recorder statistics.
+
+        Returns:
+            dict: Buffer size (MB / frames), encode cost, dropped frames and clips
+        """
+        return {
+            'buffer_mb': self.ring_bytes / (1024 * 1024),
+            'buffer_frames': len(self.ring),
+            'encode_ms': (self.encode_time / self.frames_encoded * 1000.0) if self.frames_encoded else 0.0,
+            'frames_dropped': self.frames_dropped,
+            'frames_evicted': self.frames_evicted,
+            'clips_written': self.clips_written,
+            'clips_dropped': self.clips_dropped
+        }
+
+    def stop(self):
+        """Flush any clip still collecting frames and stop the threads."""
+        self.is_running = False
+
+        if self.encoder_thread is not None:
+            self.encoder_thread.join(timeout=5.0)
+        if self.writer_thread is not None:
+            self.writer_thread.join(timeout=30.0)
+
+        print("[INFO] Event clip recorder stopped")
@@ -4,5 +4,6 @@ Makes the UI package importable
 """
 
 from .app import DrowsinessDetectionApp, create_app
+from .mosaic import MosaicApp, MosaicRenderer
 
-__all__ = ['DrowsinessDetectionApp', 'create_app']
+__all__ = ['DrowsinessDetectionApp', 'create_app', 'MosaicApp', 'MosaicRenderer']
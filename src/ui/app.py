@@ -12,7 +12,24 @@ import time
 import config
 from src.detection.face_eye_detector import FaceEyeDetector
 from src.detection.drowsiness_detector import DrowsinessDetector
+from src.detection.signal_conditioning import EARSignalConditioner
+from src.detection.motion_gate import MotionGate
+from src.detection.shadow_policies import ShadowPolicyEvaluator
+from src.detection.face_tracker import FaceTracker
 from src.alert.alert_manager import AlertManager
+from src.capture.video_source import VideoSource
+from src.capture.watchdog import CaptureWatchdog, FRAME_DUPLICATE, FRAME_FROZEN
+from src.pipeline.inference_process import InferenceProcess
+from src.pipeline.inference_client import RemoteFaceEyeDetector
+from src.pipeline.frame_result import FrameResult
+from src.pipeline.duty_cycle import DutyCycleController
+from src.monitoring.status_server import StatusPublisher, StatusServer
+from src.monitoring.fleet_client import FleetClient
+from src.monitoring.video_stream import VideoStreamer
+from src.analytics.trip_store import TripStore
+from src.recording.event_clips import EventClipRecorder
+from src.ui.overlay import OverlayCompositor
+from src.ui.ear_chart import EARChart
 
 
 class DrowsinessDetectionApp:
@@ -33,18 +50,80 @@ class DrowsinessDetectionApp:
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Initialize detection components
-        self.face_detector = FaceEyeDetector()
+        self.face_detector = self._create_face_detector()
         self.drowsiness_detector = DrowsinessDetector()
         self.alert_manager = AlertManager()
+        self.signal_conditioner = EARSignalConditioner() if config.ENABLE_SIGNAL_CONDITIONING else None
+        self.motion_gate = MotionGate() if config.ENABLE_MOTION_GATE else None
+        
+        # Optional multi-face mode: track occupants, monitor the driver's seat
+        self.face_tracker = None
+        if config.MAX_NUM_FACES > 1:
+            self.face_tracker = FaceTracker()
+        
+        # Optional candidate policies evaluated alongside the active detector
+        self.shadow_policies = None
+        if config.ENABLE_SHADOW_POLICIES:
+            self.shadow_policies = ShadowPolicyEvaluator(self.drowsiness_detector)
+        
+        # Optional risk-adaptive inference rate for power-constrained units
+        self.duty_cycle = DutyCycleController() if config.ENABLE_DUTY_CYCLE else None
+        
+        # Optional out-of-process inference (shared-memory frame transport)
+        self.inference_process = InferenceProcess() if config.INFERENCE_MODE == "process" else None
+        
+        # Optional trip analytics (SQLite, background writes)
+        self.trip_store = None
+        if config.ENABLE_TRIP_ANALYTICS:
+            self.trip_store = TripStore()
+            self.trip_store.start_session()
+        
+        # Optional evidence clips around drowsiness events
+        self.clip_recorder = None
+        if config.ENABLE_EVENT_CLIPS:
+            self.clip_recorder = EventClipRecorder()
+            self.clip_recorder.start()
+        
+        # Display-time overlay drawing
+        self.overlay_compositor = OverlayCompositor()
+        
+        # Optional status/metrics endpoint fed by per-frame snapshots
+        self.status_publisher = None
+        self.status_server = None
+        if config.ENABLE_STATUS_SERVER:
+            self.status_publisher = StatusPublisher()
+            self.status_server = StatusServer(self.status_publisher)
+            self.status_server.start()
+        
+        # Optional reporting to a fleet aggregator
+        self.fleet_client = None
+        if config.ENABLE_FLEET_REPORTING:
+            self.fleet_client = FleetClient()
+            self.fleet_client.start()
+        
+        # Optional MJPEG stream of the annotated feed for remote viewers
+        self.video_streamer = None
+        if config.ENABLE_VIDEO_STREAM:
+            self.video_streamer = VideoStreamer()
+            if not self.video_streamer.start():
+                self.video_streamer = None
+        
+        # Drowsiness events seen so far (to spot the frame a new one starts)
+        self.event_count = 0
         
         # Video capture
         self.video_capture = None
+        self.capture_watchdog = None
         self.is_running = False
         self.processing_thread = None
         
         # Current frame data
-        self.current_frame = None
+        self.current_frame = None  # (frame, FrameResult) from the processing thread
+        self.displayed_frame = None
         self.current_ear = 0.0
+        self.current_timestamp = None
+        self.source_finished = False
+        self.status_message = None
         self.fps = 0
         self.last_fps_time = time.time()
         self.frame_count = 0
@@ -124,6 +203,13 @@ class DrowsinessDetectionApp:
         )
         self.progress_bar.pack(fill="x", pady=5)
         
+        # EAR history chart
+        self.ear_chart = None
+        if config.ENABLE_EAR_CHART:
+            ttk.Label(ear_frame, text="EAR History:").pack(pady=(10, 0))
+            self.ear_chart = EARChart(ear_frame)
+            self.ear_chart.canvas.pack(pady=5)
+        
         # Statistics
         stats_frame = ttk.LabelFrame(control_frame, text="Statistics", padding=10)
         stats_frame.pack(fill="x", pady=5)
@@ -175,15 +261,17 @@ class DrowsinessDetectionApp:
     def start_video(self):
         """Start video capture and processing."""
         try:
-            self.video_capture = cv2.VideoCapture(config.CAMERA_INDEX)
-            self.video_capture.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
-            self.video_capture.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+            self.video_capture = VideoSource()
             
-            if not self.video_capture.isOpened():
-                raise Exception("Could not open webcam")
+            if not self.video_capture.start():
+                raise Exception(f"Could not open video source: {self.video_capture.source}")
             
             self.is_running = True
             
+            # Watch live sources for stalls and frozen frames
+            if config.ENABLE_CAPTURE_WATCHDOG and self.video_capture.is_live:
+                self.capture_watchdog = CaptureWatchdog()
+            
             # MediaPipe is always ready (no external model file needed)
             self.status_bar_label.config(text="System ready - Monitoring active (MediaPipe)")
 
@@ -203,20 +291,45 @@ class DrowsinessDetectionApp:
         """Process video frames in a separate thread."""
         while self.is_running:
             try:
-                ret, frame = self.video_capture.read()
+                ret, frame, timestamp = self.video_capture.read()
                 
                 if not ret:
-                    print("[ERROR] Failed to read frame from webcam")
+                    if not self.video_capture.is_opened():
+                        print("[INFO] Video source finished")
+                        self.source_finished = True
+                        break
+                    if self.capture_watchdog is not None and self.capture_watchdog.is_stalled():
+                        self._recover_capture()
+                    else:
+                        print("[ERROR] Failed to read frame from video source")
                     continue
                 
+                if self.capture_watchdog is not None:
+                    frame_status = self.capture_watchdog.check_frame(frame)
+                    
+                    # A repeated frame is not a new observation of the driver
+                    if frame_status == FRAME_DUPLICATE:
+                        continue
+                    if frame_status == FRAME_FROZEN:
+                        self._recover_capture()
+                        continue
+                
+                self.current_timestamp = timestamp
+                
                 # Flip frame horizontally for mirror effect
                 frame = cv2.flip(frame, 1)
                 
                 # Process frame
-                self.process_frame(frame)
+                if self.duty_cycle is not None and not self.duty_cycle.should_process(timestamp):
+                    processed = self._skip_frame(frame, timestamp)
+                elif self.inference_process is not None:
+                    processed = self._process_frame_remote(frame, timestamp)
+                else:
+                    self.process_frame(frame)
+                    processed = 1
                 
                 # Calculate FPS
-                self.frame_count += 1
+                self.frame_count += processed
                 if time.time() - self.last_fps_time >= 1.0:
                     self.fps = self.frame_count
                     self.frame_count = 0
@@ -226,6 +339,114 @@ class DrowsinessDetectionApp:
                 print(f"[ERROR] Error processing frame: {e}")
                 time.sleep(0.1)
     
+    def _recover_capture(self):
+        """Reopen a stalled or frozen source and drop detection state from before the gap."""
+        self.status_message = "Camera lost - reconnecting..."
+        self.current_frame = None
+        
+        # Closed-eye counts and filters must not bridge an outage of unknown length
+        self.drowsiness_detector.reset()
+        if self.shadow_policies is not None:
+            self.shadow_policies.reset()
+        if self.signal_conditioner is not None:
+            self.signal_conditioner.reset()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        if self.duty_cycle is not None:
+            self.duty_cycle.reset()
+        if self.face_tracker is not None:
+            self.face_tracker.reset()
+        
+        if self.capture_watchdog.recover(self.video_capture, lambda: self.is_running):
+            self.status_message = "Camera reconnected - Monitoring active"
+    
+    def _process_frame_remote(self, frame, timestamp):
+        """
+        Hand a frame to the inference process and apply any finished results.
+        
+        Args:
+            frame: Input video frame
+            timestamp: Capture timestamp of the frame
+            
+        Returns:
+            int: Number of frames whose results were applied
+        """
+        submitted = self.inference_process.submit(frame, timestamp)
+        
+        # When every slot is in flight, wait briefly instead of spinning
+        return self._apply_remote_results(timeout=0.0 if submitted else 0.05)
+    
+    def _apply_remote_results(self, timeout=0.0):
+        """
+        Apply results that the inference process has finished, in frame order.
+        
+        Args:
+            timeout: Seconds to wait for a result
+            
+        Returns:
+            int: Number of frames whose results were applied
+        """
+        try:
+            completed = self.inference_process.collect(timeout=timeout)
+        except RuntimeError as e:
+            print(f"[ERROR] {e} - falling back to in-process inference")
+            self.inference_process.stop()
+            self.inference_process = None
+            return 0
+        
+        for result_frame, result in completed:
+            if self.duty_cycle is not None:
+                self.duty_cycle.record_inference_cost(result['inference_ms'] / 1000.0)
+            
+            # Workers return every face; results are in frame order, so the
+            # driver is tracked here
+            landmarks, features = result['landmarks'], result['features']
+            if self.face_tracker is not None:
+                landmarks, features = self._select_driver(landmarks, features, result_frame.shape)
+            
+            self.apply_inference_result(result_frame, landmarks, features, result['timestamp'])
+        
+        return len(completed)
+    
+    def _skip_frame(self, frame, timestamp):
+        """
+        Show a frame the duty cycle skipped, with the latest detection result.
+        
+        Args:
+            frame: Input video frame
+            timestamp: Capture timestamp of the frame
+            
+        Returns:
+            int: Number of frames whose results were applied
+        """
+        previous = self.current_frame
+        if previous is not None:
+            self.current_frame = (frame, previous[1]._replace(timestamp=timestamp))
+        
+        if self.clip_recorder is not None:
+            self.clip_recorder.add_frame(frame, timestamp)
+        
+        # Keep draining out-of-process results so a wakeup is not delayed
+        if self.inference_process is not None:
+            return self._apply_remote_results()
+        
+        return 0
+    
+    def _create_face_detector(self):
+        """
+        Create the face detector for the configured inference mode.
+        
+        Returns:
+            FaceEyeDetector or RemoteFaceEyeDetector: Detector to use
+        """
+        if config.INFERENCE_MODE == "server":
+            try:
+                return RemoteFaceEyeDetector()
+            except ConnectionError as e:
+                print(f"[WARNING] {e} - loading a local face mesh instead")
+        
+        return FaceEyeDetector()
+    
     def process_frame(self, frame):
         """
         Process a single frame for drowsiness detection.
@@ -233,88 +454,187 @@ class DrowsinessDetectionApp:
         Args:
             frame: Input video frame
         """
-        # Detect faces
-        faces = self.face_detector.detect_faces(frame)
+        # Reuse the previous result while the eye regions are unchanged
+        cached = self.motion_gate.lookup(frame) if self.motion_gate is not None else None
         
-        ear_value = None
+        if cached is not None:
+            landmarks, features = cached
+        else:
+            start_time = time.perf_counter()
+            if self.face_tracker is not None:
+                landmarks, features = self._analyze_occupants(frame)
+            else:
+                landmarks, features = self.face_detector.analyze_frame(frame)
+            if self.duty_cycle is not None:
+                self.duty_cycle.record_inference_cost(time.perf_counter() - start_time)
+            if self.motion_gate is not None:
+                self.motion_gate.update(frame, landmarks, features)
+        
+        self.apply_inference_result(frame, landmarks, features, self.current_timestamp)
+    
+    def _analyze_occupants(self, frame):
+        """
+        Run multi-face inference and pick out the driver.
         
-        if len(faces) > 0:
-            # Process the first detected face (MediaPipe results)
-            face_results = faces[0]
+        Args:
+            frame: Input video frame
             
-            # Get facial landmarks
-            landmarks = self.face_detector.get_facial_landmarks(frame, face_results)
+        Returns:
+            tuple: (landmarks, features) of the driver, or (None, None)
+        """
+        all_landmarks, all_features = self.face_detector.analyze_faces(frame)
+        return self._select_driver(all_landmarks, all_features, frame.shape)
+    
+    def _select_driver(self, all_landmarks, all_features, frame_shape):
+        """
+        Track every face of a frame and pick out the driver.
+        
+        Args:
+            all_landmarks: Landmarks of every face, shape (faces, points, 2)
+            all_features: Feature dicts, one per face
+            frame_shape: Shape of the frame the faces were found in
             
-            if landmarks is not None:
-                # Draw face rectangle
-                self.face_detector.draw_face_rectangle(frame, landmarks, config.COLOR_GREEN)
-                
-                # Calculate EAR
-                ear_value = self.face_detector.calculate_average_ear(landmarks)
-                
-                # Draw eye landmarks
-                self.face_detector.draw_eye_contours(frame, landmarks, config.COLOR_GREEN, 2)
-                self.face_detector.draw_eye_landmarks(frame, landmarks, config.COLOR_YELLOW, 2)
-                
-                # Update drowsiness detector
-                is_drowsy = self.drowsiness_detector.update(ear_value)
-                
-                # Display EAR on frame
-                cv2.putText(
-                    frame,
-                    f"EAR: {ear_value:.3f}",
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    config.COLOR_GREEN,
-                    2
-                )
-                
-                # Check if alert should be played
-                if self.drowsiness_detector.should_play_alert():
-                    self.alert_manager.play_alert()
-                
-                # Draw drowsiness warning
-                if is_drowsy:
-                    cv2.putText(
-                        frame,
-                        "DROWSINESS DETECTED!",
-                        (10, 70),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1.0,
-                        config.COLOR_RED,
-                        3
-                    )
-                    
-                    # Draw red overlay
-                    overlay = frame.copy()
-                    cv2.rectangle(overlay, (0, 0), (frame.shape[1], frame.shape[0]), config.COLOR_RED, -1)
-                    cv2.addWeighted(overlay, 0.1, frame, 0.9, 0, frame)
-        else:
-            # No face detected
-            cv2.putText(
-                frame,
-                "No face detected",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                config.COLOR_RED,
-                2
+        Returns:
+            tuple: (landmarks, features) of the driver, or (None, None)
+        """
+        landmarks, features, changed = self.face_tracker.update(all_landmarks, all_features, frame_shape)
+        
+        # Someone else is in the driver's seat - start their state fresh
+        if changed:
+            self.drowsiness_detector.reset()
+            if self.signal_conditioner is not None:
+                self.signal_conditioner.reset()
+        
+        return landmarks, features
+    
+    def apply_inference_result(self, frame, landmarks, features, timestamp=None):
+        """
+        Update detection state from inference output.
+        
+        Args:
+            frame: Video frame the inference ran on
+            landmarks: Facial landmarks, or None if no face was found
+            features: Fatigue features (EAR, MAR, head pitch), or None
+            timestamp: Capture timestamp of the frame
+        """
+        ear_value = features['ear'] if features is not None else None
+        eyes_closed = None
+        
+        # Smooth EAR and bridge short landmark dropouts
+        if self.signal_conditioner is not None:
+            ear_value, eyes_closed = self.signal_conditioner.process(
+                ear_value, timestamp, self.drowsiness_detector.ear_threshold
             )
         
-        # Store current frame and EAR
-        self.current_frame = frame
+        is_drowsy = False
+        new_event = False
+        alert_played = False
+        
+        if ear_value is not None:
+            # Update drowsiness detector
+            is_drowsy = self.drowsiness_detector.update(ear_value, features, eyes_closed)
+            if self.shadow_policies is not None:
+                self.shadow_policies.update(ear_value, eyes_closed, timestamp)
+            
+            new_event = self.drowsiness_detector.total_drowsy_events > self.event_count
+            self.event_count = self.drowsiness_detector.total_drowsy_events
+            
+            if self.fleet_client is not None:
+                self.fleet_client.record_frame(ear_value, self.drowsiness_detector.frame_counter > 0)
+                if new_event:
+                    self.fleet_client.record_event(self.drowsiness_detector.alert_reasons)
+            
+            # Check if alert should be played
+            if self.drowsiness_detector.should_play_alert() and self.alert_manager.play_alert():
+                alert_played = True
+                if self.fleet_client is not None:
+                    self.fleet_client.record_alert()
+        
+        # Buffer the frame and start a clip when a new drowsiness event begins
+        if self.clip_recorder is not None:
+            self._record_clip_frame(frame, timestamp, ear_value, new_event)
+        
+        # Choose the inference rate for the next frames
+        if self.duty_cycle is not None:
+            self.duty_cycle.update(timestamp, ear_value, landmarks is not None, self.drowsiness_detector)
+        
+        if self.trip_store is not None:
+            self.trip_store.record_frame(
+                ear_value,
+                self.drowsiness_detector.frame_counter > 0,
+                is_drowsy,
+                self.drowsiness_detector.alert_reasons
+            )
+            # After record_frame, which opens the event the alert belongs to
+            if alert_played:
+                self.trip_store.record_alert()
+        
+        # Hand the raw frame and its compact result to the display side as one
+        # reference; overlays are only drawn for frames that get displayed
+        result = FrameResult(timestamp, landmarks, ear_value, is_drowsy, landmarks is not None)
+        if self.ear_chart is not None:
+            self.ear_chart.add_sample(
+                timestamp, ear_value, ear_value is not None and self.drowsiness_detector.frame_counter > 0
+            )
+        self.current_frame = (frame, result)
         self.current_ear = ear_value if ear_value is not None else 0.0
+        
+        # Publish an immutable snapshot for the status server
+        if self.status_publisher is not None:
+            self.status_publisher.publish(
+                self.fps,
+                self.current_ear,
+                landmarks is not None,
+                self.drowsiness_detector.get_status(),
+                self.alert_manager.get_alert_count()
+            )
+    
+    def _record_clip_frame(self, frame, timestamp, ear_value, new_event):
+        """
+        Feed the event clip recorder and trigger a clip on a new event.
+        
+        Args:
+            frame: Raw video frame (before overlays)
+            timestamp: Capture timestamp of the frame
+            ear_value: EAR fed to the detector, or None
+            new_event: Whether a drowsiness event started on this frame
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        
+        self.clip_recorder.add_frame(frame, timestamp)
+        
+        if new_event:
+            status = self.drowsiness_detector.get_status()
+            self.clip_recorder.trigger(timestamp, {
+                'driver_id': config.DRIVER_ID,
+                'event_number': status['total_events'],
+                'reasons': status['alert_reasons'],
+                'ear': ear_value,
+                'ear_threshold': status['ear_threshold'],
+                'closed_frames': status['frame_counter']
+            })
     
     def update_gui(self):
         """Update GUI elements with current data."""
         if not self.is_running:
             return
         
-        # Update video display
-        if self.current_frame is not None:
+        # Update video display (only when a new frame has been processed)
+        current = self.current_frame
+        if current is not None and current is not self.displayed_frame:
+            self.displayed_frame = current
+            frame, result = current
+            
+            # Draw overlays for this displayed frame only
+            self.overlay_compositor.compose(frame, result)
+            
+            # Hand the finished frame to remote viewers (encoded off this thread)
+            if self.video_streamer is not None:
+                self.video_streamer.submit(frame)
+            
             # Convert frame to RGB for Tkinter
-            frame_rgb = cv2.cvtColor(self.current_frame, cv2.COLOR_BGR2RGB)
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             image = Image.fromarray(frame_rgb)
             photo = ImageTk.PhotoImage(image=image)
             
@@ -335,6 +655,17 @@ class DrowsinessDetectionApp:
         # Update progress bar
         self.progress_bar['value'] = status['progress']
         
+        # Append new chart columns
+        if self.ear_chart is not None:
+            self.ear_chart.set_threshold(status['ear_threshold'])
+            self.ear_chart.update()
+        
+        if self.source_finished:
+            self.status_bar_label.config(text="Video source finished - Monitoring stopped")
+        elif self.status_message is not None:
+            self.status_bar_label.config(text=self.status_message)
+            self.status_message = None
+        
         # Update statistics
         self.fps_label.config(text=f"FPS: {self.fps}")
         self.alert_count_label.config(text=f"Alerts: {self.alert_manager.get_alert_count()}")
@@ -346,7 +677,16 @@ class DrowsinessDetectionApp:
     def reset_statistics(self):
         """Reset all statistics."""
         self.drowsiness_detector.reset_statistics()
+        if self.shadow_policies is not None:
+            self.shadow_policies.reset_statistics()
         self.alert_manager.reset_count()
+        if self.signal_conditioner is not None:
+            self.signal_conditioner.reset()
+        if self.duty_cycle is not None:
+            self.duty_cycle.reset()
+        if self.ear_chart is not None:
+            self.ear_chart.reset()
+        self.event_count = 0
         self.status_bar_label.config(text="Statistics reset")
     
     def test_alert(self):
@@ -365,6 +705,70 @@ class DrowsinessDetectionApp:
         if self.video_capture is not None:
             self.video_capture.release()
         
+        # Report the detection latency added by EAR conditioning
+        if self.signal_conditioner is not None:
+            stats = self.signal_conditioner.get_statistics()
+            print(f"[INFO] EAR conditioning ({stats['filter']}): ~{stats['filter_latency_ms']:.1f} ms filter lag, "
+                  f"{stats['processing_us']:.1f} us/frame, {stats['gaps_bridged']} dropout frames bridged")
+        
+        # Report capture outages
+        if self.capture_watchdog is not None:
+            stats = self.capture_watchdog.get_statistics()
+            if stats['recoveries'] or stats['stalls'] or stats['frozen']:
+                print(f"[INFO] Capture watchdog: {stats['stalls']} stalls, {stats['frozen']} frozen, "
+                      f"{stats['recoveries']} recoveries (max {stats['max_recovery_s']:.2f} s), "
+                      f"{stats['duplicates']} duplicate frames dropped")
+        
+        # Report the inference skipped at low risk
+        if self.duty_cycle is not None:
+            stats = self.duty_cycle.get_statistics()
+            print(f"[INFO] Duty cycle: skipped {stats['skipped']}/{stats['seen']} frames ({stats['skip_ratio']:.0%}), "
+                  f"{stats['wakeups']} wakeups, ~{stats['cpu_saved_s']:.1f} s CPU / "
+                  f"{stats['energy_saved_j']:.0f} J saved")
+        
+        # Report occupant tracking
+        if self.face_tracker is not None:
+            stats = self.face_tracker.get_statistics()
+            print(f"[INFO] Face tracking: {stats['started']} tracks, {stats['driver_changes']} driver changes")
+        
+        # Compare candidate policies with the active one
+        if self.shadow_policies is not None:
+            stats = self.shadow_policies.get_statistics()
+            for name, policy in stats['policies'].items():
+                print(f"[INFO] Shadow policy '{name}': {policy['events']} events "
+                      f"(primary {stats['primary_events']}), {policy['divergences']} divergences "
+                      f"({policy['divergent_s']:.1f} s)")
+            print(f"[INFO] Shadow policies: {stats['processing_us']:.1f} us/frame, "
+                  f"{stats['lazy_ratio']:.0%} evaluations skipped")
+            self.shadow_policies.close()
+        
+        # Write any event clip still collecting frames
+        if self.clip_recorder is not None:
+            self.clip_recorder.stop()
+        
+        # Flush trip analytics to disk
+        if self.trip_store is not None:
+            self.trip_store.close()
+        
+        # Flush queued fleet records
+        if self.fleet_client is not None:
+            self.fleet_client.stop()
+        
+        # Disconnect remote viewers
+        if self.video_streamer is not None:
+            stats = self.video_streamer.get_statistics()
+            print(f"[INFO] Video stream: {stats['encoded']} frames encoded "
+                  f"({stats['encode_ms']:.1f} ms avg)")
+            self.video_streamer.stop()
+        
+        # Stop the status server
+        if self.status_server is not None:
+            self.status_server.stop()
+        
+        # Stop out-of-process inference
+        if self.inference_process is not None:
+            self.inference_process.stop()
+        
         # Cleanup MediaPipe resources
         self.face_detector.cleanup()
         
@@ -0,0 +1,234 @@
+"""
+EAR Chart Module
+Scrolling EAR time-series chart on a Tk canvas with the threshold line,
+eye-closure intervals and a running PERCLOS readout
+"""
+
+import time
+import tkinter as tk
+from collections import deque
+import config
+
+
+class EARChart:
+    """
+    Incrementally drawn EAR chart.
+
+    Samples are decimated to pixel resolution: every canvas column covers a
+    fixed slice of time and is drawn once, as one line item spanning the
+    minimum and maximum EAR seen in that slice. Items are placed at their
+    absolute column and the view is scrolled instead of redrawing, and
+    columns that scroll out of view are deleted, so an update costs the
+    same after hours of running as after a few seconds.
+
+    add_sample() may be called from the processing thread; everything that
+    touches the canvas happens in update(), on the Tk thread.
+    """
+
+    CLOSURE_COLOR = "#f4b4b4"
+    LINE_COLOR = "#1f6fd1"
+    THRESHOLD_COLOR = "#d62728"
+
+    def __init__(self, parent, width=None, height=None, seconds=None, ear_range=None):
+        """
+        Create the chart canvas.
+
+        Args:
+            parent: Parent Tk widget
+            width: Canvas width in pixels (one column per pixel)
+            height: Canvas height in pixels
+            seconds: Time span shown (default config.EAR_CHART_SECONDS)
+            ear_range: (min, max) EAR of the vertical axis
+        """
+        default_width, default_height = config.EAR_CHART_SIZE
+        self.width = width or default_width
+        self.height = height or default_height
+        self.seconds_per_column = (seconds or config.EAR_CHART_SECONDS) / self.width
+        self.ear_min, self.ear_max = ear_range or config.EAR_CHART_RANGE
+
+        self.canvas = tk.Canvas(parent, width=self.width, height=self.height, background="white",
+                                highlightthickness=0, xscrollincrement=1)
+
+        # Samples handed over by the processing thread: (timestamp, ear, closed)
+        self.samples = deque(maxlen=4096)
+
+        self.time_origin = None
+        self.threshold = None
+        self.threshold_item = self.canvas.create_line(0, 0, 0, 0, fill=self.THRESHOLD_COLOR, dash=(4, 2))
+        self.perclos_item = self.canvas.create_text(self.width - 4, 4, anchor="ne",
+                                                    font=(config.FONT_FAMILY, config.FONT_SIZE_SMALL))
+
+        self._reset_columns()
+
+    def _reset_columns(self):
+        """Forget all drawn columns."""
+        # Column being accumulated: index, min, max, closed and total samples
+        self.column = None
+        self.column_min = self.column_max = None
+        self.column_closed = self.column_total = 0
+
+        # Last drawn column and its EAR, for connecting segments
+        self.last_column = None
+        self.last_y = None
+        self.right_edge = self.width
+
+        # Drawn line items per column and closure rectangles ([start, end, item]), oldest first
+        self.column_items = deque()
+        self.closures = deque()
+
+        # Running PERCLOS over the visible columns
+        self.perclos_window = deque()
+        self.window_closed = 0
+        self.window_total = 0
+
+    def add_sample(self, timestamp, ear_value, eyes_closed):
+        """
+        Queue one processed frame. Cheap and thread-safe.
+
+        Args:
+            timestamp: Capture timestamp in seconds (None = now)
+            ear_value: EAR, or None if no face was found
+            eyes_closed: Whether the eyes counted as closed
+        """
+        self.samples.append((timestamp if timestamp is not None else time.monotonic(), ear_value, eyes_closed))
+
+    def set_threshold(self, threshold):
+        """
+        Move the threshold line.
+
+        Args:
+            threshold: EAR threshold
+        """
+        if threshold != self.threshold:
+            self.threshold = threshold
+            self._place_fixed_items()
+
+    def update(self):
+        """Draw columns completed since the last update and scroll the view."""
+        drawn = False
+
+        while self.samples:
+            timestamp, ear_value, eyes_closed = self.samples.popleft()
+
+            if self.time_origin is None:
+                self.time_origin = timestamp
+            column = int((timestamp - self.time_origin) / self.seconds_per_column)
+
+            # Media time jumped back (looped file, restarted source)
+            if self.column is not None and column < self.column:
+                self.time_origin = timestamp - self.column * self.seconds_per_column
+                column = self.column
+
+            if column != self.column:
+                if self.column is not None:
+                    self._draw_column()
+                    drawn = True
+                self.column = column
+                self.column_min = self.column_max = None
+                self.column_closed = self.column_total = 0
+
+            self.column_total += 1
+            self.column_closed += int(bool(eyes_closed))
+            if ear_value is not None:
+                if self.column_min is None:
+                    self.column_min = self.column_max = ear_value
+                else:
+                    self.column_min = min(self.column_min, ear_value)
+                    self.column_max = max(self.column_max, ear_value)
+
+        if drawn:
+            self._scroll()
+
+    def _y(self, ear_value):
+        """Canvas y coordinate of an EAR value."""
+        fraction = (ear_value - self.ear_min) / (self.ear_max - self.ear_min)
+        return self.height - 1 - min(max(fraction, 0.0), 1.0) * (self.height - 2)
+
+    def _draw_column(self):
+        """Draw the finished column as at most one line item and one closure update."""
+        column = self.column
+        items = []
+
+        if self.column_min is not None:
+            y_low, y_high = self._y(self.column_min), self._y(self.column_max)
+
+            if self.last_column == column - 1:
+                # Connect from the previous column, then span this column's range
+                first, second = (y_high, y_low) if abs(self.last_y - y_high) < abs(self.last_y - y_low) else (y_low, y_high)
+                points = (column - 1, self.last_y, column, first, column, second)
+            else:
+                points = (column, y_low, column, y_high + 1)
+                second = y_high
+
+            items.append(self.canvas.create_line(*points, fill=self.LINE_COLOR))
+            self.last_column = column
+            self.last_y = second
+
+        if items:
+            self.column_items.append((column, items))
+
+        # Closure intervals: extend the open rectangle or start a new one
+        if self.column_closed:
+            if self.closures and self.closures[-1][1] == column - 1:
+                closure = self.closures[-1]
+                closure[1] = column
+                self.canvas.coords(closure[2], closure[0], 0, column + 1, self.height)
+            else:
+                item = self.canvas.create_rectangle(column, 0, column + 1, self.height,
+                                                    fill=self.CLOSURE_COLOR, width=0)
+                self.canvas.tag_lower(item)
+                self.closures.append([column, column, item])
+
+        # PERCLOS over the visible window
+        self.perclos_window.append((column, self.column_closed, self.column_total))
+        self.window_closed += self.column_closed
+        self.window_total += self.column_total
+        self.right_edge = max(self.right_edge, column + 1)
+
+    def _scroll(self):
+        """Show the newest columns and delete those that left the view."""
+        left_edge = self.right_edge - self.width
+
+        while self.column_items and self.column_items[0][0] < left_edge:
+            _, items = self.column_items.popleft()
+            for item in items:
+                self.canvas.delete(item)
+
+        while self.closures and self.closures[0][1] < left_edge:
+            self.canvas.delete(self.closures.popleft()[2])
+
+        while self.perclos_window and self.perclos_window[0][0] < left_edge:
+            _, closed, total = self.perclos_window.popleft()
+            self.window_closed -= closed
+            self.window_total -= total
+
+        self.canvas.configure(scrollregion=(left_edge, 0, self.right_edge, self.height))
+        self.canvas.xview_moveto(0)
+        self._place_fixed_items()
+
+        if self.window_total:
+            self.canvas.itemconfigure(self.perclos_item, text=f"PERCLOS {self.window_closed / self.window_total:.0%}")
+
+    def _place_fixed_items(self):
+        """Keep the threshold line and PERCLOS text in the visible window."""
+        left_edge = self.right_edge - self.width
+
+        if self.threshold is not None:
+            y = self._y(self.threshold)
+            self.canvas.coords(self.threshold_item, left_edge, y, self.right_edge, y)
+        self.canvas.coords(self.perclos_item, self.right_edge - 4, 4)
+
+    def reset(self):
+        """Clear the chart."""
+        self.samples.clear()
+        for _, items in self.column_items:
+            for item in items:
+                self.canvas.delete(item)
+        for closure in self.closures:
+            self.canvas.delete(closure[2])
+
+        self.time_origin = None
+        self._reset_columns()
+        self.canvas.configure(scrollregion=(0, 0, self.width, self.height))
+        self.canvas.itemconfigure(self.perclos_item, text="")
+        self._place_fixed_items()
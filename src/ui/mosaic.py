@@ -0,0 +1,371 @@
+"""
+Mosaic View Module
+Grid view of several monitored streams in one Tk window, composited into a
+single preallocated image with per-tile status borders and EAR badges
+
+Usage (from the project root):
+    python src/main.py mosaic 0 1 recordings/cab3.mp4 synthetic://?seed=4
+    python -m src.ui.mosaic synthetic://?seed=1 synthetic://?seed=2 --columns 2
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+import config
+from src.alert.alert_manager import AlertManager
+from src.capture.video_source import VideoSource
+from src.pipeline.headless import HeadlessPipeline
+
+
+# Tile states
+TILE_ACTIVE = 'active'
+TILE_DROWSY = 'drowsy'
+TILE_NO_FACE = 'no_face'
+TILE_OFFLINE = 'offline'
+
+# Border colors (RGBA, the mosaic's pixel format)
+TILE_COLORS = {
+    TILE_ACTIVE: (0, 200, 0, 255),
+    TILE_DROWSY: (255, 0, 0, 255),
+    TILE_NO_FACE: (255, 165, 0, 255),
+    TILE_OFFLINE: (110, 110, 110, 255)
+}
+
+BACKGROUND = (24, 24, 24, 255)
+
+
+class MosaicRenderer:
+    """
+    Composites stream thumbnails into one fixed-size RGBA image.
+
+    The mosaic array is allocated once and shared with a PIL image
+    (frombuffer, no copy) that backs a single reused PhotoImage. Tiles are
+    converted straight into their slot of the array, and only tiles whose
+    frame or state changed are redrawn. Because the mosaic size is fixed,
+    the per-tick Tk upload does not grow with the number of streams; each
+    extra stream only adds its own downscale of a new frame.
+    """
+
+    def __init__(self, num_tiles, size=None, columns=None, border=None):
+        """
+        Initialize the renderer.
+
+        Args:
+            num_tiles: Number of streams shown
+            size: (width, height) of the whole mosaic (default config.MOSAIC_SIZE)
+            columns: Grid columns (default config.MOSAIC_COLUMNS, 0 = square-ish grid)
+            border: Status border thickness in pixels
+        """
+        self.num_tiles = num_tiles
+        width, height = size or config.MOSAIC_SIZE
+        self.columns = columns or config.MOSAIC_COLUMNS or math.ceil(math.sqrt(num_tiles))
+        self.rows = math.ceil(num_tiles / self.columns)
+        self.tile_width = width // self.columns
+        self.tile_height = height // self.rows
+        self.border = config.MOSAIC_BORDER if border is None else border
+
+        self.mosaic = np.empty((self.rows * self.tile_height, self.columns * self.tile_width, 4), dtype=np.uint8)
+        self.mosaic[:] = BACKGROUND
+        self.image = Image.frombuffer(
+            'RGBA', (self.mosaic.shape[1], self.mosaic.shape[0]), self.mosaic, 'raw', 'RGBA', 0, 1
+        )
+        self.photo = None
+
+        # Per-tile last drawn (status, badge text) and cached fit geometry
+        self.tile_state = [None] * num_tiles
+        self.fit_cache = {}
+        self.dirty = True
+
+        # Statistics
+        self.tiles_drawn = 0
+        self.refreshes = 0
+
+    def tile_view(self, index):
+        """Slot of a tile in the mosaic array."""
+        row, column = divmod(index, self.columns)
+        y, x = row * self.tile_height, column * self.tile_width
+        return self.mosaic[y:y + self.tile_height, x:x + self.tile_width]
+
+    def _fit(self, frame_shape):
+        """
+        Size and offset that fit a frame into a tile, keeping its aspect ratio.
+
+        Returns:
+            tuple: ((width, height), (x, y))
+        """
+        if frame_shape not in self.fit_cache:
+            height, width = frame_shape[:2]
+            inner_width = self.tile_width - 2 * self.border
+            inner_height = self.tile_height - 2 * self.border
+            scale = min(inner_width / width, inner_height / height)
+            fit_width, fit_height = max(1, int(width * scale)), max(1, int(height * scale))
+            offset = (self.border + (inner_width - fit_width) // 2, self.border + (inner_height - fit_height) // 2)
+            self.fit_cache[frame_shape] = ((fit_width, fit_height), offset)
+
+        return self.fit_cache[frame_shape]
+
+    def update_tile(self, index, frame, status, badge):
+        """
+        Draw a new frame into a tile.
+
+        Args:
+            index: Tile number
+            frame: BGR frame
+            status: TILE_ACTIVE, TILE_DROWSY or TILE_NO_FACE
+            badge: Text of the tile's badge (stream name and EAR)
+        """
+        view = self.tile_view(index)
+        (fit_width, fit_height), (x, y) = self._fit(frame.shape)
+
+        thumbnail = cv2.resize(frame, (fit_width, fit_height), interpolation=cv2.INTER_AREA)
+        view[y:y + fit_height, x:x + fit_width] = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGBA)
+
+        self._draw_decorations(index, view, status, badge)
+
+    def set_status(self, index, status, badge):
+        """
+        Change a tile's border and badge without a new frame.
+
+        Redraws nothing if they are unchanged.
+        """
+        if self.tile_state[index] != (status, badge):
+            self._draw_decorations(index, self.tile_view(index), status, badge)
+
+    def _draw_decorations(self, index, view, status, badge):
+        """Draw the status border and the badge onto a tile slot."""
+        color = TILE_COLORS[status]
+        if self.border:
+            cv2.rectangle(view, (0, 0), (self.tile_width - 1, self.tile_height - 1), color, self.border)
+
+        (text_width, text_height), baseline = cv2.getTextSize(badge, cv2.FONT_HERSHEY_SIMPLEX, 0.45, 1)
+        top = self.border
+        cv2.rectangle(view, (self.border, top), (self.border + text_width + 8, top + text_height + baseline + 6),
+                      color, -1)
+        cv2.putText(view, badge, (self.border + 4, top + text_height + 3),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 0, 255), 1)
+
+        self.tile_state[index] = (status, badge)
+        self.tiles_drawn += 1
+        self.dirty = True
+
+    def get_photo(self):
+        """
+        Get the PhotoImage showing the mosaic (created on first use, then reused).
+
+        Returns:
+            ImageTk.PhotoImage: Photo for a Tk label
+        """
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(image=self.image)
+            self.dirty = False
+        return self.photo
+
+    def refresh(self):
+        """
+        Upload the mosaic to the PhotoImage if any tile changed.
+
+        Returns:
+            bool: True if the photo was updated
+        """
+        if not self.dirty or self.photo is None:
+            return False
+
+        self.photo.paste(self.image)
+        self.dirty = False
+        self.refreshes += 1
+        return True
+
+
+class StreamWorker:
+    """Runs one stream's capture and detection on a background thread."""
+
+    def __init__(self, source, name, alert_manager):
+        """
+        Initialize the worker.
+
+        Args:
+            source: Video source spec (camera index, file, URL, synthetic://)
+            name: Label shown on the tile
+            alert_manager: AlertManager shared by all streams
+        """
+        self.source = source
+        self.name = name
+        self.pipeline = HeadlessPipeline(alert_manager=alert_manager)
+        self.video_source = None
+        self.thread = None
+        self.is_running = False
+
+        # Latest (sequence, frame, result), replaced as one reference
+        self.latest = None
+        self.last_frame_time = None
+
+    def start(self):
+        """
+        Open the source and start processing.
+
+        Returns:
+            bool: True if the source opened
+        """
+        self.video_source = VideoSource(self.source)
+        if not self.video_source.start():
+            print(f"[ERROR] Could not open video source: {self.source}")
+            return False
+
+        self.is_running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self):
+        """Read and process frames until stopped or the source ends."""
+        sequence = 0
+
+        while self.is_running and self.video_source.is_opened():
+            ret, frame, timestamp = self.video_source.read()
+            if not ret:
+                continue
+
+            try:
+                result = self.pipeline.process_frame(frame, timestamp)
+            except Exception as e:
+                print(f"[ERROR] Stream {self.name}: {e}")
+                time.sleep(0.1)
+                continue
+
+            if result is not None:
+                sequence += 1
+                self.latest = (sequence, frame, result)
+                self.last_frame_time = time.monotonic()
+
+    def stop(self):
+        """Stop processing and release the source."""
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        if self.video_source is not None:
+            self.video_source.release()
+
+        # The shared AlertManager is cleaned up once by the app
+        if self.pipeline.face_detector is not None:
+            self.pipeline.face_detector.cleanup()
+
+
+class MosaicApp:
+    """Tk window showing every stream's tile in one label."""
+
+    def __init__(self, root, sources, columns=None):
+        """
+        Initialize the mosaic window.
+
+        Args:
+            root: Tkinter root window
+            sources: Video source specs, one tile each
+            columns: Grid columns (default config.MOSAIC_COLUMNS)
+        """
+        self.root = root
+        self.root.title(f"{config.WINDOW_TITLE} - {len(sources)} streams")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        self.alert_manager = AlertManager()
+        self.workers = [
+            StreamWorker(source, f"#{index + 1} {source}"[:24], self.alert_manager)
+            for index, source in enumerate(sources)
+        ]
+        self.renderer = MosaicRenderer(len(sources), columns=columns)
+        self.drawn_sequences = [0] * len(sources)
+
+        for index, worker in enumerate(self.workers):
+            if not worker.start():
+                self.renderer.set_status(index, TILE_OFFLINE, f"{worker.name} offline")
+
+        self.video_label = ttk.Label(root, image=self.renderer.get_photo())
+        self.video_label.pack()
+        self.status_bar_label = ttk.Label(root, font=(config.FONT_FAMILY, config.FONT_SIZE_SMALL))
+        self.status_bar_label.pack(fill=tk.X, padx=5, pady=2)
+
+        # GUI cost accounting
+        self.tick_time = 0.0
+        self.ticks = 0
+        self.is_running = True
+
+        self.update_gui()
+
+    def update_gui(self):
+        """Redraw changed tiles and upload the mosaic once."""
+        if not self.is_running:
+            return
+
+        start_time = time.perf_counter()
+        now = time.monotonic()
+        drowsy = 0
+
+        for index, worker in enumerate(self.workers):
+            latest = worker.latest
+
+            if latest is None or now - worker.last_frame_time > config.CAPTURE_STALL_TIMEOUT:
+                self.renderer.set_status(index, TILE_OFFLINE, f"{worker.name} offline")
+                continue
+
+            sequence, frame, result = latest
+            if result['is_drowsy']:
+                drowsy += 1
+            if sequence == self.drawn_sequences[index]:
+                continue
+
+            self.drawn_sequences[index] = sequence
+            if not result['face_detected']:
+                status, badge = TILE_NO_FACE, f"{worker.name} no face"
+            else:
+                status = TILE_DROWSY if result['is_drowsy'] else TILE_ACTIVE
+                badge = f"{worker.name} EAR {result['ear']:.2f}" if result['ear'] is not None else worker.name
+            self.renderer.update_tile(index, frame, status, badge)
+
+        self.renderer.refresh()
+
+        self.tick_time += time.perf_counter() - start_time
+        self.ticks += 1
+        if self.ticks % 100 == 0:
+            self.status_bar_label.config(
+                text=f"{len(self.workers)} streams | {drowsy} drowsy | "
+                     f"GUI {self.tick_time / self.ticks * 1000.0:.2f} ms/tick"
+            )
+
+        self.root.after(config.UI_UPDATE_INTERVAL, self.update_gui)
+
+    def on_closing(self):
+        """Stop all streams and close the window."""
+        self.is_running = False
+
+        for worker in self.workers:
+            worker.stop()
+
+        if self.ticks:
+            print(f"[INFO] Mosaic: {self.tick_time / self.ticks * 1000.0:.2f} ms/tick, "
+                  f"{self.renderer.tiles_drawn} tiles drawn, {self.renderer.refreshes} uploads")
+
+        self.alert_manager.cleanup()
+        self.root.destroy()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Monitor several streams in one grid view")
+    parser.add_argument('sources', nargs='+', help="Camera indices, video files, stream URLs or synthetic:// specs")
+    parser.add_argument('--columns', type=int, help="Grid columns (default: square-ish grid)")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    MosaicApp(root, args.sources, args.columns)
+    root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
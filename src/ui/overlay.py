@@ -0,0 +1,115 @@
+"""
+Overlay Compositor Module
+Draws detection overlays onto frames at display time, from compact frame
+results, so drawing cost stays out of the inference loop
+"""
+
+import cv2
+import numpy as np
+import config
+from src.detection.feature_extractor import FeatureExtractor
+
+
+# Overlay levels
+OVERLAY_NONE = "none"
+OVERLAY_MINIMAL = "minimal"
+OVERLAY_FULL = "full"
+
+
+class OverlayCompositor:
+    """
+    Composites overlays for frames that are actually displayed.
+
+    Levels:
+        none:    no overlays
+        minimal: EAR / no-face text and the drowsiness warning
+        full:    minimal plus face box, eye contours and eye landmark points
+
+    The red drowsiness tint is a cached solid image per frame size and is
+    blended in place, instead of copying and filling the frame every time.
+    """
+
+    def __init__(self, level=None):
+        """
+        Initialize the compositor.
+
+        Args:
+            level: "none", "minimal" or "full" (default config.OVERLAY_LEVEL)
+        """
+        self.level = level or config.OVERLAY_LEVEL
+        self.eye_indices = [
+            np.array(FeatureExtractor.LEFT_EYE, dtype=np.intp),
+            np.array(FeatureExtractor.RIGHT_EYE, dtype=np.intp)
+        ]
+        self.tint_cache = {}
+
+    def set_level(self, level):
+        """
+        Change the overlay level.
+
+        Args:
+            level: "none", "minimal" or "full"
+        """
+        self.level = level
+
+    def compose(self, frame, result):
+        """
+        Draw overlays for a frame result onto the frame, in place.
+
+        Args:
+            frame: BGR frame to draw on
+            result: FrameResult for this frame
+
+        Returns:
+            numpy.ndarray: The same frame, for chaining
+        """
+        if self.level == OVERLAY_NONE or result is None:
+            return frame
+
+        if result.face_detected:
+            if self.level == OVERLAY_FULL:
+                self._draw_face(frame, result.landmarks)
+
+            if result.ear is not None:
+                cv2.putText(frame, f"EAR: {result.ear:.3f}", (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, config.COLOR_GREEN, 2)
+        else:
+            cv2.putText(frame, "No face detected", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, config.COLOR_RED, 2)
+
+        if result.is_drowsy:
+            cv2.putText(frame, "DROWSINESS DETECTED!", (10, 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, config.COLOR_RED, 3)
+            cv2.addWeighted(frame, 0.9, self._get_tint(frame.shape), 0.1, 0, frame)
+
+        return frame
+
+    def _draw_face(self, frame, landmarks):
+        """Draw the face box, eye contours and eye landmark points."""
+        x_min, y_min = landmarks.min(axis=0)
+        x_max, y_max = landmarks.max(axis=0)
+        cv2.rectangle(frame, (int(x_min), int(y_min)), (int(x_max), int(y_max)), config.COLOR_GREEN, 2)
+
+        eyes = [landmarks[indices].astype(np.int32) for indices in self.eye_indices]
+        cv2.polylines(frame, eyes, True, config.COLOR_GREEN, 2)
+
+        for eye in eyes:
+            for x, y in eye:
+                cv2.circle(frame, (int(x), int(y)), 2, config.COLOR_YELLOW, -1)
+
+    def _get_tint(self, shape):
+        """
+        Get the cached solid red image for a frame shape.
+
+        Args:
+            shape: Frame shape
+
+        Returns:
+            numpy.ndarray: Solid tint image
+        """
+        tint = self.tint_cache.get(shape)
+        if tint is None:
+            tint = np.empty(shape, dtype=np.uint8)
+            tint[:] = config.COLOR_RED
+            self.tint_cache[shape] = tint
+        return tint